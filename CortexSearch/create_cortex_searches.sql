@@ -1,55 +1,63 @@
 -- Create cortex search services with clean, descriptive names
 -- Database: TELCO_NETWORK_OPTIMIZATION_PROD, Schema: RAW
+--
+-- The services index distinct values, not table rows: run
+-- create_search_value_tables.sql (CELL_TOWER columns) and
+-- Setup/create_complaint_categories.sql (ticket texts) first.
+-- The search column keeps the original column name, so the semantic model can
+-- use the services for literal matching unchanged.
+-- The lags below are the defaults of RAW.SEARCH_REFRESH_POLICY; after creating
+-- the services, run create_search_refresh_policy.sql to manage them per service.
 
 -- CELL_TOWER: CAUSE_CODE_LONG_DESCRIPTION
 CREATE OR REPLACE CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Cell_Tower_CAUSE_CODE_LONG_DESCRIPTION
 ON CAUSE_CODE_LONG_DESCRIPTION
-ATTRIBUTES CELL_ID, CALL_ID
 WAREHOUSE = MYOPSXSMALL
 EMBEDDING_MODEL = 'snowflake-arctic-embed-l-v2.0'
-TARGET_LAG = '364 day'
+TARGET_LAG = '1 day'
 INITIALIZE = ON_SCHEDULE
 AS (
- SELECT CAUSE_CODE_LONG_DESCRIPTION, CELL_ID, CALL_ID
- FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."CELL_TOWER"
+ SELECT TEXT_VALUE AS CAUSE_CODE_LONG_DESCRIPTION, VALUE_ID
+ FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."SEARCH_TEXT_VALUES"
+ WHERE COLUMN_NAME = 'CAUSE_CODE_LONG_DESCRIPTION'
 );
 
 -- CELL_TOWER: CAUSE_CODE_SHORT_DESCRIPTION
 CREATE OR REPLACE CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Cell_Tower_CAUSE_CODE_SHORT_DESCRIPTION
 ON CAUSE_CODE_SHORT_DESCRIPTION
-ATTRIBUTES CELL_ID, CALL_ID
 WAREHOUSE = MYOPSXSMALL
 EMBEDDING_MODEL = 'snowflake-arctic-embed-l-v2.0'
-TARGET_LAG = '364 day'
+TARGET_LAG = '1 day'
 INITIALIZE = ON_SCHEDULE
 AS (
- SELECT CAUSE_CODE_SHORT_DESCRIPTION, CELL_ID, CALL_ID
- FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."CELL_TOWER"
+ SELECT TEXT_VALUE AS CAUSE_CODE_SHORT_DESCRIPTION, VALUE_ID
+ FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."SEARCH_TEXT_VALUES"
+ WHERE COLUMN_NAME = 'CAUSE_CODE_SHORT_DESCRIPTION'
 );
 
 -- CELL_TOWER: PM_PDCP_LAT_TIME_UL
 CREATE OR REPLACE CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Cell_Tower_PM_PDCP_LAT_TIME_UL
 ON PM_PDCP_LAT_TIME_UL
-ATTRIBUTES CELL_ID, CALL_ID
 WAREHOUSE = MYOPSXSMALL
 EMBEDDING_MODEL = 'snowflake-arctic-embed-l-v2.0'
-TARGET_LAG = '364 day'
+TARGET_LAG = '1 day'
 INITIALIZE = ON_SCHEDULE
 AS (
- SELECT PM_PDCP_LAT_TIME_UL, CELL_ID, CALL_ID
- FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."CELL_TOWER"
+ SELECT TEXT_VALUE AS PM_PDCP_LAT_TIME_UL, VALUE_ID
+ FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."SEARCH_TEXT_VALUES"
+ WHERE COLUMN_NAME = 'PM_PDCP_LAT_TIME_UL'
 );
 
--- SUPPORT_TICKETS: REQUEST
+-- SUPPORT_TICKETS: REQUEST (one row per distinct complaint text; TEXT_HASH maps to
+-- tickets through RAW.TICKET_CATEGORIES)
 CREATE OR REPLACE CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Support_Tickets_REQUEST
 ON REQUEST
-ATTRIBUTES TICKET_ID
+ATTRIBUTES CATEGORY
 WAREHOUSE = MYOPSXSMALL
 EMBEDDING_MODEL = 'snowflake-arctic-embed-l-v2.0'
-TARGET_LAG = '364 day'
+TARGET_LAG = '5 minutes'
 INITIALIZE = ON_SCHEDULE
 AS (
- SELECT REQUEST, TICKET_ID
- FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."SUPPORT_TICKETS"
+ SELECT COMPLAINT_TEXT AS REQUEST, TEXT_HASH, CATEGORY
+ FROM "TELCO_NETWORK_OPTIMIZATION_PROD"."RAW"."COMPLAINT_TEXT_LABELS"
 );
-
@@ -0,0 +1,191 @@
+-- ===============================================================================
+-- SEARCH REFRESH POLICY SETUP
+-- ===============================================================================
+-- Gives every Cortex Search service its own refresh policy and a scheduler that
+-- applies it, so freshness and cost can be tuned per service.
+-- Run this after create_cortex_searches.sql.
+--
+-- RAW.SEARCH_REFRESH_POLICY : one row per service
+--     TARGET_LAG            - lag the service refreshes at while indexing
+--     SOURCE_TABLE          - append-only table the service indexes
+--     ACTIVE_FROM_HOUR /    - hours of the day (account time zone) the service is
+--     ACTIVE_TO_HOUR          served at all; NULL = around the clock
+--     IDLE_MINUTES          - suspend indexing when the source has not changed
+--                             for this long; NULL = never
+--     LAST_STATE            - state applied by the last scheduler run
+-- RAW.SP_APPLY_SEARCH_REFRESH_POLICY : applies the policy to every enabled service
+--     ACTIVE  - inside the window and the source changed recently:
+--               serving and indexing resumed, TARGET_LAG set
+--     IDLE    - inside the window but the source is quiet: serving resumed,
+--               indexing suspended (nothing new to embed)
+--     OFF     - outside the window: serving and indexing suspended
+-- RAW.TASK_APPLY_SEARCH_REFRESH_POLICY : serverless task running the scheduler
+--                                        every 5 minutes
+--
+-- The sources are insert-only, change-tracked distinct-value tables
+-- (create_search_value_tables.sql, Setup/create_complaint_categories.sql), so a
+-- refresh only embeds texts never seen before. New tickets that reuse a known
+-- complaint text are searchable at once through RAW.TICKET_CATEGORIES.TEXT_HASH;
+-- only genuinely new texts wait for the ticket service's 5 minute lag.
+--
+-- USAGE:
+--   - Run once after create_cortex_searches.sql
+--   - Tune a service with e.g.
+--       UPDATE RAW.SEARCH_REFRESH_POLICY SET TARGET_LAG = '1 hour'
+--       WHERE SERVICE_NAME = 'NETWORK_OPTIMISE_SUPPORT_TICKETS_REQUEST';
+--     the next scheduler run applies it
+--   - suspend_cortex_searches.sql / resume_cortex_searches.sql also suspend and
+--     resume the scheduler task
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: POLICY TABLE
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.SEARCH_REFRESH_POLICY (
+    SERVICE_NAME VARCHAR(200),
+    SOURCE_TABLE VARCHAR(200),
+    TARGET_LAG VARCHAR(30),
+    ACTIVE_FROM_HOUR NUMBER(2,0),
+    ACTIVE_TO_HOUR NUMBER(2,0),
+    IDLE_MINUTES NUMBER(38,0),
+    ENABLED BOOLEAN,
+    LAST_STATE VARCHAR(10),
+    LAST_APPLIED_AT TIMESTAMP_NTZ(9)
+);
+
+-- Tickets: minutes; cause codes and uplink latency values barely change: daily
+MERGE INTO RAW.SEARCH_REFRESH_POLICY t
+USING (
+    SELECT * FROM VALUES
+        ('NETWORK_OPTIMISE_SUPPORT_TICKETS_REQUEST', 'COMPLAINT_TEXT_LABELS', '5 minutes', NULL, NULL, 60),
+        ('NETWORK_OPTIMISE_CELL_TOWER_CAUSE_CODE_LONG_DESCRIPTION', 'SEARCH_TEXT_VALUES', '1 day', NULL, NULL, 1440),
+        ('NETWORK_OPTIMISE_CELL_TOWER_CAUSE_CODE_SHORT_DESCRIPTION', 'SEARCH_TEXT_VALUES', '1 day', NULL, NULL, 1440),
+        ('NETWORK_OPTIMISE_CELL_TOWER_PM_PDCP_LAT_TIME_UL', 'SEARCH_TEXT_VALUES', '1 day', NULL, NULL, 1440)
+    AS v(SERVICE_NAME, SOURCE_TABLE, TARGET_LAG, ACTIVE_FROM_HOUR, ACTIVE_TO_HOUR, IDLE_MINUTES)
+) s
+ON t.SERVICE_NAME = s.SERVICE_NAME
+WHEN NOT MATCHED THEN INSERT (
+    SERVICE_NAME, SOURCE_TABLE, TARGET_LAG, ACTIVE_FROM_HOUR, ACTIVE_TO_HOUR, IDLE_MINUTES, ENABLED
+) VALUES (
+    s.SERVICE_NAME, s.SOURCE_TABLE, s.TARGET_LAG, s.ACTIVE_FROM_HOUR, s.ACTIVE_TO_HOUR, s.IDLE_MINUTES, TRUE
+);
+
+-- Incremental refreshes need change tracking on every source table; labels
+-- tables created before it was part of their CREATE do not have it yet
+ALTER TABLE RAW.COMPLAINT_TEXT_LABELS SET CHANGE_TRACKING = TRUE;
+
+SELECT 'Step 1 Complete: Search refresh policy defined' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: SCHEDULER PROCEDURE
+-- ===============================================================================
+
+CREATE OR REPLACE PROCEDURE RAW.SP_APPLY_SEARCH_REFRESH_POLICY()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    service_name STRING;
+    service_fqn STRING;
+    target_lag STRING;
+    desired_state STRING;
+    summary STRING DEFAULT '';
+    policy_cursor CURSOR FOR
+        WITH sources AS (
+            SELECT TABLE_NAME, LAST_ALTERED::TIMESTAMP_NTZ AS LAST_ALTERED
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = 'RAW'
+        )
+        SELECT
+            p.SERVICE_NAME,
+            p.TARGET_LAG,
+            CASE
+                WHEN p.ACTIVE_FROM_HOUR IS NOT NULL AND p.ACTIVE_TO_HOUR IS NOT NULL
+                     AND NOT IFF(p.ACTIVE_FROM_HOUR <= p.ACTIVE_TO_HOUR,
+                                 HOUR(CURRENT_TIMESTAMP()) BETWEEN p.ACTIVE_FROM_HOUR AND p.ACTIVE_TO_HOUR,
+                                 HOUR(CURRENT_TIMESTAMP()) >= p.ACTIVE_FROM_HOUR
+                                     OR HOUR(CURRENT_TIMESTAMP()) <= p.ACTIVE_TO_HOUR)
+                    THEN 'OFF'
+                WHEN p.IDLE_MINUTES IS NOT NULL
+                     AND COALESCE(s.LAST_ALTERED, '1970-01-01'::TIMESTAMP_NTZ)
+                         < DATEADD('MINUTE', -p.IDLE_MINUTES, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ)
+                    THEN 'IDLE'
+                ELSE 'ACTIVE'
+            END AS DESIRED_STATE
+        FROM RAW.SEARCH_REFRESH_POLICY p
+        LEFT JOIN sources s ON s.TABLE_NAME = UPPER(p.SOURCE_TABLE)
+        WHERE p.ENABLED;
+BEGIN
+    FOR policy IN policy_cursor DO
+        service_name := policy.SERVICE_NAME;
+        service_fqn := 'RAW.' || service_name;
+        target_lag := policy.TARGET_LAG;
+        desired_state := policy.DESIRED_STATE;
+
+        IF (desired_state = 'ACTIVE') THEN
+            EXECUTE IMMEDIATE 'ALTER CORTEX SEARCH SERVICE IF EXISTS ' || service_fqn || ' SET TARGET_LAG = ''' || target_lag || '''';
+            EXECUTE IMMEDIATE 'ALTER CORTEX SEARCH SERVICE IF EXISTS ' || service_fqn || ' RESUME';
+        ELSEIF (desired_state = 'IDLE') THEN
+            EXECUTE IMMEDIATE 'ALTER CORTEX SEARCH SERVICE IF EXISTS ' || service_fqn || ' RESUME SERVING';
+            EXECUTE IMMEDIATE 'ALTER CORTEX SEARCH SERVICE IF EXISTS ' || service_fqn || ' SUSPEND INDEXING';
+        ELSE
+            EXECUTE IMMEDIATE 'ALTER CORTEX SEARCH SERVICE IF EXISTS ' || service_fqn || ' SUSPEND';
+        END IF;
+
+        UPDATE RAW.SEARCH_REFRESH_POLICY
+        SET LAST_STATE = :desired_state,
+            LAST_APPLIED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+        WHERE SERVICE_NAME = :service_name;
+
+        summary := summary || service_name || '=' || desired_state || ' ';
+    END FOR;
+
+    RETURN 'Search refresh policy applied: ' || TRIM(summary);
+END;
+$$;
+
+SELECT 'Step 2 Complete: Scheduler procedure created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: INITIAL RUN AND SCHEDULER TASK
+-- ===============================================================================
+
+CALL RAW.SP_APPLY_SEARCH_REFRESH_POLICY();
+
+-- SERVERLESS task; only issues ALTERs, so each run is a few metadata statements
+CREATE OR REPLACE TASK RAW.TASK_APPLY_SEARCH_REFRESH_POLICY
+    SCHEDULE = '5 MINUTE'
+AS
+    CALL RAW.SP_APPLY_SEARCH_REFRESH_POLICY();
+
+-- Uncomment to let the policy drive the services
+-- ALTER TASK RAW.TASK_APPLY_SEARCH_REFRESH_POLICY RESUME;
+
+SELECT 'Step 3 Complete: Policy applied, scheduler task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Policy and the state each service was last put in
+SELECT SERVICE_NAME, TARGET_LAG, ACTIVE_FROM_HOUR, ACTIVE_TO_HOUR, IDLE_MINUTES, LAST_STATE, LAST_APPLIED_AT
+FROM RAW.SEARCH_REFRESH_POLICY
+ORDER BY SERVICE_NAME;
+
+-- Actual service state and freshness
+SHOW CORTEX SEARCH SERVICES IN SCHEMA RAW;
+
+-- Serve the ticket search only during demo hours (08:00-18:59)
+-- UPDATE RAW.SEARCH_REFRESH_POLICY SET ACTIVE_FROM_HOUR = 8, ACTIVE_TO_HOUR = 18
+-- WHERE SERVICE_NAME = 'NETWORK_OPTIMISE_SUPPORT_TICKETS_REQUEST';
+
+-- Scheduler history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_APPLY_SEARCH_REFRESH_POLICY'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
@@ -0,0 +1,199 @@
+-- ===============================================================================
+-- SEARCH VALUE TABLES SETUP
+-- ===============================================================================
+-- Creates the distinct-value tables the Cortex Search services index, so each
+-- service embeds a few hundred distinct texts instead of every CELL_TOWER row.
+-- Run this before create_cortex_searches.sql.
+--
+-- RAW.SEARCH_TEXT_VALUES  : one row per distinct value of CAUSE_CODE_LONG_DESCRIPTION,
+--                           CAUSE_CODE_SHORT_DESCRIPTION and PM_PDCP_LAT_TIME_UL,
+--                           with a stable VALUE_ID. Insert-only, so a service
+--                           refresh only embeds values never seen before
+-- RAW.SEARCH_VALUE_CELLS  : maps each VALUE_ID back to the cells it occurs on,
+--                           with row counts and the latest hour seen
+-- RAW.SEARCH_VALUE_BATCH  : working table holding the values of the current run
+-- RAW.CELL_TOWER_SEARCH_STREAM : append-only stream on CELL_TOWER
+-- RAW.TASK_REFRESH_SEARCH_VALUES : serverless task that adds only new values
+--
+-- Support ticket texts are already deduplicated by create_complaint_categories.sql
+-- (RAW.COMPLAINT_TEXT_LABELS, mapped to tickets by TEXT_HASH in
+-- RAW.TICKET_CATEGORIES); the REQUEST search service indexes that table.
+--
+-- To get from a search hit back to individual calls, filter CELL_TOWER on the
+-- returned text (see USEFUL QUERIES).
+--
+-- USAGE:
+--   - Run once after the data is loaded
+--   - CALL RAW.SP_REBUILD_SEARCH_VALUES(); after CELL_TOWER is recreated
+--     (master_data_cleanup.py replaces it, which breaks the stream); known
+--     values and their ids are kept
+--   - The task is created suspended; it is resumed and suspended together with
+--     the search services by resume_cortex_searches.sql / suspend_cortex_searches.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: VALUE, MAPPING AND BATCH TABLES
+-- ===============================================================================
+
+CREATE SEQUENCE IF NOT EXISTS RAW.SEARCH_VALUE_SEQ;
+
+CREATE TABLE IF NOT EXISTS RAW.SEARCH_TEXT_VALUES (
+    VALUE_ID NUMBER(38,0) DEFAULT RAW.SEARCH_VALUE_SEQ.NEXTVAL,
+    COLUMN_NAME VARCHAR(100),        -- CELL_TOWER column the value comes from
+    TEXT_VALUE VARCHAR(16777216),
+    FIRST_SEEN_AT TIMESTAMP_NTZ(9)
+)
+CHANGE_TRACKING = TRUE;
+
+CREATE TABLE IF NOT EXISTS RAW.SEARCH_VALUE_CELLS (
+    VALUE_ID NUMBER(38,0),
+    CELL_ID NUMBER(38,0),
+    ROW_COUNT NUMBER(38,0),
+    LAST_SEEN_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (VALUE_ID);
+
+CREATE TRANSIENT TABLE IF NOT EXISTS RAW.SEARCH_VALUE_BATCH (
+    COLUMN_NAME VARCHAR(100),
+    TEXT_VALUE VARCHAR(16777216),
+    CELL_ID NUMBER(38,0),
+    ROW_COUNT NUMBER(38,0),
+    LAST_SEEN_AT TIMESTAMP_NTZ(9)
+);
+
+SELECT 'Step 1 Complete: Search value tables ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: STREAM AND PROCEDURES
+-- ===============================================================================
+
+-- Add the values of the rows that arrived since the last run
+CREATE OR REPLACE PROCEDURE RAW.SP_REFRESH_SEARCH_VALUES()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    new_values INT DEFAULT 0;
+    mappings INT DEFAULT 0;
+BEGIN
+    -- The stream only advances if the whole run commits
+    BEGIN TRANSACTION;
+
+    DELETE FROM RAW.SEARCH_VALUE_BATCH;
+    INSERT INTO RAW.SEARCH_VALUE_BATCH (COLUMN_NAME, TEXT_VALUE, CELL_ID, ROW_COUNT, LAST_SEEN_AT)
+    SELECT COLUMN_NAME, TEXT_VALUE, CELL_ID, COUNT(*), MAX(TIMESTAMP)
+    FROM (
+        SELECT CELL_ID, TIMESTAMP, CAUSE_CODE_LONG_DESCRIPTION, CAUSE_CODE_SHORT_DESCRIPTION, PM_PDCP_LAT_TIME_UL
+        FROM RAW.CELL_TOWER_SEARCH_STREAM
+    )
+    UNPIVOT (TEXT_VALUE FOR COLUMN_NAME IN (
+        CAUSE_CODE_LONG_DESCRIPTION, CAUSE_CODE_SHORT_DESCRIPTION, PM_PDCP_LAT_TIME_UL
+    ))
+    WHERE TEXT_VALUE != ''
+    GROUP BY COLUMN_NAME, TEXT_VALUE, CELL_ID;
+
+    INSERT INTO RAW.SEARCH_TEXT_VALUES (COLUMN_NAME, TEXT_VALUE, FIRST_SEEN_AT)
+    SELECT DISTINCT b.COLUMN_NAME, b.TEXT_VALUE, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    FROM RAW.SEARCH_VALUE_BATCH b
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM RAW.SEARCH_TEXT_VALUES v
+        WHERE v.COLUMN_NAME = b.COLUMN_NAME
+          AND v.TEXT_VALUE = b.TEXT_VALUE
+    );
+    new_values := SQLROWCOUNT;
+
+    MERGE INTO RAW.SEARCH_VALUE_CELLS t
+    USING (
+        SELECT v.VALUE_ID, b.CELL_ID, b.ROW_COUNT, b.LAST_SEEN_AT
+        FROM RAW.SEARCH_VALUE_BATCH b
+        JOIN RAW.SEARCH_TEXT_VALUES v
+          ON v.COLUMN_NAME = b.COLUMN_NAME
+         AND v.TEXT_VALUE = b.TEXT_VALUE
+        WHERE b.CELL_ID IS NOT NULL
+    ) s
+    ON t.VALUE_ID = s.VALUE_ID
+       AND t.CELL_ID = s.CELL_ID
+    WHEN MATCHED THEN UPDATE SET
+        ROW_COUNT = t.ROW_COUNT + s.ROW_COUNT,
+        LAST_SEEN_AT = GREATEST(t.LAST_SEEN_AT, s.LAST_SEEN_AT)
+    WHEN NOT MATCHED THEN INSERT (VALUE_ID, CELL_ID, ROW_COUNT, LAST_SEEN_AT)
+    VALUES (s.VALUE_ID, s.CELL_ID, s.ROW_COUNT, s.LAST_SEEN_AT);
+    mappings := SQLROWCOUNT;
+
+    COMMIT;
+    RETURN 'Search values: ' || new_values || ' new values, ' || mappings || ' cell mappings updated';
+END;
+$$;
+
+-- Rebuild the cell mapping from the full table (values and ids are kept)
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_SEARCH_VALUES()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    TRUNCATE TABLE RAW.SEARCH_VALUE_CELLS;
+    CREATE OR REPLACE STREAM RAW.CELL_TOWER_SEARCH_STREAM
+        ON TABLE RAW.CELL_TOWER APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CALL RAW.SP_REFRESH_SEARCH_VALUES();
+    RETURN 'Search values rebuilt';
+END;
+$$;
+
+SELECT 'Step 2 Complete: Search value procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: INITIAL LOAD AND REFRESH TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_SEARCH_VALUES();
+
+-- SERVERLESS task; only runs when new measurements have arrived
+CREATE OR REPLACE TASK RAW.TASK_REFRESH_SEARCH_VALUES
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.CELL_TOWER_SEARCH_STREAM')
+AS
+    CALL RAW.SP_REFRESH_SEARCH_VALUES();
+
+-- Uncomment to pick up new values while the generators are running
+-- ALTER TASK RAW.TASK_REFRESH_SEARCH_VALUES RESUME;
+
+SELECT 'Step 3 Complete: Search values loaded, refresh task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Distinct values per column (what each search service embeds)
+SELECT COLUMN_NAME, COUNT(*) AS DISTINCT_VALUES
+FROM RAW.SEARCH_TEXT_VALUES
+GROUP BY COLUMN_NAME;
+
+-- From a search hit (VALUE_ID) back to cells
+SELECT v.COLUMN_NAME, v.TEXT_VALUE, c.CELL_ID, c.ROW_COUNT, c.LAST_SEEN_AT
+FROM RAW.SEARCH_TEXT_VALUES v
+JOIN RAW.SEARCH_VALUE_CELLS c ON c.VALUE_ID = v.VALUE_ID
+WHERE v.VALUE_ID = 1
+ORDER BY c.ROW_COUNT DESC;
+
+-- ... and to individual calls of one of those cells
+SELECT t.CALL_ID, t.TIMESTAMP, t.CAUSE_CODE_SHORT_DESCRIPTION
+FROM RAW.CELL_TOWER t
+JOIN RAW.SEARCH_TEXT_VALUES v
+  ON v.COLUMN_NAME = 'CAUSE_CODE_SHORT_DESCRIPTION'
+ AND v.TEXT_VALUE = t.CAUSE_CODE_SHORT_DESCRIPTION
+WHERE v.VALUE_ID = 1
+  AND t.CELL_ID = 1
+ORDER BY t.TIMESTAMP DESC
+LIMIT 50;
+
+-- Refresh history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_REFRESH_SEARCH_VALUES'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
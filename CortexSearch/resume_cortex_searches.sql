@@ -6,3 +6,8 @@ ALTER CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise
 ALTER CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Cell_Tower_PM_PDCP_LAT_TIME_UL RESUME;
 ALTER CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Support_Tickets_REQUEST RESUME;
 
+-- Keep the distinct-value tables behind the services current (created by create_search_value_tables.sql)
+ALTER TASK IF EXISTS TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TASK_REFRESH_SEARCH_VALUES RESUME;
+
+-- Let the refresh policy drive each service from here on (created by create_search_refresh_policy.sql)
+ALTER TASK IF EXISTS TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TASK_APPLY_SEARCH_REFRESH_POLICY RESUME;
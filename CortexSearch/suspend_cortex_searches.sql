@@ -6,3 +6,8 @@ ALTER CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise
 ALTER CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Cell_Tower_PM_PDCP_LAT_TIME_UL SUSPEND;
 ALTER CORTEX SEARCH SERVICE TELCO_NETWORK_OPTIMIZATION_PROD.RAW.Network_Optimise_Support_Tickets_REQUEST SUSPEND;
 
+-- Stop adding new values to the distinct-value tables (created by create_search_value_tables.sql)
+ALTER TASK IF EXISTS TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TASK_REFRESH_SEARCH_VALUES SUSPEND;
+
+-- Stop the refresh policy scheduler, or it would resume the services (created by create_search_refresh_policy.sql)
+ALTER TASK IF EXISTS TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TASK_APPLY_SEARCH_REFRESH_POLICY SUSPEND;
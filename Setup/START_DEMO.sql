@@ -12,6 +12,36 @@ USE SCHEMA GENERATE;
 ALTER TASK TASK_GENERATE_CELL_TOWER_DATA RESUME;
 ALTER TASK TASK_GENERATE_SUPPORT_TICKET RESUME;
 
+-- Keep the tower scorecard current (created by create_tower_scorecard.sql)
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_TOWER_SCORECARD RESUME;
+
+-- Keep the KPI rollup current (created by create_kpi_rollups.sql)
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_KPI_ROLLUP RESUME;
+
+-- Keep the service cubes current (created by create_service_cubes.sql)
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_SERVICE_CUBES RESUME;
+
+-- Keep the loyalty bridge current (created by create_loyalty_bridge.sql)
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_LOYALTY_BRIDGE RESUME;
+
+-- Keep the customer impact ledger current (created by create_customer_impact_ledger.sql)
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_CUSTOMER_IMPACT RESUME;
+
+-- Raise early-warning alerts as each hour lands (created by create_anomaly_detection.sql)
+ALTER TASK IF EXISTS RAW.TASK_DETECT_ANOMALIES RESUME;
+
+-- Refit the capacity forecasts hourly (created by create_capacity_forecast.sql)
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_CAPACITY_FORECAST RESUME;
+
+-- Analyse new tickets as they arrive (created by create_ticket_rca.sql)
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_TICKET_RCA RESUME;
+
+-- Check each new hour of measurements (created by create_data_quality.sql)
+ALTER TASK IF EXISTS RAW.TASK_CHECK_DATA_QUALITY RESUME;
+
+-- Label new tickets with a complaint category (created by create_complaint_categories.sql)
+ALTER TASK IF EXISTS RAW.TASK_CATEGORIZE_TICKETS RESUME;
+
 SELECT '✅ Demo streaming STARTED!' AS STATUS;
 SELECT '' AS BLANK;
 SELECT 'What happens now:' AS INFO
@@ -10,6 +10,16 @@ USE SCHEMA GENERATE;
 -- Stop both tasks
 ALTER TASK TASK_GENERATE_CELL_TOWER_DATA SUSPEND;
 ALTER TASK TASK_GENERATE_SUPPORT_TICKET SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_TOWER_SCORECARD SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_KPI_ROLLUP SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_SERVICE_CUBES SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_LOYALTY_BRIDGE SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_CUSTOMER_IMPACT SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_DETECT_ANOMALIES SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_CAPACITY_FORECAST SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_REFRESH_TICKET_RCA SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_CHECK_DATA_QUALITY SUSPEND;
+ALTER TASK IF EXISTS RAW.TASK_CATEGORIZE_TICKETS SUSPEND;
 
 SELECT '✅ Demo streaming STOPPED!' AS STATUS;
 SELECT '' AS BLANK;
@@ -0,0 +1,281 @@
+-- ===============================================================================
+-- ANOMALY DETECTION SETUP
+-- ===============================================================================
+-- Creates an online early-warning detector for the hourly CELL_TOWER feed,
+-- behind the Proactive Network Adjustments page.
+--
+-- RAW.CELL_ANOMALY_STATE  : per (CELL_ID, METRIC) exponentially weighted mean
+--                           and mean absolute deviation of the hourly values
+-- RAW.NETWORK_ALERTS      : one row per (cell, hour, metric) whose robust
+--                           z-score crossed the warning threshold
+-- RAW.CELL_ANOMALY_BATCH  : working table holding the hourly values of the
+--                           current run
+-- RAW.CELL_TOWER_ANOMALY_STREAM : append-only stream on CELL_TOWER
+-- RAW.TASK_DETECT_ANOMALIES : serverless task that scores each newly generated
+--                           hour against the state, raises alerts and then
+--                           folds the hour into the state
+--
+-- Metrics: FAILURE_RATE (% of calls with CALL_RELEASE_CODE != 0), LATENCY_DL
+-- (PM_PDCP_LAT_TIME_DL), PRB_UTIL_DL (PM_PRB_UTIL_DL) and ERAB_ABNORMAL
+-- (PM_ERAB_REL_ABNORMAL_ENB); for all four, higher is worse.
+--
+-- Scoring: z = (value - mean) / (1.2533 * mean absolute deviation). The factor
+-- turns the absolute deviation into a standard deviation for normal data, and
+-- values are clipped at mean + 3 scales before they update the state, so one
+-- outage does not drag the baseline up. Each run touches only the state rows of
+-- the cells in the new hour, so detection costs O(cells) per hour and never
+-- rescans history.
+--
+-- USAGE:
+--   - Run once after the data is loaded
+--   - CALL RAW.SP_REBUILD_ANOMALY_STATE(); after CELL_TOWER is recreated
+--     (master_data_cleanup.py replaces it, which breaks the stream); it seeds
+--     the state from the last 7 days without raising alerts
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: STATE, ALERT AND BATCH TABLES
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.CELL_ANOMALY_STATE (
+    CELL_ID NUMBER(38,0),
+    METRIC VARCHAR(30),
+    EWMA_MEAN FLOAT,
+    EWMA_ABS_DEV FLOAT,
+    HOURS_SEEN NUMBER(38,0),
+    LAST_PERIOD_START TIMESTAMP_NTZ(9),
+    UPDATED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (CELL_ID);
+
+CREATE TABLE IF NOT EXISTS RAW.NETWORK_ALERTS (
+    CELL_ID NUMBER(38,0),
+    PERIOD_START TIMESTAMP_NTZ(9),
+    METRIC VARCHAR(30),
+    OBSERVED_VALUE FLOAT,
+    EXPECTED_VALUE FLOAT,
+    Z_SCORE FLOAT,
+    SEVERITY VARCHAR(10),
+    DETECTED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (PERIOD_START);
+
+CREATE TRANSIENT TABLE IF NOT EXISTS RAW.CELL_ANOMALY_BATCH (
+    CELL_ID NUMBER(38,0),
+    PERIOD_START TIMESTAMP_NTZ(9),
+    METRIC VARCHAR(30),
+    VALUE FLOAT
+);
+
+SELECT 'Step 1 Complete: Anomaly state, alert and batch tables ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: STREAM AND PROCEDURES
+-- ===============================================================================
+
+-- Score the hours that arrived since the last run, oldest first
+CREATE OR REPLACE PROCEDURE RAW.SP_DETECT_ANOMALIES()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    alpha FLOAT DEFAULT 0.1;            -- EWMA weight of the newest hour
+    warmup_hours INT DEFAULT 24;        -- hours of state before a cell can alert
+    warning_z FLOAT DEFAULT 3.0;
+    critical_z FLOAT DEFAULT 5.0;
+    clip_z FLOAT DEFAULT 3.0;           -- values beyond this are clipped before updating the state
+    period TIMESTAMP_NTZ;
+    hours_processed INT DEFAULT 0;
+    alerts_raised INT DEFAULT 0;
+    hours_cursor CURSOR FOR
+        SELECT DISTINCT PERIOD_START FROM RAW.CELL_ANOMALY_BATCH ORDER BY PERIOD_START;
+BEGIN
+    -- The stream only advances if the whole run commits
+    BEGIN TRANSACTION;
+
+    DELETE FROM RAW.CELL_ANOMALY_BATCH;
+    INSERT INTO RAW.CELL_ANOMALY_BATCH (CELL_ID, PERIOD_START, METRIC, VALUE)
+    WITH hourly AS (
+        SELECT
+            CELL_ID,
+            DATE_TRUNC('HOUR', TIMESTAMP) AS PERIOD_START,
+            (COUNT_IF(CALL_RELEASE_CODE != 0) * 100.0 / COUNT(*))::FLOAT AS FAILURE_RATE,
+            AVG(PM_PDCP_LAT_TIME_DL)::FLOAT AS LATENCY_DL,
+            AVG(PM_PRB_UTIL_DL)::FLOAT AS PRB_UTIL_DL,
+            AVG(PM_ERAB_REL_ABNORMAL_ENB)::FLOAT AS ERAB_ABNORMAL
+        FROM RAW.CELL_TOWER_ANOMALY_STREAM
+        WHERE CELL_ID IS NOT NULL
+        GROUP BY CELL_ID, PERIOD_START
+    )
+    SELECT CELL_ID, PERIOD_START, METRIC, VALUE
+    FROM hourly
+    UNPIVOT (VALUE FOR METRIC IN (FAILURE_RATE, LATENCY_DL, PRB_UTIL_DL, ERAB_ABNORMAL));
+
+    FOR hour_row IN hours_cursor DO
+        period := hour_row.PERIOD_START;
+
+        -- Score the hour against the state as it stood before this hour
+        INSERT INTO RAW.NETWORK_ALERTS (
+            CELL_ID, PERIOD_START, METRIC, OBSERVED_VALUE, EXPECTED_VALUE, Z_SCORE, SEVERITY, DETECTED_AT
+        )
+        WITH scored AS (
+            SELECT
+                b.CELL_ID,
+                b.PERIOD_START,
+                b.METRIC,
+                b.VALUE,
+                s.EWMA_MEAN,
+                (b.VALUE - s.EWMA_MEAN)
+                    / GREATEST(1.2533 * s.EWMA_ABS_DEV, 0.01 + 0.05 * ABS(s.EWMA_MEAN)) AS Z_SCORE
+            FROM RAW.CELL_ANOMALY_BATCH b
+            JOIN RAW.CELL_ANOMALY_STATE s
+              ON s.CELL_ID = b.CELL_ID
+             AND s.METRIC = b.METRIC
+            WHERE b.PERIOD_START = :period
+              AND s.HOURS_SEEN >= :warmup_hours
+              AND b.PERIOD_START > s.LAST_PERIOD_START
+        )
+        SELECT
+            CELL_ID, PERIOD_START, METRIC, VALUE, ROUND(EWMA_MEAN, 4), ROUND(Z_SCORE, 2),
+            IFF(Z_SCORE >= :critical_z, 'CRITICAL', 'WARNING'),
+            CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+        FROM scored
+        WHERE Z_SCORE >= :warning_z;
+        alerts_raised := alerts_raised + SQLROWCOUNT;
+
+        -- Fold the hour into the state (clipped, so outliers barely move the baseline)
+        MERGE INTO RAW.CELL_ANOMALY_STATE t
+        USING (
+            SELECT CELL_ID, METRIC, VALUE
+            FROM RAW.CELL_ANOMALY_BATCH
+            WHERE PERIOD_START = :period
+        ) b
+        ON t.CELL_ID = b.CELL_ID
+           AND t.METRIC = b.METRIC
+        WHEN MATCHED AND :period > t.LAST_PERIOD_START THEN UPDATE SET
+            EWMA_MEAN = t.EWMA_MEAN + :alpha * (
+                LEAST(b.VALUE, t.EWMA_MEAN + :clip_z * GREATEST(1.2533 * t.EWMA_ABS_DEV, 0.01 + 0.05 * ABS(t.EWMA_MEAN)))
+                - t.EWMA_MEAN),
+            EWMA_ABS_DEV = (1 - :alpha) * t.EWMA_ABS_DEV + :alpha * ABS(
+                LEAST(b.VALUE, t.EWMA_MEAN + :clip_z * GREATEST(1.2533 * t.EWMA_ABS_DEV, 0.01 + 0.05 * ABS(t.EWMA_MEAN)))
+                - t.EWMA_MEAN),
+            HOURS_SEEN = t.HOURS_SEEN + 1,
+            LAST_PERIOD_START = :period,
+            UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+        WHEN NOT MATCHED THEN INSERT (
+            CELL_ID, METRIC, EWMA_MEAN, EWMA_ABS_DEV, HOURS_SEEN, LAST_PERIOD_START, UPDATED_AT
+        ) VALUES (
+            b.CELL_ID, b.METRIC, b.VALUE, 0, 1, :period, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+        );
+
+        hours_processed := hours_processed + 1;
+    END FOR;
+
+    COMMIT;
+    RETURN 'Anomaly detection: ' || hours_processed || ' hours scored, ' || alerts_raised || ' alerts raised';
+END;
+$$;
+
+-- Seed the state from recent history without raising alerts
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_ANOMALY_STATE()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    -- New stream first: hours landing during the seed are scored by the next run,
+    -- and LAST_PERIOD_START stops the seeded hours from being counted twice
+    CREATE OR REPLACE STREAM RAW.CELL_TOWER_ANOMALY_STREAM
+        ON TABLE RAW.CELL_TOWER APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = FALSE;
+    TRUNCATE TABLE RAW.CELL_ANOMALY_STATE;
+
+    INSERT INTO RAW.CELL_ANOMALY_STATE (
+        CELL_ID, METRIC, EWMA_MEAN, EWMA_ABS_DEV, HOURS_SEEN, LAST_PERIOD_START, UPDATED_AT
+    )
+    WITH hourly AS (
+        SELECT
+            CELL_ID,
+            DATE_TRUNC('HOUR', TIMESTAMP) AS PERIOD_START,
+            (COUNT_IF(CALL_RELEASE_CODE != 0) * 100.0 / COUNT(*))::FLOAT AS FAILURE_RATE,
+            AVG(PM_PDCP_LAT_TIME_DL)::FLOAT AS LATENCY_DL,
+            AVG(PM_PRB_UTIL_DL)::FLOAT AS PRB_UTIL_DL,
+            AVG(PM_ERAB_REL_ABNORMAL_ENB)::FLOAT AS ERAB_ABNORMAL
+        FROM RAW.CELL_TOWER
+        WHERE CELL_ID IS NOT NULL
+          AND TIMESTAMP >= (SELECT DATEADD('DAY', -7, MAX(TIMESTAMP)) FROM RAW.CELL_TOWER)
+        GROUP BY CELL_ID, PERIOD_START
+    ),
+    long_form AS (
+        SELECT CELL_ID, PERIOD_START, METRIC, VALUE
+        FROM hourly
+        UNPIVOT (VALUE FOR METRIC IN (FAILURE_RATE, LATENCY_DL, PRB_UTIL_DL, ERAB_ABNORMAL))
+    ),
+    medians AS (
+        SELECT CELL_ID, METRIC, MEDIAN(VALUE) AS MEDIAN_VALUE
+        FROM long_form
+        GROUP BY CELL_ID, METRIC
+    )
+    SELECT
+        l.CELL_ID,
+        l.METRIC,
+        ANY_VALUE(m.MEDIAN_VALUE),
+        AVG(ABS(l.VALUE - m.MEDIAN_VALUE)),
+        COUNT(*),
+        MAX(l.PERIOD_START),
+        CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    FROM long_form l
+    JOIN medians m ON m.CELL_ID = l.CELL_ID AND m.METRIC = l.METRIC
+    GROUP BY l.CELL_ID, l.METRIC;
+
+    RETURN 'Anomaly state seeded for ' || SQLROWCOUNT || ' (cell, metric) pairs';
+END;
+$$;
+
+SELECT 'Step 2 Complete: Detection and seeding procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: INITIAL SEED AND DETECTION TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_ANOMALY_STATE();
+
+-- SERVERLESS task; only runs when a new hour of measurements has arrived
+CREATE OR REPLACE TASK RAW.TASK_DETECT_ANOMALIES
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.CELL_TOWER_ANOMALY_STREAM')
+AS
+    CALL RAW.SP_DETECT_ANOMALIES();
+
+-- Uncomment to raise alerts while the generators are running
+-- ALTER TASK RAW.TASK_DETECT_ANOMALIES RESUME;
+
+SELECT 'Step 3 Complete: Anomaly state seeded, detection task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Latest alerts
+SELECT CELL_ID, PERIOD_START, METRIC, OBSERVED_VALUE, EXPECTED_VALUE, Z_SCORE, SEVERITY
+FROM RAW.NETWORK_ALERTS
+ORDER BY PERIOD_START DESC, Z_SCORE DESC
+LIMIT 50;
+
+-- Cells alerting on several metrics in the last day
+SELECT CELL_ID, COUNT(DISTINCT METRIC) AS METRICS_ALERTING, COUNT(*) AS ALERTS, MAX(Z_SCORE) AS MAX_Z
+FROM RAW.NETWORK_ALERTS
+WHERE PERIOD_START >= (SELECT DATEADD('DAY', -1, MAX(PERIOD_START)) FROM RAW.NETWORK_ALERTS)
+GROUP BY CELL_ID
+HAVING COUNT(DISTINCT METRIC) > 1
+ORDER BY METRICS_ALERTING DESC, MAX_Z DESC;
+
+-- Detection history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_DETECT_ANOMALIES'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
@@ -0,0 +1,60 @@
+-- ===============================================================================
+-- APP MONITORING SETUP
+-- ===============================================================================
+-- Creates the tables the Streamlit app writes its own telemetry to.
+--
+-- APP_PERF_EVENTS: one row per timed stage per page rerun (query execution,
+--                  to_pandas conversion, H3 indexing, color mapping, layer
+--                  building, chart rendering). Written by utils/instrumentation.py.
+--
+-- USAGE:
+--   - Run once with a role that owns the RAW schema
+--   - Grant INSERT to the role the Streamlit app runs as
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+CREATE TABLE IF NOT EXISTS RAW.APP_PERF_EVENTS (
+    EVENT_TS TIMESTAMP_NTZ(9),
+    RUN_ID VARCHAR(32),          -- One id per page rerun
+    PAGE VARCHAR(100),
+    STAGE VARCHAR(50),           -- query, to_pandas, h3_index, color_map, layer_build, chart_render, ...
+    DETAIL VARCHAR(200),         -- Function or metric the stage ran for
+    ELAPSED_MS FLOAT,
+    ROWS NUMBER(38,0),
+    QUERY_ID VARCHAR(100)        -- Snowflake query id for query / to_pandas stages
+);
+
+SELECT 'APP_PERF_EVENTS table ready' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Which stage dominates each page over the last day
+SELECT
+    PAGE,
+    STAGE,
+    COUNT(DISTINCT RUN_ID) AS RERUNS,
+    ROUND(AVG(ELAPSED_MS), 1) AS AVG_MS,
+    ROUND(MAX(ELAPSED_MS), 1) AS MAX_MS,
+    ROUND(SUM(ELAPSED_MS) / 1000, 1) AS TOTAL_SECONDS
+FROM RAW.APP_PERF_EVENTS
+WHERE EVENT_TS >= DATEADD(DAY, -1, SYSDATE())
+GROUP BY PAGE, STAGE
+ORDER BY PAGE, TOTAL_SECONDS DESC;
+
+-- Slowest individual queries, joined back to the warehouse query history
+SELECT
+    e.PAGE,
+    e.DETAIL,
+    e.ELAPSED_MS,
+    q.TOTAL_ELAPSED_TIME,
+    q.BYTES_SCANNED,
+    q.WAREHOUSE_NAME
+FROM RAW.APP_PERF_EVENTS e
+LEFT JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY q ON q.QUERY_ID = e.QUERY_ID
+WHERE e.STAGE = 'query'
+ORDER BY e.ELAPSED_MS DESC
+LIMIT 20;
@@ -0,0 +1,281 @@
+-- ===============================================================================
+-- CAPACITY FORECAST SETUP
+-- ===============================================================================
+-- Fits a lightweight seasonal model per cell and metric in batch and caches the
+-- forecasts, so the Capacity Planning page reads results instead of fitting
+-- thousands of models interactively.
+--
+-- RAW.FIT_CAPACITY_MODEL   : Python UDTF, called partitioned by (CELL_ID, METRIC);
+--                            least-squares fit of level + linear trend + two
+--                            daily harmonics on the hourly series, forecasting
+--                            the daily busy-hour peak over the horizon
+-- RAW.CAPACITY_FORECAST    : daily peak forecast with a 95% band per cell/metric
+-- RAW.CAPACITY_SUMMARY     : one row per cell/metric: current and forecast peak,
+--                            trend, fit error and hours until the forecast first
+--                            reaches the saturation threshold
+-- RAW.TASK_REFRESH_CAPACITY_FORECAST : serverless task that refits every hour
+--
+-- Metrics and saturation thresholds:
+--   PRB_UTIL_DL  : hourly average PM_PRB_UTIL_DL, saturated at 85 (%)
+--   PRB_UTIL_UL  : hourly average PM_PRB_UTIL_UL, saturated at 85 (%)
+--   RRC_CONN_MAX : hourly maximum PM_RRC_CONN_MAX, saturated at 1200 connections
+--
+-- USAGE:
+--   - Run once after the data is loaded (and after master_data_cleanup.py)
+--   - CALL RAW.SP_REFRESH_CAPACITY_FORECAST(); to refit on demand
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: FORECAST TABLES
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.CAPACITY_FORECAST (
+    CELL_ID NUMBER(38,0),
+    METRIC VARCHAR(30),
+    FORECAST_DAY DATE,
+    PEAK_FORECAST FLOAT,
+    PEAK_LOWER FLOAT,
+    PEAK_UPPER FLOAT,
+    FITTED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (CELL_ID);
+
+CREATE TABLE IF NOT EXISTS RAW.CAPACITY_SUMMARY (
+    CELL_ID NUMBER(38,0),
+    METRIC VARCHAR(30),
+    SATURATION_THRESHOLD FLOAT,
+    CURRENT_PEAK FLOAT,
+    FORECAST_PEAK FLOAT,
+    TREND_PER_DAY FLOAT,
+    RMSE FLOAT,
+    HISTORY_HOURS NUMBER(38,0),
+    HOURS_TO_SATURATION NUMBER(38,0),
+    SATURATION_AT TIMESTAMP_NTZ(9),
+    FITTED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (METRIC);
+
+SELECT 'Step 1 Complete: CAPACITY_FORECAST and CAPACITY_SUMMARY tables ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: PER-CELL MODEL (Python UDTF)
+-- ===============================================================================
+
+-- Emits one row per forecast day; the summary columns repeat on every row
+CREATE OR REPLACE FUNCTION RAW.FIT_CAPACITY_MODEL(
+    CELL_ID NUMBER, METRIC VARCHAR, PERIOD_START TIMESTAMP_NTZ, VALUE FLOAT,
+    THRESHOLD FLOAT, HORIZON_DAYS NUMBER
+)
+RETURNS TABLE (
+    CELL_ID NUMBER,
+    METRIC VARCHAR,
+    FORECAST_DAY DATE,
+    PEAK_FORECAST FLOAT,
+    PEAK_LOWER FLOAT,
+    PEAK_UPPER FLOAT,
+    CURRENT_PEAK FLOAT,
+    TREND_PER_DAY FLOAT,
+    RMSE FLOAT,
+    HISTORY_HOURS NUMBER,
+    HOURS_TO_SATURATION NUMBER,
+    SATURATION_AT TIMESTAMP_NTZ
+)
+LANGUAGE PYTHON
+RUNTIME_VERSION = '3.11'
+PACKAGES = ('numpy')
+HANDLER = 'CapacityModel'
+AS
+$$
+import numpy as np
+
+MIN_HISTORY_HOURS = 48
+Z_95 = 1.96
+
+
+def design_matrix(hours):
+    """Level, trend (per day) and two daily harmonics for hour offsets"""
+    angle = 2 * np.pi * (hours % 24) / 24
+    return np.column_stack([
+        np.ones_like(hours), hours / 24.0,
+        np.sin(angle), np.cos(angle), np.sin(2 * angle), np.cos(2 * angle),
+    ])
+
+
+class CapacityModel:
+    def __init__(self):
+        self.periods = []
+        self.values = []
+
+    def process(self, cell_id, metric, period_start, value, threshold, horizon_days):
+        self.cell_id, self.metric = cell_id, metric
+        self.threshold, self.horizon_days = threshold, int(horizon_days)
+        if period_start is not None and value is not None:
+            self.periods.append(period_start)
+            self.values.append(value)
+
+    def end_partition(self):
+        if len(self.values) < MIN_HISTORY_HOURS:
+            return
+        order = np.argsort(np.array(self.periods, dtype="datetime64[s]"))
+        periods = np.array(self.periods, dtype="datetime64[s]")[order]
+        y = np.array(self.values, dtype=float)[order]
+
+        # Hours since midnight of the first day, so the harmonics line up with clock time
+        origin = periods[0].astype("datetime64[D]")
+        hours = (periods - origin).astype("timedelta64[h]").astype(float)
+        coef, *_ = np.linalg.lstsq(design_matrix(hours), y, rcond=None)
+        rmse = float(np.sqrt(np.mean((design_matrix(hours) @ coef - y) ** 2)))
+
+        future = hours[-1] + np.arange(1, self.horizon_days * 24 + 1, dtype=float)
+        forecast = design_matrix(future) @ coef
+        if self.metric.startswith("PRB_"):
+            forecast = np.clip(forecast, 0.0, 100.0)
+        forecast = np.maximum(forecast, 0.0)
+
+        current_peak = float(y[hours > hours[-1] - 24].max())
+        crossing = np.flatnonzero(forecast >= self.threshold)
+        if current_peak >= self.threshold:
+            hours_to_saturation = 0
+        elif crossing.size:
+            hours_to_saturation = int(future[crossing[0]] - hours[-1])
+        else:
+            hours_to_saturation = None
+        saturation_at = None
+        if hours_to_saturation is not None:
+            saturation_at = (periods[-1] + np.timedelta64(hours_to_saturation, "h")).astype(object)
+
+        future_days = (origin + (future // 24).astype("timedelta64[D]")).astype(object)
+        day_peaks = {}
+        for day, value in zip(future_days, forecast):
+            day_peaks[day] = max(value, day_peaks.get(day, -np.inf))
+        for day, peak in day_peaks.items():
+            yield (
+                self.cell_id, self.metric, day,
+                round(float(peak), 3), round(max(float(peak) - Z_95 * rmse, 0.0), 3), round(float(peak) + Z_95 * rmse, 3),
+                round(current_peak, 3), round(float(coef[1]), 4), round(rmse, 4), len(y),
+                hours_to_saturation, saturation_at,
+            )
+$$;
+
+SELECT 'Step 2 Complete: FIT_CAPACITY_MODEL UDTF created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: REFRESH PROCEDURE
+-- ===============================================================================
+
+-- Refit every cell on the last 28 days of hourly values and replace the cached results
+CREATE OR REPLACE PROCEDURE RAW.SP_REFRESH_CAPACITY_FORECAST()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    history_days INT DEFAULT 28;
+    horizon_days INT DEFAULT 14;
+    fitted_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()::TIMESTAMP_NTZ;
+    forecast_rows INT DEFAULT 0;
+    summary_rows INT DEFAULT 0;
+BEGIN
+    CREATE OR REPLACE TEMPORARY TABLE CAPACITY_FIT_RESULTS AS
+    WITH hourly AS (
+        SELECT
+            CELL_ID,
+            DATE_TRUNC('HOUR', TIMESTAMP) AS PERIOD_START,
+            AVG(PM_PRB_UTIL_DL)::FLOAT AS PRB_UTIL_DL,
+            AVG(PM_PRB_UTIL_UL)::FLOAT AS PRB_UTIL_UL,
+            MAX(PM_RRC_CONN_MAX)::FLOAT AS RRC_CONN_MAX
+        FROM RAW.CELL_TOWER
+        WHERE CELL_ID IS NOT NULL
+          AND TIMESTAMP >= (SELECT DATEADD('DAY', -1 * :history_days, MAX(TIMESTAMP)) FROM RAW.CELL_TOWER)
+        GROUP BY CELL_ID, PERIOD_START
+    ),
+    long_form AS (
+        SELECT CELL_ID, PERIOD_START, METRIC, VALUE,
+               CASE METRIC WHEN 'RRC_CONN_MAX' THEN 1200 ELSE 85 END::FLOAT AS THRESHOLD
+        FROM hourly
+        UNPIVOT (VALUE FOR METRIC IN (PRB_UTIL_DL, PRB_UTIL_UL, RRC_CONN_MAX))
+    )
+    SELECT f.*
+    FROM long_form l,
+         TABLE(RAW.FIT_CAPACITY_MODEL(l.CELL_ID, l.METRIC, l.PERIOD_START, l.VALUE, l.THRESHOLD, :horizon_days)
+               OVER (PARTITION BY l.CELL_ID, l.METRIC)) f;
+
+    BEGIN TRANSACTION;
+
+    INSERT OVERWRITE INTO RAW.CAPACITY_FORECAST (
+        CELL_ID, METRIC, FORECAST_DAY, PEAK_FORECAST, PEAK_LOWER, PEAK_UPPER, FITTED_AT
+    )
+    SELECT CELL_ID, METRIC, FORECAST_DAY, PEAK_FORECAST, PEAK_LOWER, PEAK_UPPER, :fitted_at
+    FROM CAPACITY_FIT_RESULTS;
+    forecast_rows := SQLROWCOUNT;
+
+    INSERT OVERWRITE INTO RAW.CAPACITY_SUMMARY (
+        CELL_ID, METRIC, SATURATION_THRESHOLD, CURRENT_PEAK, FORECAST_PEAK, TREND_PER_DAY, RMSE,
+        HISTORY_HOURS, HOURS_TO_SATURATION, SATURATION_AT, FITTED_AT
+    )
+    SELECT
+        CELL_ID,
+        METRIC,
+        CASE METRIC WHEN 'RRC_CONN_MAX' THEN 1200 ELSE 85 END,
+        ANY_VALUE(CURRENT_PEAK),
+        MAX(PEAK_FORECAST),
+        ANY_VALUE(TREND_PER_DAY),
+        ANY_VALUE(RMSE),
+        ANY_VALUE(HISTORY_HOURS),
+        ANY_VALUE(HOURS_TO_SATURATION),
+        ANY_VALUE(SATURATION_AT),
+        :fitted_at
+    FROM CAPACITY_FIT_RESULTS
+    GROUP BY CELL_ID, METRIC;
+    summary_rows := SQLROWCOUNT;
+
+    COMMIT;
+    RETURN 'Capacity forecast refreshed: ' || summary_rows || ' models, ' || forecast_rows || ' forecast days';
+END;
+$$;
+
+SELECT 'Step 3 Complete: SP_REFRESH_CAPACITY_FORECAST created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 4: INITIAL FIT AND REFRESH TASK
+-- ===============================================================================
+
+CALL RAW.SP_REFRESH_CAPACITY_FORECAST();
+
+-- SERVERLESS task; refits once an hour (a generated day of data every 24 minutes in the demo)
+CREATE OR REPLACE TASK RAW.TASK_REFRESH_CAPACITY_FORECAST
+    SCHEDULE = '60 MINUTE'
+AS
+    CALL RAW.SP_REFRESH_CAPACITY_FORECAST();
+
+-- Uncomment to keep the forecasts current while the generators are running
+-- ALTER TASK RAW.TASK_REFRESH_CAPACITY_FORECAST RESUME;
+
+SELECT 'Step 4 Complete: Forecasts cached, refresh task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Cells forecast to saturate soonest
+SELECT CELL_ID, METRIC, CURRENT_PEAK, FORECAST_PEAK, TREND_PER_DAY, HOURS_TO_SATURATION, SATURATION_AT
+FROM RAW.CAPACITY_SUMMARY
+WHERE HOURS_TO_SATURATION IS NOT NULL
+ORDER BY HOURS_TO_SATURATION, TREND_PER_DAY DESC
+LIMIT 20;
+
+-- Cells saturating within the horizon per metric
+SELECT METRIC, COUNT_IF(HOURS_TO_SATURATION = 0) AS SATURATED_NOW,
+       COUNT_IF(HOURS_TO_SATURATION > 0) AS SATURATING_SOON, COUNT(*) AS MODELS
+FROM RAW.CAPACITY_SUMMARY
+GROUP BY METRIC;
+
+-- Refresh history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_REFRESH_CAPACITY_FORECAST'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
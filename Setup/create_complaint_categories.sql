@@ -0,0 +1,243 @@
+-- ===============================================================================
+-- COMPLAINT CATEGORIES SETUP
+-- ===============================================================================
+-- Labels every support ticket with one complaint category using Cortex
+-- CLASSIFY_TEXT, so the Problematic Cell Towers page can show what customers
+-- complain about without parsing REQUEST on load.
+--
+-- RAW.COMPLAINT_CATEGORIES      : the category list (label, description used by
+--                                 the classifier, network issue or not)
+-- RAW.COMPLAINT_TEXT_LABELS     : one label per distinct normalized REQUEST text,
+--                                 keyed by its MD5 hash
+-- RAW.TICKET_CATEGORIES         : category per TICKET_ID
+-- RAW.CELL_COMPLAINT_CATEGORIES : additive ticket counts per (CELL_ID, CATEGORY)
+-- RAW.TICKET_CATEGORY_BATCH     : working table holding the tickets of the
+--                                 current run
+-- RAW.SUPPORT_TICKETS_CATEGORY_STREAM : append-only stream on SUPPORT_TICKETS
+-- RAW.TASK_CATEGORIZE_TICKETS   : serverless task that labels only new tickets
+--
+-- Generated tickets reuse the GENERATE.REF_COMPLAINT_TEXTS templates, so
+-- almost every new ticket hits an existing text label and Cortex is only called
+-- for texts never seen before (one call per distinct text, not per ticket).
+--
+-- USAGE:
+--   - Run once after the data is loaded
+--   - CALL RAW.SP_REBUILD_TICKET_CATEGORIES(); after SUPPORT_TICKETS is recreated
+--     (master_data_cleanup.py replaces it, which breaks the stream); text labels
+--     are kept, so a rebuild does not classify known texts again
+--   - After editing RAW.COMPLAINT_CATEGORIES, TRUNCATE TABLE
+--     RAW.COMPLAINT_TEXT_LABELS and rebuild to relabel everything
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: CATEGORY, LABEL AND TICKET TABLES
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.COMPLAINT_CATEGORIES (
+    CATEGORY VARCHAR(60),
+    DESCRIPTION VARCHAR(500),
+    IS_NETWORK_ISSUE BOOLEAN
+);
+
+MERGE INTO RAW.COMPLAINT_CATEGORIES t
+USING (
+    SELECT * FROM VALUES
+        ('Dropped calls', 'Calls or internet connections that drop or disconnect while in use', TRUE),
+        ('Service outage', 'No service at all, calls that fail to connect or an unreliable connection with outages', TRUE),
+        ('Slow data', 'Data or internet speed much slower than expected or too little bandwidth', TRUE),
+        ('Coverage and signal', 'Weak signal, few bars or poor coverage in an area or a home', TRUE),
+        ('Message delay', 'Text messages or data that arrive late or with long delays', TRUE),
+        ('Billing', 'Unexpected charges, bills, overage or roaming fees and refunds', FALSE),
+        ('Plan and account', 'Adding lines, upgrades, moving, cancellation or contract renewal', FALSE),
+        ('Technical support', 'Help setting up equipment or requests for a support option', FALSE)
+    AS v(CATEGORY, DESCRIPTION, IS_NETWORK_ISSUE)
+) s
+ON t.CATEGORY = s.CATEGORY
+WHEN NOT MATCHED THEN INSERT (CATEGORY, DESCRIPTION, IS_NETWORK_ISSUE)
+VALUES (s.CATEGORY, s.DESCRIPTION, s.IS_NETWORK_ISSUE);
+
+CREATE TABLE IF NOT EXISTS RAW.COMPLAINT_TEXT_LABELS (
+    TEXT_HASH VARCHAR(32),
+    COMPLAINT_TEXT VARCHAR(16777216),
+    CATEGORY VARCHAR(60),
+    CLASSIFIED_AT TIMESTAMP_NTZ(9)
+)
+CHANGE_TRACKING = TRUE;
+
+CREATE TABLE IF NOT EXISTS RAW.TICKET_CATEGORIES (
+    TICKET_ID VARCHAR(60),
+    CELL_ID NUMBER(38,0),
+    TEXT_HASH VARCHAR(32),
+    CATEGORY VARCHAR(60),
+    CATEGORIZED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (CELL_ID);
+
+CREATE TABLE IF NOT EXISTS RAW.CELL_COMPLAINT_CATEGORIES (
+    CELL_ID NUMBER(38,0),
+    CATEGORY VARCHAR(60),
+    TICKETS NUMBER(38,0),
+    NEGATIVE_TICKETS NUMBER(38,0),
+    UPDATED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (CELL_ID);
+
+CREATE TRANSIENT TABLE IF NOT EXISTS RAW.TICKET_CATEGORY_BATCH (
+    TICKET_ID VARCHAR(60),
+    CELL_ID NUMBER(38,0),
+    SENTIMENT_SCORE FLOAT,
+    TEXT_HASH VARCHAR(32),
+    COMPLAINT_TEXT VARCHAR(16777216)
+);
+
+SELECT 'Step 1 Complete: Category, label and ticket tables ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: STREAM AND PROCEDURES
+-- ===============================================================================
+
+-- Label the tickets that arrived since the last run
+CREATE OR REPLACE PROCEDURE RAW.SP_CATEGORIZE_TICKETS()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    texts_classified INT DEFAULT 0;
+    tickets_labelled INT DEFAULT 0;
+BEGIN
+    -- The stream only advances if the whole run commits
+    BEGIN TRANSACTION;
+
+    DELETE FROM RAW.TICKET_CATEGORY_BATCH;
+    INSERT INTO RAW.TICKET_CATEGORY_BATCH (TICKET_ID, CELL_ID, SENTIMENT_SCORE, TEXT_HASH, COMPLAINT_TEXT)
+    SELECT
+        TICKET_ID,
+        CELL_ID,
+        SENTIMENT_SCORE,
+        MD5(REGEXP_REPLACE(LOWER(TRIM(REQUEST)), '\\s+', ' ')),
+        REQUEST
+    FROM RAW.SUPPORT_TICKETS_CATEGORY_STREAM
+    WHERE REQUEST IS NOT NULL;
+
+    -- Classify each text never seen before, once
+    INSERT INTO RAW.COMPLAINT_TEXT_LABELS (TEXT_HASH, COMPLAINT_TEXT, CATEGORY, CLASSIFIED_AT)
+    WITH unseen AS (
+        SELECT b.TEXT_HASH, ANY_VALUE(b.COMPLAINT_TEXT) AS COMPLAINT_TEXT
+        FROM RAW.TICKET_CATEGORY_BATCH b
+        WHERE NOT EXISTS (
+            SELECT 1 FROM RAW.COMPLAINT_TEXT_LABELS l WHERE l.TEXT_HASH = b.TEXT_HASH
+        )
+        GROUP BY b.TEXT_HASH
+    ),
+    category_list AS (
+        SELECT ARRAY_AGG(OBJECT_CONSTRUCT('label', CATEGORY, 'description', DESCRIPTION)) AS CATEGORIES
+        FROM RAW.COMPLAINT_CATEGORIES
+    )
+    SELECT
+        u.TEXT_HASH,
+        u.COMPLAINT_TEXT,
+        SNOWFLAKE.CORTEX.CLASSIFY_TEXT(u.COMPLAINT_TEXT, c.CATEGORIES):label::VARCHAR,
+        CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    FROM unseen u
+    CROSS JOIN category_list c;
+    texts_classified := SQLROWCOUNT;
+
+    INSERT INTO RAW.TICKET_CATEGORIES (TICKET_ID, CELL_ID, TEXT_HASH, CATEGORY, CATEGORIZED_AT)
+    SELECT b.TICKET_ID, b.CELL_ID, b.TEXT_HASH, l.CATEGORY, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    FROM RAW.TICKET_CATEGORY_BATCH b
+    JOIN RAW.COMPLAINT_TEXT_LABELS l ON l.TEXT_HASH = b.TEXT_HASH;
+    tickets_labelled := SQLROWCOUNT;
+
+    MERGE INTO RAW.CELL_COMPLAINT_CATEGORIES t
+    USING (
+        SELECT
+            b.CELL_ID,
+            l.CATEGORY,
+            COUNT(*) AS TICKETS,
+            COUNT_IF(b.SENTIMENT_SCORE < 0) AS NEGATIVE_TICKETS
+        FROM RAW.TICKET_CATEGORY_BATCH b
+        JOIN RAW.COMPLAINT_TEXT_LABELS l ON l.TEXT_HASH = b.TEXT_HASH
+        WHERE b.CELL_ID IS NOT NULL
+        GROUP BY b.CELL_ID, l.CATEGORY
+    ) s
+    ON t.CELL_ID = s.CELL_ID
+       AND t.CATEGORY = s.CATEGORY
+    WHEN MATCHED THEN UPDATE SET
+        TICKETS = t.TICKETS + s.TICKETS,
+        NEGATIVE_TICKETS = t.NEGATIVE_TICKETS + s.NEGATIVE_TICKETS,
+        UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    WHEN NOT MATCHED THEN INSERT (CELL_ID, CATEGORY, TICKETS, NEGATIVE_TICKETS, UPDATED_AT)
+    VALUES (s.CELL_ID, s.CATEGORY, s.TICKETS, s.NEGATIVE_TICKETS, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ);
+
+    COMMIT;
+    RETURN 'Complaint categories: ' || tickets_labelled || ' tickets labelled, '
+        || texts_classified || ' new texts classified';
+END;
+$$;
+
+-- Relabel all tickets from the text labels (Cortex only runs for unseen texts)
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_TICKET_CATEGORIES()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    TRUNCATE TABLE RAW.TICKET_CATEGORIES;
+    TRUNCATE TABLE RAW.CELL_COMPLAINT_CATEGORIES;
+    CREATE OR REPLACE STREAM RAW.SUPPORT_TICKETS_CATEGORY_STREAM
+        ON TABLE RAW.SUPPORT_TICKETS APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CALL RAW.SP_CATEGORIZE_TICKETS();
+    RETURN 'Ticket categories rebuilt';
+END;
+$$;
+
+SELECT 'Step 2 Complete: Categorization procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: INITIAL LOAD AND CATEGORIZATION TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_TICKET_CATEGORIES();
+
+-- SERVERLESS task; only runs when new tickets have arrived
+CREATE OR REPLACE TASK RAW.TASK_CATEGORIZE_TICKETS
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.SUPPORT_TICKETS_CATEGORY_STREAM')
+AS
+    CALL RAW.SP_CATEGORIZE_TICKETS();
+
+-- Uncomment to label tickets while the generators are running
+-- ALTER TASK RAW.TASK_CATEGORIZE_TICKETS RESUME;
+
+SELECT 'Step 3 Complete: Tickets labelled, categorization task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Label per distinct text, with how many tickets use it
+SELECT l.CATEGORY, l.COMPLAINT_TEXT, COUNT(t.TICKET_ID) AS TICKETS
+FROM RAW.COMPLAINT_TEXT_LABELS l
+LEFT JOIN RAW.TICKET_CATEGORIES t ON t.TEXT_HASH = l.TEXT_HASH
+GROUP BY l.CATEGORY, l.COMPLAINT_TEXT
+ORDER BY l.CATEGORY, TICKETS DESC;
+
+-- Cells with the most network complaints
+SELECT c.CELL_ID, SUM(c.TICKETS) AS NETWORK_TICKETS, SUM(c.NEGATIVE_TICKETS) AS NEGATIVE_TICKETS
+FROM RAW.CELL_COMPLAINT_CATEGORIES c
+JOIN RAW.COMPLAINT_CATEGORIES k ON k.CATEGORY = c.CATEGORY
+WHERE k.IS_NETWORK_ISSUE
+GROUP BY c.CELL_ID
+ORDER BY NETWORK_TICKETS DESC
+LIMIT 20;
+
+-- Categorization history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_CATEGORIZE_TICKETS'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
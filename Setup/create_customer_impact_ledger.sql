@@ -0,0 +1,198 @@
+-- ===============================================================================
+-- CUSTOMER IMPACT LEDGER SETUP
+-- ===============================================================================
+-- Creates a one-row-per-subscriber ledger of call outcomes, so the Customer
+-- Impact Dashboard pages through subscribers server-side instead of grouping
+-- CELL_TOWER by MSISDN on every load.
+--
+-- RAW.CUSTOMER_IMPACT_LEDGER : additive TOTAL_CALLS / FAILED_CALLS per MSISDN,
+--                           first/last call, last failure and the cell it
+--                           happened on, and the subscriber's loyalty tier
+-- RAW.CUSTOMER_IMPACT_V    : the ledger with failure rate, linked to the support
+--                           tickets of the cell of the last failure (tickets
+--                           carry a CELL_ID but no MSISDN)
+-- RAW.CELL_TOWER_CUSTOMER_STREAM : append-only stream on CELL_TOWER
+-- RAW.TASK_REFRESH_CUSTOMER_IMPACT : serverless task that merges the per-MSISDN
+--                           deltas of each newly generated hour into the ledger
+--
+-- USAGE:
+--   - Run once after the data is loaded, after create_tower_scorecard.sql
+--   - CALL RAW.SP_REBUILD_CUSTOMER_IMPACT(); after CELL_TOWER is recreated
+--     (master_data_cleanup.py replaces it, which breaks the stream) or after
+--     CUSTOMER_LOYALTY is reloaded
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: LEDGER TABLE
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.CUSTOMER_IMPACT_LEDGER (
+    MSISDN NUMBER(38,0),
+    LOYALTY_STATUS VARCHAR(60),
+    TOTAL_CALLS NUMBER(38,0) DEFAULT 0,
+    FAILED_CALLS NUMBER(38,0) DEFAULT 0,
+    FIRST_CALL_TS TIMESTAMP_NTZ(9),
+    LAST_CALL_TS TIMESTAMP_NTZ(9),
+    LAST_FAILED_TS TIMESTAMP_NTZ(9),
+    LAST_FAILED_CELL_ID NUMBER(38,0),
+    UPDATED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (MSISDN);
+
+SELECT 'Step 1 Complete: CUSTOMER_IMPACT_LEDGER table ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: LEDGER VIEW (failure rate and linked tickets)
+-- ===============================================================================
+
+CREATE OR REPLACE VIEW RAW.CUSTOMER_IMPACT_V AS
+SELECT
+    l.MSISDN,
+    l.LOYALTY_STATUS,
+    l.TOTAL_CALLS,
+    l.FAILED_CALLS,
+    ROUND(l.FAILED_CALLS * 100.0 / NULLIF(l.TOTAL_CALLS, 0), 2) AS FAILURE_RATE,
+    l.FIRST_CALL_TS,
+    l.LAST_CALL_TS,
+    l.LAST_FAILED_TS,
+    l.LAST_FAILED_CELL_ID,
+    s.VENDOR_NAME AS LAST_FAILED_VENDOR,
+    s.TICKET_COUNT AS LINKED_TICKETS,
+    s.NEGATIVE_TICKET_COUNT AS LINKED_NEGATIVE_TICKETS,
+    ROUND(s.SENTIMENT_SUM / NULLIF(s.SENTIMENT_ROWS, 0), 3) AS LINKED_AVG_SENTIMENT,
+    l.UPDATED_AT
+FROM RAW.CUSTOMER_IMPACT_LEDGER l
+LEFT JOIN RAW.TOWER_SCORECARD s ON s.CELL_ID = l.LAST_FAILED_CELL_ID;
+
+SELECT 'Step 2 Complete: CUSTOMER_IMPACT_V view created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: STREAM AND PROCEDURES
+-- ===============================================================================
+
+CREATE OR REPLACE STREAM RAW.CELL_TOWER_CUSTOMER_STREAM
+    ON TABLE RAW.CELL_TOWER
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE;
+
+-- Merge the per-MSISDN deltas of the rows that arrived since the last run
+CREATE OR REPLACE PROCEDURE RAW.SP_REFRESH_CUSTOMER_IMPACT()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    rows_merged INT DEFAULT 0;
+BEGIN
+    MERGE INTO RAW.CUSTOMER_IMPACT_LEDGER t
+    USING (
+        WITH delta AS (
+            SELECT
+                MSISDN,
+                COUNT(*) AS TOTAL_CALLS,
+                COUNT_IF(CALL_RELEASE_CODE != 0) AS FAILED_CALLS,
+                MIN(TIMESTAMP) AS FIRST_CALL_TS,
+                MAX(TIMESTAMP) AS LAST_CALL_TS,
+                MAX(IFF(CALL_RELEASE_CODE != 0, TIMESTAMP, NULL)) AS LAST_FAILED_TS,
+                MAX_BY(CELL_ID, IFF(CALL_RELEASE_CODE != 0, TIMESTAMP, NULL)) AS LAST_FAILED_CELL_ID
+            FROM RAW.CELL_TOWER_CUSTOMER_STREAM
+            WHERE MSISDN IS NOT NULL
+            GROUP BY MSISDN
+        ),
+        loyalty AS (
+            SELECT PHONE_NUMBER, ANY_VALUE(STATUS) AS STATUS
+            FROM RAW.CUSTOMER_LOYALTY
+            GROUP BY PHONE_NUMBER
+        )
+        SELECT d.*, COALESCE(l.STATUS, 'Non-member') AS LOYALTY_STATUS
+        FROM delta d
+        LEFT JOIN loyalty l ON l.PHONE_NUMBER = d.MSISDN
+    ) s
+    ON t.MSISDN = s.MSISDN
+    WHEN MATCHED THEN UPDATE SET
+        LOYALTY_STATUS = s.LOYALTY_STATUS,
+        TOTAL_CALLS = t.TOTAL_CALLS + s.TOTAL_CALLS,
+        FAILED_CALLS = t.FAILED_CALLS + s.FAILED_CALLS,
+        FIRST_CALL_TS = LEAST_IGNORE_NULLS(t.FIRST_CALL_TS, s.FIRST_CALL_TS),
+        LAST_CALL_TS = GREATEST_IGNORE_NULLS(t.LAST_CALL_TS, s.LAST_CALL_TS),
+        LAST_FAILED_TS = GREATEST_IGNORE_NULLS(t.LAST_FAILED_TS, s.LAST_FAILED_TS),
+        LAST_FAILED_CELL_ID = CASE
+            WHEN s.LAST_FAILED_TS IS NOT NULL
+                 AND (t.LAST_FAILED_TS IS NULL OR s.LAST_FAILED_TS >= t.LAST_FAILED_TS)
+            THEN s.LAST_FAILED_CELL_ID
+            ELSE t.LAST_FAILED_CELL_ID
+        END,
+        UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    WHEN NOT MATCHED THEN INSERT (
+        MSISDN, LOYALTY_STATUS, TOTAL_CALLS, FAILED_CALLS, FIRST_CALL_TS, LAST_CALL_TS,
+        LAST_FAILED_TS, LAST_FAILED_CELL_ID, UPDATED_AT
+    ) VALUES (
+        s.MSISDN, s.LOYALTY_STATUS, s.TOTAL_CALLS, s.FAILED_CALLS, s.FIRST_CALL_TS, s.LAST_CALL_TS,
+        s.LAST_FAILED_TS, s.LAST_FAILED_CELL_ID, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    );
+    rows_merged := SQLROWCOUNT;
+
+    RETURN 'Customer impact ledger refreshed: ' || rows_merged || ' subscribers merged';
+END;
+$$;
+
+-- Start over from the full history (after CELL_TOWER or CUSTOMER_LOYALTY is reloaded)
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_CUSTOMER_IMPACT()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    TRUNCATE TABLE RAW.CUSTOMER_IMPACT_LEDGER;
+    CREATE OR REPLACE STREAM RAW.CELL_TOWER_CUSTOMER_STREAM
+        ON TABLE RAW.CELL_TOWER APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CALL RAW.SP_REFRESH_CUSTOMER_IMPACT();
+    RETURN 'Customer impact ledger rebuilt from full history';
+END;
+$$;
+
+SELECT 'Step 3 Complete: Stream and refresh procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 4: INITIAL LOAD AND REFRESH TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_CUSTOMER_IMPACT();
+
+-- SERVERLESS task; only runs when a new hour of measurements has arrived
+CREATE OR REPLACE TASK RAW.TASK_REFRESH_CUSTOMER_IMPACT
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.CELL_TOWER_CUSTOMER_STREAM')
+AS
+    CALL RAW.SP_REFRESH_CUSTOMER_IMPACT();
+
+-- Uncomment to keep the ledger current while the generators are running
+-- ALTER TASK RAW.TASK_REFRESH_CUSTOMER_IMPACT RESUME;
+
+SELECT 'Step 4 Complete: Customer impact ledger loaded, refresh task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Most affected subscribers
+SELECT MSISDN, LOYALTY_STATUS, FAILED_CALLS, TOTAL_CALLS, FAILURE_RATE, LAST_FAILED_CELL_ID
+FROM RAW.CUSTOMER_IMPACT_V
+ORDER BY FAILED_CALLS DESC, MSISDN
+LIMIT 20;
+
+-- Impacted subscribers per loyalty tier
+SELECT LOYALTY_STATUS, COUNT(*) AS SUBSCRIBERS, COUNT_IF(FAILED_CALLS > 0) AS IMPACTED_SUBSCRIBERS
+FROM RAW.CUSTOMER_IMPACT_LEDGER
+GROUP BY LOYALTY_STATUS
+ORDER BY IMPACTED_SUBSCRIBERS DESC;
+
+-- Refresh history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_REFRESH_CUSTOMER_IMPACT'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
@@ -0,0 +1,342 @@
+-- ===============================================================================
+-- DATA QUALITY MONITOR SETUP
+-- ===============================================================================
+-- Creates declarative data quality checks on CELL_TOWER that run only on newly
+-- arrived rows, behind the Data Quality page. Replaces the ad-hoc full-table
+-- scripts (check_null_columns.sql, verify_demo_data.py, ...).
+--
+-- RAW.DQ_CHECKS           : one row per check. CHECK_TYPE is one of
+--                             NULL_RATE     - % of rows where COLUMN_NAME is NULL
+--                             RANGE         - % of rows where COLUMN_NAME is outside
+--                                             [MIN_VALUE, MAX_VALUE]
+--                             ROW_COUNT     - rows per hour as % of the cells in
+--                                             DIM_CELL; must stay in [MIN_VALUE, MAX_VALUE]
+--                             DUPLICATE_KEY - % of rows whose COLUMN_NAME repeats
+--                                             within the hour
+--                           PERFORMANCE_TIER (optional) limits a check to one tier
+--                           (from DIM_CELL); MAX_FAILED_PCT is the tolerated share
+--                           of failing rows
+-- RAW.DQ_CHECK_SQL_V      : renders each enabled check into its SQL
+-- RAW.DQ_METRICS          : one row per (check, TIMESTAMP hour) with additive
+--                           ROWS_CHECKED / FAILED_ROWS, the observed value and
+--                           PASS / FAIL
+-- RAW.DQ_SEEN_KEYS        : keys already checked per hour for DUPLICATE_KEY checks
+--                           (kept for 7 days)
+-- RAW.DQ_CELL_TOWER_BATCH : working copy of the rows of the current run
+-- RAW.CELL_TOWER_DQ_STREAM : append-only stream on CELL_TOWER
+-- RAW.TASK_CHECK_DATA_QUALITY : serverless task that checks each new batch
+--
+-- Each run reads only the stream, so validation cost tracks the rows that
+-- arrived, not the size of CELL_TOWER. Counts are merged into the existing
+-- metric row of an hour, so an hour that arrives in two runs ends up with the
+-- same result as one run over the whole hour.
+--
+-- USAGE:
+--   - Run once after the data is loaded
+--   - Add or tune checks by editing RAW.DQ_CHECKS; new checks apply to rows
+--     arriving from then on
+--   - CALL RAW.SP_REBUILD_DATA_QUALITY(); after CELL_TOWER is recreated
+--     (master_data_cleanup.py replaces it, which breaks the stream)
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: CHECK DEFINITIONS
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.DQ_CHECKS (
+    CHECK_NAME VARCHAR(100),
+    CHECK_TYPE VARCHAR(20),          -- NULL_RATE, RANGE, ROW_COUNT, DUPLICATE_KEY
+    COLUMN_NAME VARCHAR(100),        -- CELL_TOWER column (NULL for ROW_COUNT)
+    PERFORMANCE_TIER VARCHAR(50),    -- NULL = all tiers
+    MIN_VALUE FLOAT,
+    MAX_VALUE FLOAT,
+    MAX_FAILED_PCT FLOAT,            -- tolerated % of failing rows (not used by ROW_COUNT)
+    ENABLED BOOLEAN,
+    DESCRIPTION VARCHAR(500)
+);
+
+-- Default checks; ranges follow the hourly generator (setup_data_generators.sql)
+MERGE INTO RAW.DQ_CHECKS t
+USING (
+    SELECT * FROM VALUES
+        ('NULL_CELL_ID', 'NULL_RATE', 'CELL_ID', NULL, NULL, NULL, 0, 'Every measurement belongs to a cell'),
+        ('NULL_TIMESTAMP', 'NULL_RATE', 'TIMESTAMP', NULL, NULL, NULL, 0, 'Every measurement has an hour'),
+        ('NULL_UNIQUE_ID', 'NULL_RATE', 'UNIQUE_ID', NULL, NULL, NULL, 0, 'Every measurement has a key'),
+        ('NULL_VENDOR_NAME', 'NULL_RATE', 'VENDOR_NAME', NULL, NULL, NULL, 0, 'Vendor is needed by every vendor breakdown'),
+        ('NULL_CALL_RELEASE_CODE', 'NULL_RATE', 'CALL_RELEASE_CODE', NULL, NULL, NULL, 0, 'Failure rates are computed from the release code'),
+        ('NULL_PRB_UTIL_DL', 'NULL_RATE', 'PM_PRB_UTIL_DL', NULL, NULL, NULL, 1, 'Capacity metric'),
+        ('NULL_LATENCY_DL', 'NULL_RATE', 'PM_PDCP_LAT_TIME_DL', NULL, NULL, NULL, 1, 'Latency metric'),
+        ('NULL_RRC_ATT', 'NULL_RATE', 'PM_RRC_CONN_ESTAB_ATT', NULL, NULL, NULL, 1, 'RRC failure rate denominator'),
+        ('NULL_ERAB_ATT', 'NULL_RATE', 'PM_ERAB_ESTAB_ATT_INIT', NULL, NULL, NULL, 1, 'E-RAB setup metric'),
+        ('NULL_S1_ATT', 'NULL_RATE', 'PM_S1_SIG_CONN_ESTAB_ATT', NULL, NULL, NULL, 1, 'S1 signalling metric'),
+        ('NULL_RSRP_SERV', 'NULL_RATE', 'PM_UE_MEAS_RSRP_SERV_INTRA_FREQ1', NULL, NULL, NULL, 1, 'Signal strength metric'),
+        ('NULL_THP_TIME_DL', 'NULL_RATE', 'PM_UE_THP_TIME_DL', NULL, NULL, NULL, 1, 'Throughput denominator'),
+        ('NULL_VOL_DL', 'NULL_RATE', 'PM_PDCP_VOL_DL_DRB', NULL, NULL, NULL, 1, 'Throughput numerator'),
+        ('RANGE_PRB_UTIL_DL', 'RANGE', 'PM_PRB_UTIL_DL', NULL, 0, 100, 0, 'Utilization is a percentage'),
+        ('RANGE_PRB_UTIL_UL', 'RANGE', 'PM_PRB_UTIL_UL', NULL, 0, 100, 0, 'Utilization is a percentage'),
+        ('RANGE_LATITUDE', 'RANGE', 'CELL_LATITUDE', NULL, -90, 90, 0, 'Valid coordinates'),
+        ('RANGE_LONGITUDE', 'RANGE', 'CELL_LONGITUDE', NULL, -180, 180, 0, 'Valid coordinates'),
+        ('RANGE_PRB_UTIL_DL_CATASTROPHIC', 'RANGE', 'PM_PRB_UTIL_DL', 'CATASTROPHIC', 85, 100, 1, 'Catastrophic cells run near full load'),
+        ('RANGE_PRB_UTIL_DL_GOOD', 'RANGE', 'PM_PRB_UTIL_DL', 'GOOD', 0, 60, 1, 'Good cells have headroom'),
+        ('RANGE_LATENCY_DL_CATASTROPHIC', 'RANGE', 'PM_PDCP_LAT_TIME_DL', 'CATASTROPHIC', 35, 60, 1, 'Latency band of catastrophic cells'),
+        ('RANGE_LATENCY_DL_BAD', 'RANGE', 'PM_PDCP_LAT_TIME_DL', 'BAD', 20, 35, 1, 'Latency band of bad cells'),
+        ('RANGE_LATENCY_DL_GOOD', 'RANGE', 'PM_PDCP_LAT_TIME_DL', 'GOOD', 5, 20, 1, 'Latency band of good cells'),
+        ('HOURLY_ROW_COVERAGE', 'ROW_COUNT', NULL, NULL, 98, 100, NULL, 'One row per cell per hour'),
+        ('DUPLICATE_UNIQUE_ID', 'DUPLICATE_KEY', 'UNIQUE_ID', NULL, NULL, NULL, 0, 'UNIQUE_ID is unique within its hour')
+    AS v(CHECK_NAME, CHECK_TYPE, COLUMN_NAME, PERFORMANCE_TIER, MIN_VALUE, MAX_VALUE, MAX_FAILED_PCT, DESCRIPTION)
+) s
+ON t.CHECK_NAME = s.CHECK_NAME
+WHEN NOT MATCHED THEN INSERT (
+    CHECK_NAME, CHECK_TYPE, COLUMN_NAME, PERFORMANCE_TIER, MIN_VALUE, MAX_VALUE, MAX_FAILED_PCT, ENABLED, DESCRIPTION
+) VALUES (
+    s.CHECK_NAME, s.CHECK_TYPE, s.COLUMN_NAME, s.PERFORMANCE_TIER, s.MIN_VALUE, s.MAX_VALUE, s.MAX_FAILED_PCT, TRUE, s.DESCRIPTION
+);
+
+-- Each check rendered into a query over the batch returning
+-- (CHECK_NAME, PARTITION_HOUR, ROWS_CHECKED, FAILED_ROWS)
+CREATE OR REPLACE VIEW RAW.DQ_CHECK_SQL_V AS
+SELECT
+    CHECK_NAME,
+    CHECK_TYPE,
+    CASE
+        WHEN CHECK_TYPE = 'DUPLICATE_KEY' THEN
+            'SELECT ''' || CHECK_NAME || ''' AS CHECK_NAME, b.PARTITION_HOUR, COUNT(*) AS ROWS_CHECKED, '
+            || 'COUNT_IF(b.KEY_ROWS > 1 OR k.KEY_VALUE IS NOT NULL) AS FAILED_ROWS '
+            || 'FROM (SELECT DATE_TRUNC(''HOUR'', TIMESTAMP) AS PARTITION_HOUR, TO_VARCHAR(' || COLUMN_NAME || ') AS KEY_VALUE, '
+            || 'COUNT(*) OVER (PARTITION BY DATE_TRUNC(''HOUR'', TIMESTAMP), ' || COLUMN_NAME || ') AS KEY_ROWS '
+            || 'FROM RAW.DQ_CELL_TOWER_BATCH WHERE ' || COLUMN_NAME || ' IS NOT NULL) b '
+            || 'LEFT JOIN RAW.DQ_SEEN_KEYS k ON k.CHECK_NAME = ''' || CHECK_NAME || ''' '
+            || 'AND EQUAL_NULL(k.PARTITION_HOUR, b.PARTITION_HOUR) AND k.KEY_VALUE = b.KEY_VALUE '
+            || 'GROUP BY b.PARTITION_HOUR'
+        ELSE
+            'SELECT ''' || CHECK_NAME || ''' AS CHECK_NAME, DATE_TRUNC(''HOUR'', TIMESTAMP) AS PARTITION_HOUR, '
+            || 'COUNT(*) AS ROWS_CHECKED, '
+            || CASE CHECK_TYPE
+                   WHEN 'NULL_RATE' THEN 'COUNT_IF(' || COLUMN_NAME || ' IS NULL)'
+                   WHEN 'RANGE' THEN 'COUNT_IF(' || COLUMN_NAME || ' < ' || COALESCE(MIN_VALUE::VARCHAR, 'NULL')
+                                     || ' OR ' || COLUMN_NAME || ' > ' || COALESCE(MAX_VALUE::VARCHAR, 'NULL') || ')'
+                   ELSE '0'
+               END
+            || ' AS FAILED_ROWS FROM RAW.DQ_CELL_TOWER_BATCH '
+            || IFF(PERFORMANCE_TIER IS NULL, '', 'WHERE DQ_PERFORMANCE_TIER = ''' || PERFORMANCE_TIER || ''' ')
+            || 'GROUP BY PARTITION_HOUR'
+    END AS CHECK_SQL,
+    -- Keys to remember once the batch is checked
+    IFF(CHECK_TYPE = 'DUPLICATE_KEY',
+        'SELECT DISTINCT ''' || CHECK_NAME || ''' AS CHECK_NAME, DATE_TRUNC(''HOUR'', TIMESTAMP) AS PARTITION_HOUR, '
+        || 'TO_VARCHAR(' || COLUMN_NAME || ') AS KEY_VALUE '
+        || 'FROM RAW.DQ_CELL_TOWER_BATCH WHERE ' || COLUMN_NAME || ' IS NOT NULL',
+        NULL) AS KEY_SQL
+FROM RAW.DQ_CHECKS
+WHERE ENABLED
+  AND CHECK_TYPE IN ('NULL_RATE', 'RANGE', 'ROW_COUNT', 'DUPLICATE_KEY');
+
+SELECT 'Step 1 Complete: Data quality checks defined' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: METRICS, KEY AND BATCH TABLES
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.DQ_METRICS (
+    CHECK_NAME VARCHAR(100),
+    PARTITION_HOUR TIMESTAMP_NTZ(9),
+    ROWS_CHECKED NUMBER(38,0),
+    FAILED_ROWS NUMBER(38,0),
+    OBSERVED_VALUE FLOAT,            -- failing % (ROW_COUNT: rows as % of expected)
+    STATUS VARCHAR(10),              -- PASS / FAIL
+    FIRST_CHECKED_AT TIMESTAMP_NTZ(9),
+    CHECKED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (PARTITION_HOUR);
+
+CREATE TABLE IF NOT EXISTS RAW.DQ_SEEN_KEYS (
+    CHECK_NAME VARCHAR(100),
+    PARTITION_HOUR TIMESTAMP_NTZ(9),
+    KEY_VALUE VARCHAR(200)
+)
+CLUSTER BY (PARTITION_HOUR);
+
+CREATE TRANSIENT TABLE IF NOT EXISTS RAW.DQ_CELL_TOWER_BATCH LIKE RAW.CELL_TOWER;
+ALTER TABLE RAW.DQ_CELL_TOWER_BATCH ADD COLUMN IF NOT EXISTS DQ_PERFORMANCE_TIER VARCHAR(50);
+
+SELECT 'Step 2 Complete: Metrics, key and batch tables ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: STREAM AND PROCEDURES
+-- ===============================================================================
+
+-- Run every enabled check over the rows that arrived since the last run
+CREATE OR REPLACE PROCEDURE RAW.SP_CHECK_DATA_QUALITY()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    key_retention_days INT DEFAULT 7;
+    run_ts TIMESTAMP_NTZ;
+    rows_batched INT;
+    metrics_merged INT DEFAULT 0;
+    failing INT DEFAULT 0;
+    check_sql STRING;
+    key_sql STRING;
+BEGIN
+    run_ts := CURRENT_TIMESTAMP()::TIMESTAMP_NTZ;
+
+    -- The stream only advances if the whole run commits
+    BEGIN TRANSACTION;
+
+    DELETE FROM RAW.DQ_CELL_TOWER_BATCH;
+    INSERT INTO RAW.DQ_CELL_TOWER_BATCH
+    SELECT s.* EXCLUDE (METADATA$ACTION, METADATA$ISUPDATE, METADATA$ROW_ID), d.PERFORMANCE_TIER
+    FROM RAW.CELL_TOWER_DQ_STREAM s
+    LEFT JOIN RAW.DIM_CELL d ON d.CELL_ID = s.CELL_ID;
+    rows_batched := SQLROWCOUNT;
+
+    SELECT LISTAGG(CHECK_SQL, ' UNION ALL '), LISTAGG(KEY_SQL, ' UNION ALL ')
+    INTO :check_sql, :key_sql
+    FROM RAW.DQ_CHECK_SQL_V;
+
+    IF (rows_batched > 0 AND check_sql IS NOT NULL) THEN
+        -- Counts are additive, so a late part of an hour adds to the earlier result
+        EXECUTE IMMEDIATE
+            'MERGE INTO RAW.DQ_METRICS t USING (' || check_sql || ') s '
+            || 'ON t.CHECK_NAME = s.CHECK_NAME AND EQUAL_NULL(t.PARTITION_HOUR, s.PARTITION_HOUR) '
+            || 'WHEN MATCHED THEN UPDATE SET ROWS_CHECKED = t.ROWS_CHECKED + s.ROWS_CHECKED, '
+            || 'FAILED_ROWS = t.FAILED_ROWS + s.FAILED_ROWS, CHECKED_AT = ? '
+            || 'WHEN NOT MATCHED THEN INSERT (CHECK_NAME, PARTITION_HOUR, ROWS_CHECKED, FAILED_ROWS, FIRST_CHECKED_AT, CHECKED_AT) '
+            || 'VALUES (s.CHECK_NAME, s.PARTITION_HOUR, s.ROWS_CHECKED, s.FAILED_ROWS, ?, ?)'
+            USING (run_ts, run_ts, run_ts);
+
+        -- Re-evaluate the hours touched by this run
+        UPDATE RAW.DQ_METRICS m
+        SET OBSERVED_VALUE = e.OBSERVED_VALUE,
+            STATUS = e.STATUS
+        FROM (
+            SELECT
+                o.CHECK_NAME,
+                o.PARTITION_HOUR,
+                o.OBSERVED_VALUE,
+                CASE
+                    WHEN o.CHECK_TYPE = 'ROW_COUNT'
+                        THEN IFF(o.OBSERVED_VALUE BETWEEN COALESCE(o.MIN_VALUE, o.OBSERVED_VALUE)
+                                                      AND COALESCE(o.MAX_VALUE, o.OBSERVED_VALUE), 'PASS', 'FAIL')
+                    ELSE IFF(o.OBSERVED_VALUE <= COALESCE(o.MAX_FAILED_PCT, 0), 'PASS', 'FAIL')
+                END AS STATUS
+            FROM (
+                SELECT
+                    m.CHECK_NAME,
+                    m.PARTITION_HOUR,
+                    c.CHECK_TYPE,
+                    c.MIN_VALUE,
+                    c.MAX_VALUE,
+                    c.MAX_FAILED_PCT,
+                    ROUND(IFF(c.CHECK_TYPE = 'ROW_COUNT',
+                              m.ROWS_CHECKED * 100.0 / NULLIF(IFF(c.PERFORMANCE_TIER IS NULL,
+                                                                  (SELECT COUNT(*) FROM RAW.DIM_CELL),
+                                                                  tiers.CELLS), 0),
+                              m.FAILED_ROWS * 100.0 / NULLIF(m.ROWS_CHECKED, 0)), 3) AS OBSERVED_VALUE
+                FROM RAW.DQ_METRICS m
+                JOIN RAW.DQ_CHECKS c ON c.CHECK_NAME = m.CHECK_NAME
+                LEFT JOIN (
+                    SELECT PERFORMANCE_TIER, COUNT(*) AS CELLS
+                    FROM RAW.DIM_CELL
+                    GROUP BY PERFORMANCE_TIER
+                ) tiers ON tiers.PERFORMANCE_TIER = c.PERFORMANCE_TIER
+                WHERE m.CHECKED_AT = :run_ts
+            ) o
+        ) e
+        WHERE m.CHECK_NAME = e.CHECK_NAME
+          AND EQUAL_NULL(m.PARTITION_HOUR, e.PARTITION_HOUR)
+          AND m.CHECKED_AT = :run_ts;
+        metrics_merged := SQLROWCOUNT;
+
+        SELECT COUNT_IF(STATUS = 'FAIL') INTO :failing
+        FROM RAW.DQ_METRICS
+        WHERE CHECKED_AT = :run_ts;
+
+        IF (key_sql IS NOT NULL) THEN
+            -- Only keys not recorded yet, so repeated keys do not pile up
+            EXECUTE IMMEDIATE
+                'MERGE INTO RAW.DQ_SEEN_KEYS k USING (' || key_sql || ') s '
+                || 'ON k.CHECK_NAME = s.CHECK_NAME AND EQUAL_NULL(k.PARTITION_HOUR, s.PARTITION_HOUR) '
+                || 'AND k.KEY_VALUE = s.KEY_VALUE '
+                || 'WHEN NOT MATCHED THEN INSERT (CHECK_NAME, PARTITION_HOUR, KEY_VALUE) '
+                || 'VALUES (s.CHECK_NAME, s.PARTITION_HOUR, s.KEY_VALUE)';
+            -- Keys carry their hour, so only recent hours can collide
+            DELETE FROM RAW.DQ_SEEN_KEYS
+            WHERE PARTITION_HOUR < (
+                SELECT DATEADD('DAY', -1 * :key_retention_days, MAX(PARTITION_HOUR)) FROM RAW.DQ_SEEN_KEYS
+            );
+        END IF;
+    END IF;
+
+    COMMIT;
+    RETURN 'Data quality: ' || rows_batched || ' rows checked, ' || metrics_merged || ' metrics updated, '
+        || failing || ' failing';
+END;
+$$;
+
+-- Reset the metrics and check the whole table again
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_DATA_QUALITY()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    TRUNCATE TABLE RAW.DQ_METRICS;
+    TRUNCATE TABLE RAW.DQ_SEEN_KEYS;
+    -- Recreate the batch table in case CELL_TOWER was recreated with other columns
+    CREATE OR REPLACE TRANSIENT TABLE RAW.DQ_CELL_TOWER_BATCH LIKE RAW.CELL_TOWER;
+    ALTER TABLE RAW.DQ_CELL_TOWER_BATCH ADD COLUMN DQ_PERFORMANCE_TIER VARCHAR(50);
+    CREATE OR REPLACE STREAM RAW.CELL_TOWER_DQ_STREAM
+        ON TABLE RAW.CELL_TOWER APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CALL RAW.SP_CHECK_DATA_QUALITY();
+    RETURN 'Data quality metrics rebuilt';
+END;
+$$;
+
+SELECT 'Step 3 Complete: Check and rebuild procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 4: INITIAL RUN AND CHECK TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_DATA_QUALITY();
+
+-- SERVERLESS task; only runs when new measurements have arrived
+CREATE OR REPLACE TASK RAW.TASK_CHECK_DATA_QUALITY
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.CELL_TOWER_DQ_STREAM')
+AS
+    CALL RAW.SP_CHECK_DATA_QUALITY();
+
+-- Uncomment to check new hours while the generators are running
+-- ALTER TASK RAW.TASK_CHECK_DATA_QUALITY RESUME;
+
+SELECT 'Step 4 Complete: Metrics built, check task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Failing checks in the last day
+SELECT m.PARTITION_HOUR, m.CHECK_NAME, c.CHECK_TYPE, c.COLUMN_NAME, c.PERFORMANCE_TIER,
+       m.ROWS_CHECKED, m.FAILED_ROWS, m.OBSERVED_VALUE
+FROM RAW.DQ_METRICS m
+JOIN RAW.DQ_CHECKS c ON c.CHECK_NAME = m.CHECK_NAME
+WHERE m.STATUS = 'FAIL'
+  AND m.PARTITION_HOUR >= (SELECT DATEADD('DAY', -1, MAX(PARTITION_HOUR)) FROM RAW.DQ_METRICS)
+ORDER BY m.PARTITION_HOUR DESC, m.CHECK_NAME;
+
+-- Rendered SQL of each check
+SELECT CHECK_NAME, CHECK_SQL FROM RAW.DQ_CHECK_SQL_V ORDER BY CHECK_NAME;
+
+-- Check history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_CHECK_DATA_QUALITY'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
@@ -0,0 +1,259 @@
+-- ===============================================================================
+-- KPI ROLLUP SETUP
+-- ===============================================================================
+-- Creates the multi-granularity KPI rollup behind the Time-Series Analysis
+-- page, so multi-month trends never pull raw CELL_TOWER rows.
+--
+-- RAW.KPI_ROLLUP          : additive KPI totals per GRAIN (HOUR, DAY, WEEK),
+--                           PERIOD_START and DIMENSION/MEMBER, where DIMENSION
+--                           is NETWORK (MEMBER = 'ALL'), VENDOR, REGION or CELL
+-- RAW.KPI_ROLLUP_V        : the rollup with rates and averages derived from the totals
+-- RAW.CELL_TOWER_ROLLUP_STREAM : append-only stream on CELL_TOWER
+-- RAW.TASK_REFRESH_KPI_ROLLUP  : serverless task that merges only the new
+--                           measurements into every grain and dimension
+--
+-- Vendor and region come from RAW.DIM_CELL (setup_data_generators.sql), so
+-- run that script first. Because the rollup only stores sums and row counts,
+-- any coarser view (e.g. a vendor over a quarter) can be re-aggregated from
+-- it exactly.
+--
+-- USAGE:
+--   - Run once after the data is loaded and RAW.DIM_CELL exists
+--   - CALL RAW.SP_REBUILD_KPI_ROLLUP(); after CELL_TOWER is recreated
+--     (master_data_cleanup.py replaces it, which breaks the stream)
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: ROLLUP TABLE
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.KPI_ROLLUP (
+    GRAIN VARCHAR(10),
+    PERIOD_START TIMESTAMP_NTZ(9),
+    DIMENSION VARCHAR(20),
+    MEMBER VARCHAR(500),
+    -- Network measurement totals
+    MEASUREMENT_ROWS NUMBER(38,0) DEFAULT 0,
+    FAILED_CALLS NUMBER(38,0) DEFAULT 0,
+    RRC_ATT_SUM FLOAT DEFAULT 0,
+    RRC_SUCC_SUM FLOAT DEFAULT 0,
+    LATENCY_DL_SUM FLOAT DEFAULT 0,
+    LATENCY_DL_ROWS NUMBER(38,0) DEFAULT 0,
+    PRB_DL_SUM FLOAT DEFAULT 0,
+    PRB_DL_ROWS NUMBER(38,0) DEFAULT 0,
+    PRB_UL_SUM FLOAT DEFAULT 0,
+    PRB_UL_ROWS NUMBER(38,0) DEFAULT 0,
+    ERAB_ABNORMAL_SUM FLOAT DEFAULT 0,
+    ERAB_ABNORMAL_ROWS NUMBER(38,0) DEFAULT 0,
+    ACTIVE_UE_DL_SUM FLOAT DEFAULT 0,
+    ACTIVE_UE_DL_ROWS NUMBER(38,0) DEFAULT 0,
+    UPDATED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (GRAIN, DIMENSION, PERIOD_START);
+
+SELECT 'Step 1 Complete: KPI_ROLLUP table ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: ROLLUP VIEW (rates and averages)
+-- ===============================================================================
+
+CREATE OR REPLACE VIEW RAW.KPI_ROLLUP_V AS
+SELECT
+    GRAIN,
+    PERIOD_START,
+    DIMENSION,
+    MEMBER,
+    MEASUREMENT_ROWS,
+    FAILED_CALLS,
+    ROUND(FAILED_CALLS * 100.0 / NULLIF(MEASUREMENT_ROWS, 0), 2) AS FAILURE_RATE,
+    ROUND((RRC_ATT_SUM - RRC_SUCC_SUM) * 100.0 / NULLIF(RRC_ATT_SUM, 0), 2) AS RRC_FAILURE_RATE,
+    ROUND(LATENCY_DL_SUM / NULLIF(LATENCY_DL_ROWS, 0), 2) AS AVG_LATENCY_DL,
+    ROUND(PRB_DL_SUM / NULLIF(PRB_DL_ROWS, 0), 2) AS AVG_PRB_UTIL_DL,
+    ROUND(PRB_UL_SUM / NULLIF(PRB_UL_ROWS, 0), 2) AS AVG_PRB_UTIL_UL,
+    ROUND(ERAB_ABNORMAL_SUM / NULLIF(ERAB_ABNORMAL_ROWS, 0), 2) AS AVG_ERAB_ABNORMAL,
+    ROUND(ACTIVE_UE_DL_SUM / NULLIF(ACTIVE_UE_DL_ROWS, 0), 2) AS AVG_ACTIVE_UE_DL,
+    UPDATED_AT
+FROM RAW.KPI_ROLLUP;
+
+SELECT 'Step 2 Complete: KPI_ROLLUP_V view created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: STREAM AND PROCEDURES
+-- ===============================================================================
+
+CREATE OR REPLACE STREAM RAW.CELL_TOWER_ROLLUP_STREAM
+    ON TABLE RAW.CELL_TOWER
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE;
+
+-- Merge the measurements that arrived since the last run into every grain and
+-- dimension. New rows are first reduced to one row per (hour, cell), then
+-- fanned out to the 3 grains x 4 dimensions and summed into the rollup.
+CREATE OR REPLACE PROCEDURE RAW.SP_REFRESH_KPI_ROLLUP()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    rows_merged INT DEFAULT 0;
+BEGIN
+    MERGE INTO RAW.KPI_ROLLUP t
+    USING (
+        WITH hourly AS (
+            SELECT
+                DATE_TRUNC('HOUR', s.TIMESTAMP) AS TS_HOUR,
+                s.CELL_ID,
+                ANY_VALUE(d.VENDOR_NAME) AS VENDOR_NAME,
+                ANY_VALUE(d.REGION) AS REGION,
+                COUNT(*) AS MEASUREMENT_ROWS,
+                COUNT_IF(s.CALL_RELEASE_CODE != 0) AS FAILED_CALLS,
+                COALESCE(SUM(s.PM_RRC_CONN_ESTAB_ATT), 0) AS RRC_ATT_SUM,
+                COALESCE(SUM(s.PM_RRC_CONN_ESTAB_SUCC), 0) AS RRC_SUCC_SUM,
+                COALESCE(SUM(s.PM_PDCP_LAT_TIME_DL), 0) AS LATENCY_DL_SUM,
+                COUNT(s.PM_PDCP_LAT_TIME_DL) AS LATENCY_DL_ROWS,
+                COALESCE(SUM(s.PM_PRB_UTIL_DL), 0) AS PRB_DL_SUM,
+                COUNT(s.PM_PRB_UTIL_DL) AS PRB_DL_ROWS,
+                COALESCE(SUM(s.PM_PRB_UTIL_UL), 0) AS PRB_UL_SUM,
+                COUNT(s.PM_PRB_UTIL_UL) AS PRB_UL_ROWS,
+                COALESCE(SUM(s.PM_ERAB_REL_ABNORMAL_ENB), 0) AS ERAB_ABNORMAL_SUM,
+                COUNT(s.PM_ERAB_REL_ABNORMAL_ENB) AS ERAB_ABNORMAL_ROWS,
+                COALESCE(SUM(s.PM_ACTIVE_UE_DL_MAX), 0) AS ACTIVE_UE_DL_SUM,
+                COUNT(s.PM_ACTIVE_UE_DL_MAX) AS ACTIVE_UE_DL_ROWS
+            FROM RAW.CELL_TOWER_ROLLUP_STREAM s
+            LEFT JOIN RAW.DIM_CELL d ON d.CELL_ID = s.CELL_ID
+            WHERE s.CELL_ID IS NOT NULL
+              AND s.TIMESTAMP IS NOT NULL
+            GROUP BY TS_HOUR, s.CELL_ID
+        )
+        SELECT
+            g.GRAIN,
+            CASE g.GRAIN
+                WHEN 'HOUR' THEN h.TS_HOUR
+                WHEN 'DAY' THEN DATE_TRUNC('DAY', h.TS_HOUR)
+                ELSE DATE_TRUNC('WEEK', h.TS_HOUR)
+            END AS PERIOD_START,
+            m.DIMENSION,
+            CASE m.DIMENSION
+                WHEN 'CELL' THEN h.CELL_ID::VARCHAR
+                WHEN 'VENDOR' THEN COALESCE(h.VENDOR_NAME, 'UNKNOWN')
+                WHEN 'REGION' THEN COALESCE(h.REGION, 'UNKNOWN')
+                ELSE 'ALL'
+            END AS MEMBER,
+            SUM(h.MEASUREMENT_ROWS) AS MEASUREMENT_ROWS,
+            SUM(h.FAILED_CALLS) AS FAILED_CALLS,
+            SUM(h.RRC_ATT_SUM) AS RRC_ATT_SUM,
+            SUM(h.RRC_SUCC_SUM) AS RRC_SUCC_SUM,
+            SUM(h.LATENCY_DL_SUM) AS LATENCY_DL_SUM,
+            SUM(h.LATENCY_DL_ROWS) AS LATENCY_DL_ROWS,
+            SUM(h.PRB_DL_SUM) AS PRB_DL_SUM,
+            SUM(h.PRB_DL_ROWS) AS PRB_DL_ROWS,
+            SUM(h.PRB_UL_SUM) AS PRB_UL_SUM,
+            SUM(h.PRB_UL_ROWS) AS PRB_UL_ROWS,
+            SUM(h.ERAB_ABNORMAL_SUM) AS ERAB_ABNORMAL_SUM,
+            SUM(h.ERAB_ABNORMAL_ROWS) AS ERAB_ABNORMAL_ROWS,
+            SUM(h.ACTIVE_UE_DL_SUM) AS ACTIVE_UE_DL_SUM,
+            SUM(h.ACTIVE_UE_DL_ROWS) AS ACTIVE_UE_DL_ROWS
+        FROM hourly h
+        CROSS JOIN (SELECT COLUMN1 AS GRAIN FROM VALUES ('HOUR'), ('DAY'), ('WEEK')) g
+        CROSS JOIN (SELECT COLUMN1 AS DIMENSION FROM VALUES ('NETWORK'), ('VENDOR'), ('REGION'), ('CELL')) m
+        GROUP BY g.GRAIN, PERIOD_START, m.DIMENSION, MEMBER
+    ) s
+    ON t.GRAIN = s.GRAIN
+       AND t.PERIOD_START = s.PERIOD_START
+       AND t.DIMENSION = s.DIMENSION
+       AND t.MEMBER = s.MEMBER
+    WHEN MATCHED THEN UPDATE SET
+        MEASUREMENT_ROWS = t.MEASUREMENT_ROWS + s.MEASUREMENT_ROWS,
+        FAILED_CALLS = t.FAILED_CALLS + s.FAILED_CALLS,
+        RRC_ATT_SUM = t.RRC_ATT_SUM + s.RRC_ATT_SUM,
+        RRC_SUCC_SUM = t.RRC_SUCC_SUM + s.RRC_SUCC_SUM,
+        LATENCY_DL_SUM = t.LATENCY_DL_SUM + s.LATENCY_DL_SUM,
+        LATENCY_DL_ROWS = t.LATENCY_DL_ROWS + s.LATENCY_DL_ROWS,
+        PRB_DL_SUM = t.PRB_DL_SUM + s.PRB_DL_SUM,
+        PRB_DL_ROWS = t.PRB_DL_ROWS + s.PRB_DL_ROWS,
+        PRB_UL_SUM = t.PRB_UL_SUM + s.PRB_UL_SUM,
+        PRB_UL_ROWS = t.PRB_UL_ROWS + s.PRB_UL_ROWS,
+        ERAB_ABNORMAL_SUM = t.ERAB_ABNORMAL_SUM + s.ERAB_ABNORMAL_SUM,
+        ERAB_ABNORMAL_ROWS = t.ERAB_ABNORMAL_ROWS + s.ERAB_ABNORMAL_ROWS,
+        ACTIVE_UE_DL_SUM = t.ACTIVE_UE_DL_SUM + s.ACTIVE_UE_DL_SUM,
+        ACTIVE_UE_DL_ROWS = t.ACTIVE_UE_DL_ROWS + s.ACTIVE_UE_DL_ROWS,
+        UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    WHEN NOT MATCHED THEN INSERT (
+        GRAIN, PERIOD_START, DIMENSION, MEMBER,
+        MEASUREMENT_ROWS, FAILED_CALLS, RRC_ATT_SUM, RRC_SUCC_SUM, LATENCY_DL_SUM, LATENCY_DL_ROWS,
+        PRB_DL_SUM, PRB_DL_ROWS, PRB_UL_SUM, PRB_UL_ROWS, ERAB_ABNORMAL_SUM, ERAB_ABNORMAL_ROWS,
+        ACTIVE_UE_DL_SUM, ACTIVE_UE_DL_ROWS, UPDATED_AT
+    ) VALUES (
+        s.GRAIN, s.PERIOD_START, s.DIMENSION, s.MEMBER,
+        s.MEASUREMENT_ROWS, s.FAILED_CALLS, s.RRC_ATT_SUM, s.RRC_SUCC_SUM, s.LATENCY_DL_SUM, s.LATENCY_DL_ROWS,
+        s.PRB_DL_SUM, s.PRB_DL_ROWS, s.PRB_UL_SUM, s.PRB_UL_ROWS, s.ERAB_ABNORMAL_SUM, s.ERAB_ABNORMAL_ROWS,
+        s.ACTIVE_UE_DL_SUM, s.ACTIVE_UE_DL_ROWS, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    );
+    rows_merged := SQLROWCOUNT;
+
+    RETURN 'KPI rollup refreshed: ' || rows_merged || ' rollup rows merged';
+END;
+$$;
+
+-- Start over from the full history (after CELL_TOWER is recreated)
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_KPI_ROLLUP()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    TRUNCATE TABLE RAW.KPI_ROLLUP;
+    CREATE OR REPLACE STREAM RAW.CELL_TOWER_ROLLUP_STREAM
+        ON TABLE RAW.CELL_TOWER APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CALL RAW.SP_REFRESH_KPI_ROLLUP();
+    RETURN 'KPI rollup rebuilt from full history';
+END;
+$$;
+
+SELECT 'Step 3 Complete: Stream and refresh procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 4: INITIAL LOAD AND REFRESH TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_KPI_ROLLUP();
+
+-- SERVERLESS task; only runs when new measurements have arrived
+CREATE OR REPLACE TASK RAW.TASK_REFRESH_KPI_ROLLUP
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.CELL_TOWER_ROLLUP_STREAM')
+AS
+    CALL RAW.SP_REFRESH_KPI_ROLLUP();
+
+-- Uncomment to keep the rollup current while the generators are running
+-- ALTER TASK RAW.TASK_REFRESH_KPI_ROLLUP RESUME;
+
+SELECT 'Step 4 Complete: KPI rollup loaded, refresh task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Rows per grain and dimension
+SELECT GRAIN, DIMENSION, COUNT(*) AS ROLLUP_ROWS, MIN(PERIOD_START) AS FIRST_PERIOD, MAX(PERIOD_START) AS LAST_PERIOD
+FROM RAW.KPI_ROLLUP
+GROUP BY GRAIN, DIMENSION
+ORDER BY GRAIN, DIMENSION;
+
+-- Daily failure rate by vendor for the last 30 days
+SELECT PERIOD_START, MEMBER AS VENDOR_NAME, FAILURE_RATE, AVG_LATENCY_DL
+FROM RAW.KPI_ROLLUP_V
+WHERE GRAIN = 'DAY'
+  AND DIMENSION = 'VENDOR'
+  AND PERIOD_START >= DATEADD(DAY, -30, (SELECT MAX(PERIOD_START) FROM RAW.KPI_ROLLUP WHERE GRAIN = 'DAY'))
+ORDER BY PERIOD_START, VENDOR_NAME;
+
+-- Refresh history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_REFRESH_KPI_ROLLUP'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
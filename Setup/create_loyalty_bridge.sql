@@ -0,0 +1,157 @@
+-- ===============================================================================
+-- LOYALTY BRIDGE SETUP
+-- ===============================================================================
+-- Creates a per-cell, per-loyalty-tier bridge of call totals, so the Loyalty
+-- Status Impact and Cell Tower Lookup pages read loyalty impact for any set of
+-- cells with a keyed lookup instead of joining CUSTOMER_LOYALTY to CELL_TOWER
+-- on MSISDN for every selection.
+--
+-- RAW.CELL_LOYALTY_BRIDGE : additive TOTAL_CALLS / FAILED_CALLS per (CELL_ID,
+--                           LOYALTY_STATUS); calls from numbers without a
+--                           loyalty record are kept as 'Non-member'
+-- RAW.CELL_TOWER_LOYALTY_STREAM : append-only stream on CELL_TOWER
+-- RAW.TASK_REFRESH_LOYALTY_BRIDGE : serverless task that merges only the new
+--                           measurements into the bridge
+--
+-- Each phone number counts under a single tier even if CUSTOMER_LOYALTY holds
+-- more than one row for it.
+--
+-- USAGE:
+--   - Run once after the data is loaded
+--   - CALL RAW.SP_REBUILD_LOYALTY_BRIDGE(); after CELL_TOWER is recreated
+--     (master_data_cleanup.py replaces it, which breaks the stream) or after
+--     CUSTOMER_LOYALTY is reloaded
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: BRIDGE TABLE
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.CELL_LOYALTY_BRIDGE (
+    CELL_ID NUMBER(38,0),
+    LOYALTY_STATUS VARCHAR(60),
+    TOTAL_CALLS NUMBER(38,0) DEFAULT 0,
+    FAILED_CALLS NUMBER(38,0) DEFAULT 0,
+    LAST_MEASUREMENT_TS TIMESTAMP_NTZ(9),
+    UPDATED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (CELL_ID);
+
+SELECT 'Step 1 Complete: CELL_LOYALTY_BRIDGE table ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: STREAM AND PROCEDURES
+-- ===============================================================================
+
+CREATE OR REPLACE STREAM RAW.CELL_TOWER_LOYALTY_STREAM
+    ON TABLE RAW.CELL_TOWER
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE;
+
+-- Merge the measurements that arrived since the last run into the bridge
+CREATE OR REPLACE PROCEDURE RAW.SP_REFRESH_LOYALTY_BRIDGE()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    rows_merged INT DEFAULT 0;
+BEGIN
+    MERGE INTO RAW.CELL_LOYALTY_BRIDGE t
+    USING (
+        WITH loyalty AS (
+            SELECT PHONE_NUMBER, ANY_VALUE(STATUS) AS STATUS
+            FROM RAW.CUSTOMER_LOYALTY
+            GROUP BY PHONE_NUMBER
+        )
+        SELECT
+            s.CELL_ID,
+            COALESCE(l.STATUS, 'Non-member') AS LOYALTY_STATUS,
+            COUNT(*) AS TOTAL_CALLS,
+            COUNT_IF(s.CALL_RELEASE_CODE != 0) AS FAILED_CALLS,
+            MAX(s.TIMESTAMP) AS LAST_MEASUREMENT_TS
+        FROM RAW.CELL_TOWER_LOYALTY_STREAM s
+        LEFT JOIN loyalty l ON l.PHONE_NUMBER = s.MSISDN
+        WHERE s.CELL_ID IS NOT NULL
+        GROUP BY s.CELL_ID, LOYALTY_STATUS
+    ) s
+    ON t.CELL_ID = s.CELL_ID
+       AND t.LOYALTY_STATUS = s.LOYALTY_STATUS
+    WHEN MATCHED THEN UPDATE SET
+        TOTAL_CALLS = t.TOTAL_CALLS + s.TOTAL_CALLS,
+        FAILED_CALLS = t.FAILED_CALLS + s.FAILED_CALLS,
+        LAST_MEASUREMENT_TS = GREATEST_IGNORE_NULLS(t.LAST_MEASUREMENT_TS, s.LAST_MEASUREMENT_TS),
+        UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    WHEN NOT MATCHED THEN INSERT (
+        CELL_ID, LOYALTY_STATUS, TOTAL_CALLS, FAILED_CALLS, LAST_MEASUREMENT_TS, UPDATED_AT
+    ) VALUES (
+        s.CELL_ID, s.LOYALTY_STATUS, s.TOTAL_CALLS, s.FAILED_CALLS, s.LAST_MEASUREMENT_TS,
+        CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    );
+    rows_merged := SQLROWCOUNT;
+
+    RETURN 'Loyalty bridge refreshed: ' || rows_merged || ' (cell, tier) rows merged';
+END;
+$$;
+
+-- Start over from the full history (after CELL_TOWER or CUSTOMER_LOYALTY is reloaded)
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_LOYALTY_BRIDGE()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    TRUNCATE TABLE RAW.CELL_LOYALTY_BRIDGE;
+    CREATE OR REPLACE STREAM RAW.CELL_TOWER_LOYALTY_STREAM
+        ON TABLE RAW.CELL_TOWER APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CALL RAW.SP_REFRESH_LOYALTY_BRIDGE();
+    RETURN 'Loyalty bridge rebuilt from full history';
+END;
+$$;
+
+SELECT 'Step 2 Complete: Stream and refresh procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: INITIAL LOAD AND REFRESH TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_LOYALTY_BRIDGE();
+
+-- SERVERLESS task; only runs when new measurements have arrived
+CREATE OR REPLACE TASK RAW.TASK_REFRESH_LOYALTY_BRIDGE
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.CELL_TOWER_LOYALTY_STREAM')
+AS
+    CALL RAW.SP_REFRESH_LOYALTY_BRIDGE();
+
+-- Uncomment to keep the bridge current while the generators are running
+-- ALTER TASK RAW.TASK_REFRESH_LOYALTY_BRIDGE RESUME;
+
+SELECT 'Step 3 Complete: Loyalty bridge loaded, refresh task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Failure rate per loyalty tier
+SELECT LOYALTY_STATUS, SUM(TOTAL_CALLS) AS TOTAL_CALLS, SUM(FAILED_CALLS) AS FAILED_CALLS,
+       ROUND(SUM(FAILED_CALLS) * 100.0 / NULLIF(SUM(TOTAL_CALLS), 0), 2) AS FAILURE_RATE
+FROM RAW.CELL_LOYALTY_BRIDGE
+GROUP BY LOYALTY_STATUS
+ORDER BY FAILED_CALLS DESC;
+
+-- Failed calls per tier for a set of cells (keyed lookup)
+SELECT CELL_ID, LOYALTY_STATUS, FAILED_CALLS, TOTAL_CALLS
+FROM RAW.CELL_LOYALTY_BRIDGE
+WHERE CELL_ID IN (30380850, 30030006)
+ORDER BY CELL_ID, LOYALTY_STATUS;
+
+-- Refresh history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_REFRESH_LOYALTY_BRIDGE'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
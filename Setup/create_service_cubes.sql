@@ -0,0 +1,265 @@
+-- ===============================================================================
+-- SERVICE CUBES SETUP
+-- ===============================================================================
+-- Creates the small pre-aggregated cubes behind the Service Type Performance
+-- Breakdown page. Every slice, drilldown and trend on that page is a roll-up
+-- over these cubes, so it never scans CELL_TOWER or SUPPORT_TICKETS.
+--
+-- RAW.SERVICE_CATEGORY_CUBE : additive network totals per (hour, cell,
+--                             SERVICE_CATEGORY), with the cell's vendor and region
+-- RAW.SERVICE_TYPE_CUBE     : additive ticket totals per (cell, ticket
+--                             SERVICE_TYPE), with the cell's vendor and region
+--                             (tickets carry no timestamp, so there is no hour key)
+-- RAW.*_SERVICE_STREAM      : append-only streams on CELL_TOWER and SUPPORT_TICKETS
+-- RAW.TASK_REFRESH_SERVICE_CUBES : serverless task that merges only the new
+--                             rows from the streams into the cubes
+--
+-- Vendor and region come from RAW.DIM_CELL (setup_data_generators.sql), so
+-- run that script first.
+--
+-- USAGE:
+--   - Run once after the data is loaded and RAW.DIM_CELL exists
+--   - CALL RAW.SP_REBUILD_SERVICE_CUBES(); after CELL_TOWER or SUPPORT_TICKETS
+--     are recreated (master_data_cleanup.py replaces both, which breaks the streams)
+--   - The task is created suspended; resume it below or with START_DEMO.sql
+-- ===============================================================================
+
+USE DATABASE TELCO_NETWORK_OPTIMIZATION_PROD;
+USE SCHEMA RAW;
+
+-- ===============================================================================
+-- STEP 1: CUBE TABLES
+-- ===============================================================================
+
+CREATE TABLE IF NOT EXISTS RAW.SERVICE_CATEGORY_CUBE (
+    TS_HOUR TIMESTAMP_NTZ(9),
+    CELL_ID NUMBER(38,0),
+    SERVICE_CATEGORY VARCHAR(50),
+    VENDOR_NAME VARCHAR(100),
+    REGION VARCHAR(500),
+    -- Network measurement totals
+    EVENT_ROWS NUMBER(38,0) DEFAULT 0,
+    FAILED_EVENTS NUMBER(38,0) DEFAULT 0,
+    DURATION_SUM FLOAT DEFAULT 0,
+    DURATION_ROWS NUMBER(38,0) DEFAULT 0,
+    CHARGED_UNITS_SUM FLOAT DEFAULT 0,
+    RRC_ATT_SUM FLOAT DEFAULT 0,
+    RRC_SUCC_SUM FLOAT DEFAULT 0,
+    LATENCY_DL_SUM FLOAT DEFAULT 0,
+    LATENCY_DL_ROWS NUMBER(38,0) DEFAULT 0,
+    PRB_DL_SUM FLOAT DEFAULT 0,
+    PRB_DL_ROWS NUMBER(38,0) DEFAULT 0,
+    ERAB_ABNORMAL_SUM FLOAT DEFAULT 0,
+    ERAB_ABNORMAL_ROWS NUMBER(38,0) DEFAULT 0,
+    UPDATED_AT TIMESTAMP_NTZ(9)
+)
+CLUSTER BY (TS_HOUR);
+
+CREATE TABLE IF NOT EXISTS RAW.SERVICE_TYPE_CUBE (
+    CELL_ID NUMBER(38,0),
+    SERVICE_TYPE VARCHAR(60),
+    VENDOR_NAME VARCHAR(100),
+    REGION VARCHAR(500),
+    -- Support ticket totals
+    TICKET_COUNT NUMBER(38,0) DEFAULT 0,
+    NEGATIVE_TICKET_COUNT NUMBER(38,0) DEFAULT 0,
+    SENTIMENT_SUM FLOAT DEFAULT 0,
+    SENTIMENT_ROWS NUMBER(38,0) DEFAULT 0,
+    UPDATED_AT TIMESTAMP_NTZ(9)
+);
+
+SELECT 'Step 1 Complete: SERVICE_CATEGORY_CUBE and SERVICE_TYPE_CUBE tables ready' AS STATUS;
+
+-- ===============================================================================
+-- STEP 2: STREAMS AND PROCEDURES
+-- ===============================================================================
+
+CREATE OR REPLACE STREAM RAW.CELL_TOWER_SERVICE_STREAM
+    ON TABLE RAW.CELL_TOWER
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE;
+
+CREATE OR REPLACE STREAM RAW.SUPPORT_TICKETS_SERVICE_STREAM
+    ON TABLE RAW.SUPPORT_TICKETS
+    APPEND_ONLY = TRUE
+    SHOW_INITIAL_ROWS = TRUE;
+
+-- Merge the rows that arrived since the last run into both cubes
+CREATE OR REPLACE PROCEDURE RAW.SP_REFRESH_SERVICE_CUBES()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    category_rows INT DEFAULT 0;
+    type_rows INT DEFAULT 0;
+BEGIN
+    -- Both streams advance together when the transaction commits
+    BEGIN TRANSACTION;
+
+    MERGE INTO RAW.SERVICE_CATEGORY_CUBE t
+    USING (
+        SELECT
+            DATE_TRUNC('HOUR', s.TIMESTAMP) AS TS_HOUR,
+            s.CELL_ID,
+            COALESCE(s.SERVICE_CATEGORY, 'UNKNOWN') AS SERVICE_CATEGORY,
+            COALESCE(ANY_VALUE(d.VENDOR_NAME), ANY_VALUE(s.VENDOR_NAME)) AS VENDOR_NAME,
+            ANY_VALUE(d.REGION) AS REGION,
+            COUNT(*) AS EVENT_ROWS,
+            COUNT_IF(s.CALL_RELEASE_CODE != 0) AS FAILED_EVENTS,
+            COALESCE(SUM(s.DURATION), 0) AS DURATION_SUM,
+            COUNT(s.DURATION) AS DURATION_ROWS,
+            COALESCE(SUM(s.CHARGED_UNITS), 0) AS CHARGED_UNITS_SUM,
+            COALESCE(SUM(s.PM_RRC_CONN_ESTAB_ATT), 0) AS RRC_ATT_SUM,
+            COALESCE(SUM(s.PM_RRC_CONN_ESTAB_SUCC), 0) AS RRC_SUCC_SUM,
+            COALESCE(SUM(s.PM_PDCP_LAT_TIME_DL), 0) AS LATENCY_DL_SUM,
+            COUNT(s.PM_PDCP_LAT_TIME_DL) AS LATENCY_DL_ROWS,
+            COALESCE(SUM(s.PM_PRB_UTIL_DL), 0) AS PRB_DL_SUM,
+            COUNT(s.PM_PRB_UTIL_DL) AS PRB_DL_ROWS,
+            COALESCE(SUM(s.PM_ERAB_REL_ABNORMAL_ENB), 0) AS ERAB_ABNORMAL_SUM,
+            COUNT(s.PM_ERAB_REL_ABNORMAL_ENB) AS ERAB_ABNORMAL_ROWS
+        FROM RAW.CELL_TOWER_SERVICE_STREAM s
+        LEFT JOIN RAW.DIM_CELL d ON d.CELL_ID = s.CELL_ID
+        WHERE s.CELL_ID IS NOT NULL
+          AND s.TIMESTAMP IS NOT NULL
+        GROUP BY TS_HOUR, s.CELL_ID, SERVICE_CATEGORY
+    ) s
+    ON t.TS_HOUR = s.TS_HOUR
+       AND t.CELL_ID = s.CELL_ID
+       AND t.SERVICE_CATEGORY = s.SERVICE_CATEGORY
+    WHEN MATCHED THEN UPDATE SET
+        VENDOR_NAME = s.VENDOR_NAME,
+        REGION = s.REGION,
+        EVENT_ROWS = t.EVENT_ROWS + s.EVENT_ROWS,
+        FAILED_EVENTS = t.FAILED_EVENTS + s.FAILED_EVENTS,
+        DURATION_SUM = t.DURATION_SUM + s.DURATION_SUM,
+        DURATION_ROWS = t.DURATION_ROWS + s.DURATION_ROWS,
+        CHARGED_UNITS_SUM = t.CHARGED_UNITS_SUM + s.CHARGED_UNITS_SUM,
+        RRC_ATT_SUM = t.RRC_ATT_SUM + s.RRC_ATT_SUM,
+        RRC_SUCC_SUM = t.RRC_SUCC_SUM + s.RRC_SUCC_SUM,
+        LATENCY_DL_SUM = t.LATENCY_DL_SUM + s.LATENCY_DL_SUM,
+        LATENCY_DL_ROWS = t.LATENCY_DL_ROWS + s.LATENCY_DL_ROWS,
+        PRB_DL_SUM = t.PRB_DL_SUM + s.PRB_DL_SUM,
+        PRB_DL_ROWS = t.PRB_DL_ROWS + s.PRB_DL_ROWS,
+        ERAB_ABNORMAL_SUM = t.ERAB_ABNORMAL_SUM + s.ERAB_ABNORMAL_SUM,
+        ERAB_ABNORMAL_ROWS = t.ERAB_ABNORMAL_ROWS + s.ERAB_ABNORMAL_ROWS,
+        UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    WHEN NOT MATCHED THEN INSERT (
+        TS_HOUR, CELL_ID, SERVICE_CATEGORY, VENDOR_NAME, REGION,
+        EVENT_ROWS, FAILED_EVENTS, DURATION_SUM, DURATION_ROWS, CHARGED_UNITS_SUM,
+        RRC_ATT_SUM, RRC_SUCC_SUM, LATENCY_DL_SUM, LATENCY_DL_ROWS, PRB_DL_SUM, PRB_DL_ROWS,
+        ERAB_ABNORMAL_SUM, ERAB_ABNORMAL_ROWS, UPDATED_AT
+    ) VALUES (
+        s.TS_HOUR, s.CELL_ID, s.SERVICE_CATEGORY, s.VENDOR_NAME, s.REGION,
+        s.EVENT_ROWS, s.FAILED_EVENTS, s.DURATION_SUM, s.DURATION_ROWS, s.CHARGED_UNITS_SUM,
+        s.RRC_ATT_SUM, s.RRC_SUCC_SUM, s.LATENCY_DL_SUM, s.LATENCY_DL_ROWS, s.PRB_DL_SUM, s.PRB_DL_ROWS,
+        s.ERAB_ABNORMAL_SUM, s.ERAB_ABNORMAL_ROWS, CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    );
+    category_rows := SQLROWCOUNT;
+
+    MERGE INTO RAW.SERVICE_TYPE_CUBE t
+    USING (
+        SELECT
+            s.CELL_ID,
+            COALESCE(s.SERVICE_TYPE, 'Unknown') AS SERVICE_TYPE,
+            ANY_VALUE(d.VENDOR_NAME) AS VENDOR_NAME,
+            ANY_VALUE(d.REGION) AS REGION,
+            COUNT(*) AS TICKET_COUNT,
+            COUNT_IF(s.SENTIMENT_SCORE < 0) AS NEGATIVE_TICKET_COUNT,
+            COALESCE(SUM(s.SENTIMENT_SCORE), 0) AS SENTIMENT_SUM,
+            COUNT(s.SENTIMENT_SCORE) AS SENTIMENT_ROWS
+        FROM RAW.SUPPORT_TICKETS_SERVICE_STREAM s
+        LEFT JOIN RAW.DIM_CELL d ON d.CELL_ID = s.CELL_ID
+        WHERE s.CELL_ID IS NOT NULL
+        GROUP BY s.CELL_ID, SERVICE_TYPE
+    ) s
+    ON t.CELL_ID = s.CELL_ID
+       AND t.SERVICE_TYPE = s.SERVICE_TYPE
+    WHEN MATCHED THEN UPDATE SET
+        VENDOR_NAME = s.VENDOR_NAME,
+        REGION = s.REGION,
+        TICKET_COUNT = t.TICKET_COUNT + s.TICKET_COUNT,
+        NEGATIVE_TICKET_COUNT = t.NEGATIVE_TICKET_COUNT + s.NEGATIVE_TICKET_COUNT,
+        SENTIMENT_SUM = t.SENTIMENT_SUM + s.SENTIMENT_SUM,
+        SENTIMENT_ROWS = t.SENTIMENT_ROWS + s.SENTIMENT_ROWS,
+        UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    WHEN NOT MATCHED THEN INSERT (
+        CELL_ID, SERVICE_TYPE, VENDOR_NAME, REGION,
+        TICKET_COUNT, NEGATIVE_TICKET_COUNT, SENTIMENT_SUM, SENTIMENT_ROWS, UPDATED_AT
+    ) VALUES (
+        s.CELL_ID, s.SERVICE_TYPE, s.VENDOR_NAME, s.REGION,
+        s.TICKET_COUNT, s.NEGATIVE_TICKET_COUNT, s.SENTIMENT_SUM, s.SENTIMENT_ROWS,
+        CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    );
+    type_rows := SQLROWCOUNT;
+
+    COMMIT;
+
+    RETURN 'Service cubes refreshed: ' || category_rows || ' service category rows, ' || type_rows || ' service type rows';
+END;
+$$;
+
+-- Start over from the full history (after the base tables are recreated)
+CREATE OR REPLACE PROCEDURE RAW.SP_REBUILD_SERVICE_CUBES()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+BEGIN
+    TRUNCATE TABLE RAW.SERVICE_CATEGORY_CUBE;
+    TRUNCATE TABLE RAW.SERVICE_TYPE_CUBE;
+    CREATE OR REPLACE STREAM RAW.CELL_TOWER_SERVICE_STREAM
+        ON TABLE RAW.CELL_TOWER APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CREATE OR REPLACE STREAM RAW.SUPPORT_TICKETS_SERVICE_STREAM
+        ON TABLE RAW.SUPPORT_TICKETS APPEND_ONLY = TRUE SHOW_INITIAL_ROWS = TRUE;
+    CALL RAW.SP_REFRESH_SERVICE_CUBES();
+    RETURN 'Service cubes rebuilt from full history';
+END;
+$$;
+
+SELECT 'Step 2 Complete: Streams and refresh procedures created' AS STATUS;
+
+-- ===============================================================================
+-- STEP 3: INITIAL LOAD AND REFRESH TASK
+-- ===============================================================================
+
+CALL RAW.SP_REBUILD_SERVICE_CUBES();
+
+-- SERVERLESS task; only runs when new rows have arrived
+CREATE OR REPLACE TASK RAW.TASK_REFRESH_SERVICE_CUBES
+    SCHEDULE = '1 MINUTE'
+    WHEN SYSTEM$STREAM_HAS_DATA('RAW.CELL_TOWER_SERVICE_STREAM')
+      OR SYSTEM$STREAM_HAS_DATA('RAW.SUPPORT_TICKETS_SERVICE_STREAM')
+AS
+    CALL RAW.SP_REFRESH_SERVICE_CUBES();
+
+-- Uncomment to keep the cubes current while the generators are running
+-- ALTER TASK RAW.TASK_REFRESH_SERVICE_CUBES RESUME;
+
+SELECT 'Step 3 Complete: Service cubes loaded, refresh task created (suspended)' AS STATUS;
+
+-- ===============================================================================
+-- USEFUL QUERIES
+-- ===============================================================================
+
+-- Failure rate and average duration per service category
+SELECT SERVICE_CATEGORY,
+       SUM(EVENT_ROWS) AS EVENTS,
+       ROUND(SUM(FAILED_EVENTS) * 100.0 / NULLIF(SUM(EVENT_ROWS), 0), 2) AS FAILURE_RATE,
+       ROUND(SUM(DURATION_SUM) / NULLIF(SUM(DURATION_ROWS), 0), 1) AS AVG_DURATION
+FROM RAW.SERVICE_CATEGORY_CUBE
+GROUP BY SERVICE_CATEGORY
+ORDER BY EVENTS DESC;
+
+-- Ticket volume and sentiment per service type and vendor
+SELECT SERVICE_TYPE, VENDOR_NAME, SUM(TICKET_COUNT) AS TICKETS,
+       ROUND(SUM(SENTIMENT_SUM) / NULLIF(SUM(SENTIMENT_ROWS), 0), 3) AS AVG_SENTIMENT
+FROM RAW.SERVICE_TYPE_CUBE
+GROUP BY SERVICE_TYPE, VENDOR_NAME
+ORDER BY TICKETS DESC;
+
+-- Refresh history
+SELECT NAME, STATE, SCHEDULED_TIME, COMPLETED_TIME, RETURN_VALUE, ERROR_MESSAGE
+FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(TASK_NAME => 'TASK_REFRESH_SERVICE_CUBES'))
+ORDER BY SCHEDULED_TIME DESC
+LIMIT 20;
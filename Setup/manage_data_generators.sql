@@ -130,7 +130,7 @@ SELECT
     COUNT(*) AS COUNT,
     ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 1) AS PERCENTAGE
 FROM GENERATE.CELL_TOWER_TEST ct
-JOIN GENERATE.REF_CELL_TOWER_ATTRIBUTES ref ON ct.CELL_ID = ref.CELL_ID
+JOIN RAW.DIM_CELL ref ON ct.CELL_ID = ref.CELL_ID
 GROUP BY ref.PERFORMANCE_TIER
 ORDER BY COUNT DESC;
 
@@ -150,7 +150,7 @@ SELECT
     COUNT(*) AS TICKET_COUNT,
     ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 1) AS PERCENTAGE
 FROM GENERATE.SUPPORT_TICKETS_TEST st
-JOIN GENERATE.REF_CELL_TOWER_ATTRIBUTES ref ON st.CELL_ID = ref.CELL_ID
+JOIN RAW.DIM_CELL ref ON st.CELL_ID = ref.CELL_ID
 GROUP BY ref.PERFORMANCE_TIER
 ORDER BY TICKET_COUNT DESC;
 
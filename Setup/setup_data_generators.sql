@@ -3,7 +3,7 @@
 -- ===============================================================================
 -- This script creates:
 -- 1. GENERATE schema with test tables
--- 2. Reference tables for data generation
+-- 2. RAW.DIM_CELL (canonical cell dimension) and reference tables for data generation
 -- 3. Stored procedures for generating cell tower and support ticket data
 -- 4. SERVERLESS Snowflake tasks that run every MINUTE
 --
@@ -37,33 +37,127 @@ SELECT 'Step 1 Complete: GENERATE schema created' AS STATUS;
 -- STEP 2: CREATE REFERENCE TABLES
 -- ===============================================================================
 
--- Reference table: Cell IDs with their static attributes
-CREATE OR REPLACE TABLE GENERATE.REF_CELL_TOWER_ATTRIBUTES AS
+-- Canonical cell dimension: one row per CELL_ID with the tower's static
+-- attributes and precomputed spatial keys (H3 resolutions 4-11, geohash,
+-- region). The generators, the Streamlit pages and the semantic model all
+-- join to RAW.DIM_CELL instead of re-deriving attributes from the fact table.
+-- Attributes come from each cell's most recent CELL_TOWER row, so a cell whose
+-- vendor or tier was changed by master_data_cleanup.py yields a single row.
+CREATE OR REPLACE VIEW RAW.DIM_CELL_SOURCE_V AS
+WITH latest AS (
+    SELECT 
+        CELL_ID,
+        HOME_NETWORK_TAP_CODE,
+        HOME_NETWORK_NAME,
+        HOME_NETWORK_COUNTRY,
+        BID_DESCRIPTION,
+        VENDOR_NAME,
+        CELL_LATITUDE,
+        CELL_LONGITUDE,
+        ENODEB_FUNCTION,
+        LOCATION_AREA_CODE,
+        PERFORMANCE_TIER
+    FROM RAW.CELL_TOWER
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY CELL_ID ORDER BY TIMESTAMP DESC) = 1
+)
 SELECT 
     CELL_ID,
     HOME_NETWORK_TAP_CODE,
     HOME_NETWORK_NAME,
     HOME_NETWORK_COUNTRY,
     BID_DESCRIPTION,
+    -- BID_DESCRIPTION without the technology suffix, e.g. 'ALBERTA (LTE)' -> 'ALBERTA'
+    TRIM(REGEXP_REPLACE(BID_DESCRIPTION, '\\s*\\(.*\\)\\s*$', '')) AS REGION,
     VENDOR_NAME,
     CELL_LATITUDE,
     CELL_LONGITUDE,
     ENODEB_FUNCTION,
     LOCATION_AREA_CODE,
-    PERFORMANCE_TIER
-FROM RAW.CELL_TOWER
-GROUP BY 
-    CELL_ID,
-    HOME_NETWORK_TAP_CODE,
-    HOME_NETWORK_NAME,
-    HOME_NETWORK_COUNTRY,
-    BID_DESCRIPTION,
-    VENDOR_NAME,
-    CELL_LATITUDE,
-    CELL_LONGITUDE,
-    ENODEB_FUNCTION,
-    LOCATION_AREA_CODE,
-    PERFORMANCE_TIER;
+    PERFORMANCE_TIER,
+    ST_GEOHASH(ST_MAKEPOINT(CELL_LONGITUDE, CELL_LATITUDE), 7) AS GEOHASH,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 4) AS H3_RES4,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 5) AS H3_RES5,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 6) AS H3_RES6,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 7) AS H3_RES7,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 8) AS H3_RES8,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 9) AS H3_RES9,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 10) AS H3_RES10,
+    H3_LATLNG_TO_CELL_STRING(CELL_LATITUDE, CELL_LONGITUDE, 11) AS H3_RES11
+FROM latest;
+
+CREATE OR REPLACE TABLE RAW.DIM_CELL AS
+SELECT 
+    src.*,
+    CURRENT_TIMESTAMP()::TIMESTAMP_NTZ AS UPDATED_AT
+FROM RAW.DIM_CELL_SOURCE_V src;
+
+ALTER TABLE RAW.DIM_CELL ADD PRIMARY KEY (CELL_ID);
+
+-- Re-sync DIM_CELL with RAW.CELL_TOWER (new cells, or attributes changed by a
+-- cleanup run). Only rows whose attributes actually changed are rewritten.
+CREATE OR REPLACE PROCEDURE RAW.SP_SYNC_DIM_CELL()
+RETURNS STRING
+LANGUAGE SQL
+AS
+$$
+DECLARE
+    rows_merged INT;
+BEGIN
+    MERGE INTO TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL d
+    USING TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL_SOURCE_V s
+        ON d.CELL_ID = s.CELL_ID
+    WHEN MATCHED AND NOT (
+            EQUAL_NULL(d.HOME_NETWORK_TAP_CODE, s.HOME_NETWORK_TAP_CODE)
+        AND EQUAL_NULL(d.HOME_NETWORK_NAME, s.HOME_NETWORK_NAME)
+        AND EQUAL_NULL(d.HOME_NETWORK_COUNTRY, s.HOME_NETWORK_COUNTRY)
+        AND EQUAL_NULL(d.BID_DESCRIPTION, s.BID_DESCRIPTION)
+        AND EQUAL_NULL(d.VENDOR_NAME, s.VENDOR_NAME)
+        AND EQUAL_NULL(d.CELL_LATITUDE, s.CELL_LATITUDE)
+        AND EQUAL_NULL(d.CELL_LONGITUDE, s.CELL_LONGITUDE)
+        AND EQUAL_NULL(d.ENODEB_FUNCTION, s.ENODEB_FUNCTION)
+        AND EQUAL_NULL(d.LOCATION_AREA_CODE, s.LOCATION_AREA_CODE)
+        AND EQUAL_NULL(d.PERFORMANCE_TIER, s.PERFORMANCE_TIER)
+    ) THEN UPDATE SET
+        HOME_NETWORK_TAP_CODE = s.HOME_NETWORK_TAP_CODE,
+        HOME_NETWORK_NAME = s.HOME_NETWORK_NAME,
+        HOME_NETWORK_COUNTRY = s.HOME_NETWORK_COUNTRY,
+        BID_DESCRIPTION = s.BID_DESCRIPTION,
+        REGION = s.REGION,
+        VENDOR_NAME = s.VENDOR_NAME,
+        CELL_LATITUDE = s.CELL_LATITUDE,
+        CELL_LONGITUDE = s.CELL_LONGITUDE,
+        ENODEB_FUNCTION = s.ENODEB_FUNCTION,
+        LOCATION_AREA_CODE = s.LOCATION_AREA_CODE,
+        PERFORMANCE_TIER = s.PERFORMANCE_TIER,
+        GEOHASH = s.GEOHASH,
+        H3_RES4 = s.H3_RES4,
+        H3_RES5 = s.H3_RES5,
+        H3_RES6 = s.H3_RES6,
+        H3_RES7 = s.H3_RES7,
+        H3_RES8 = s.H3_RES8,
+        H3_RES9 = s.H3_RES9,
+        H3_RES10 = s.H3_RES10,
+        H3_RES11 = s.H3_RES11,
+        UPDATED_AT = CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    WHEN NOT MATCHED THEN INSERT (
+        CELL_ID, HOME_NETWORK_TAP_CODE, HOME_NETWORK_NAME, HOME_NETWORK_COUNTRY,
+        BID_DESCRIPTION, REGION, VENDOR_NAME, CELL_LATITUDE, CELL_LONGITUDE,
+        ENODEB_FUNCTION, LOCATION_AREA_CODE, PERFORMANCE_TIER, GEOHASH,
+        H3_RES4, H3_RES5, H3_RES6, H3_RES7, H3_RES8, H3_RES9, H3_RES10, H3_RES11,
+        UPDATED_AT
+    ) VALUES (
+        s.CELL_ID, s.HOME_NETWORK_TAP_CODE, s.HOME_NETWORK_NAME, s.HOME_NETWORK_COUNTRY,
+        s.BID_DESCRIPTION, s.REGION, s.VENDOR_NAME, s.CELL_LATITUDE, s.CELL_LONGITUDE,
+        s.ENODEB_FUNCTION, s.LOCATION_AREA_CODE, s.PERFORMANCE_TIER, s.GEOHASH,
+        s.H3_RES4, s.H3_RES5, s.H3_RES6, s.H3_RES7, s.H3_RES8, s.H3_RES9, s.H3_RES10, s.H3_RES11,
+        CURRENT_TIMESTAMP()::TIMESTAMP_NTZ
+    );
+    
+    rows_merged := SQLROWCOUNT;
+    
+    RETURN 'DIM_CELL synced: ' || rows_merged || ' cells inserted or updated';
+END;
+$$;
 
 -- Reference table: Customer complaint texts
 CREATE OR REPLACE TABLE GENERATE.REF_COMPLAINT_TEXTS (
@@ -139,7 +233,7 @@ INSERT INTO GENERATE.REF_EMAIL_DOMAINS VALUES
 ('icloud.com'), ('aol.com'), ('protonmail.com');
 
 SELECT 'Step 2 Complete: Reference tables created and populated' AS STATUS;
-SELECT 'Cell Towers:', COUNT(*) AS COUNT FROM GENERATE.REF_CELL_TOWER_ATTRIBUTES
+SELECT 'Cell Towers:', COUNT(*) AS COUNT FROM RAW.DIM_CELL
 UNION ALL
 SELECT 'Complaint Texts:', COUNT(*) FROM GENERATE.REF_COMPLAINT_TEXTS
 UNION ALL
@@ -209,7 +303,7 @@ BEGIN
             DATEADD(MINUTE, -30, :new_timestamp) AS window_start,
             -- WINDOW_END_AT = 30 minutes after the hour with .001 milliseconds
             DATEADD(MINUTE, 30, :new_timestamp) AS window_end
-        FROM GENERATE.REF_CELL_TOWER_ATTRIBUTES ref
+        FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL ref
     )
     SELECT 
         CELL_ID,
@@ -499,7 +593,7 @@ BEGIN
     cell_sel AS (
         -- 70% of tickets should be for problematic towers
         SELECT CELL_ID
-        FROM GENERATE.REF_CELL_TOWER_ATTRIBUTES
+        FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL
         WHERE CASE 
             WHEN UNIFORM(1, 100, RANDOM()) <= 70 THEN PERFORMANCE_TIER IN ('BAD', 'VERY_BAD', 'CATASTROPHIC')
             ELSE PERFORMANCE_TIER IN ('GOOD', 'PROBLEMATIC')
@@ -557,6 +651,7 @@ SELECT '✅ DATA GENERATOR SETUP COMPLETE - DEMO STREAMING MODE!' AS STATUS;
 SELECT '' AS BLANK_LINE;
 SELECT 'Summary:' AS SECTION;
 SELECT '- GENERATE schema created' AS ITEM
+UNION ALL SELECT '- RAW.DIM_CELL built from RAW.CELL_TOWER (re-sync with CALL RAW.SP_SYNC_DIM_CELL())' AS ITEM
 UNION ALL SELECT '- Reference tables populated with existing data patterns' AS ITEM
 UNION ALL SELECT '- Cell tower generation procedure created (writes to RAW.CELL_TOWER)' AS ITEM
 UNION ALL SELECT '- Support ticket generation procedure created (writes to RAW.SUPPORT_TICKETS)' AS ITEM
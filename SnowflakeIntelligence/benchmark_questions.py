@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+SEMANTIC MODEL BENCHMARK
+========================
+Replays the questions in ExampleQuestions.md through Cortex Analyst and measures
+what the generated SQL costs, so semantic model changes can be compared.
+
+For every question the benchmark records the SQL Cortex Analyst generated, then
+runs that SQL on the warehouse (result cache off) and reads its elapsed time,
+execution time, bytes scanned and row count from QUERY_HISTORY. The results are
+written as a JSON report, one entry per question.
+
+MODES:
+======
+- Live (default): ask Cortex Analyst, then run the SQL
+      python benchmark_questions.py --semantic-model @RAW.MODELS/telco_network_opt2.yaml \\
+          --output before.json
+- Replay: take the SQL from an earlier report instead of calling Cortex Analyst
+  (a local mock of the API), then run it. Measures warehouse-side changes such as
+  new rollups without paying for, or varying with, SQL generation
+      python benchmark_questions.py --replay before.json --output after.json
+- Offline: --replay with --no-execute needs no Snowflake connection at all and
+  just reports the recorded SQL and timings
+- Compare: --compare prints the per-question change against another report
+      python benchmark_questions.py --replay before.json --output after.json --compare before.json
+
+Queries run with QUERY_TAG {"app": "telco_network_optimization", "page": "analyst_benchmark",
+"widget": "question_<n>", ...}, so they can also be found in QUERY_HISTORY.
+
+The connection uses a named connection from ~/.snowflake/connections.toml
+(--connection, or SNOWFLAKE_DEFAULT_CONNECTION_NAME).
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+APP_NAME = "telco_network_optimization"
+QUESTIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ExampleQuestions.md")
+ANALYST_PATH = "/api/v2/cortex/analyst/message"
+ANALYST_TIMEOUT_SECONDS = 120
+
+# "1. **"What are the top 10 cell towers ...?"**"
+QUESTION_PATTERN = re.compile(r'^\s*(\d+)\.\s+\*\*"(.+?)"\*\*')
+
+REPORT_COLUMNS = [
+    ("number", "#", 3),
+    ("status", "STATUS", 8),
+    ("elapsed_ms", "ELAPSED_MS", 11),
+    ("bytes_scanned", "BYTES_SCANNED", 14),
+    ("rows", "ROWS", 8),
+    ("question", "QUESTION", 60),
+]
+
+def load_questions(path=QUESTIONS_FILE):
+    """Numbered questions from ExampleQuestions.md as (number, question) pairs"""
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = QUESTION_PATTERN.match(line)
+            if match:
+                questions.append((int(match.group(1)), match.group(2)))
+    return questions
+
+def select_questions(questions, spec):
+    """Filter questions by a spec such as "1,2,5-10" (None keeps all)"""
+    if not spec:
+        return questions
+    wanted = set()
+    for part in spec.split(","):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            wanted.update(range(int(first), int(last) + 1))
+        else:
+            wanted.add(int(part))
+    return [q for q in questions if q[0] in wanted]
+
+def get_connection(connection_name):
+    """Connect with a named connection from connections.toml"""
+    import snowflake.connector
+
+    if connection_name:
+        return snowflake.connector.connect(connection_name=connection_name)
+    return snowflake.connector.connect()
+
+class CortexAnalyst:
+    """Asks the Cortex Analyst REST API for the SQL that answers a question"""
+
+    def __init__(self, conn, semantic_model):
+        self.url = f"https://{conn.host}{ANALYST_PATH}"
+        self.token = conn.rest.token
+        self.semantic_model = semantic_model
+
+    def generate_sql(self, number, question):
+        body = {
+            "messages": [{"role": "user", "content": [{"type": "text", "text": question}]}],
+            "semantic_model_file": self.semantic_model,
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(body).encode("utf-8"),
+            headers={
+                "Authorization": f'Snowflake Token="{self.token}"',
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            method="POST",
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=ANALYST_TIMEOUT_SECONDS) as response:
+                payload = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"Cortex Analyst returned HTTP {e.code}: {e.read().decode('utf-8', 'replace')}")
+        generation_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        content = payload.get("message", {}).get("content", [])
+        sql = next((c.get("statement") for c in content if c.get("type") == "sql"), None)
+        text = " ".join(c.get("text", "") for c in content if c.get("type") == "text").strip()
+        return {"sql": sql, "analyst_text": text, "generation_ms": generation_ms,
+                "request_id": payload.get("request_id")}
+
+class ReplayAnalyst:
+    """Local stand-in for Cortex Analyst that returns the SQL recorded in an earlier report"""
+
+    def __init__(self, report_path):
+        self.results = {r["number"]: r for r in load_report(report_path)["results"]}
+
+    def generate_sql(self, number, question):
+        recorded = self.results.get(number)
+        if recorded is None:
+            raise RuntimeError(f"Question {number} is not in the replayed report")
+        if recorded["question"] != question:
+            logger.warning(f"Question {number} changed since it was recorded; replaying the recorded SQL")
+        return {"sql": recorded.get("sql"), "analyst_text": recorded.get("analyst_text"),
+                "generation_ms": None, "request_id": recorded.get("request_id")}
+
+    def recorded_metrics(self, number):
+        recorded = self.results.get(number, {})
+        return {k: recorded.get(k) for k in ("elapsed_ms", "execution_ms", "bytes_scanned", "rows", "query_id")}
+
+def set_query_tag(cursor, number):
+    tag = json.dumps({
+        "app": APP_NAME,
+        "page": "analyst_benchmark",
+        "widget": f"question_{number}",
+        "user": os.environ.get("USER", "unknown"),
+    })
+    cursor.execute("ALTER SESSION SET QUERY_TAG = %s", (tag,))
+
+def run_sql(conn, number, sql):
+    """Run the generated SQL and return its cost from QUERY_HISTORY"""
+    cursor = conn.cursor()
+    try:
+        set_query_tag(cursor, number)
+        cursor.execute(sql)
+        query_id = cursor.sfqid
+        rows = len(cursor.fetchall())
+        cursor.execute("""
+            SELECT TOTAL_ELAPSED_TIME, EXECUTION_TIME, BYTES_SCANNED
+            FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 1000))
+            WHERE QUERY_ID = %s
+        """, (query_id,))
+        history = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    elapsed_ms, execution_ms, bytes_scanned = history if history else (None, None, None)
+    return {"query_id": query_id, "rows": rows, "elapsed_ms": elapsed_ms,
+            "execution_ms": execution_ms, "bytes_scanned": bytes_scanned}
+
+def benchmark(questions, analyst, conn):
+    """Generate and (when conn is given) run the SQL for every question"""
+    results = []
+    for number, question in questions:
+        logger.info(f"[{number}] {question}")
+        result = {"number": number, "question": question, "status": "OK", "error": None}
+        try:
+            result.update(analyst.generate_sql(number, question))
+            if not result["sql"]:
+                result["status"] = "NO_SQL"
+            elif conn is not None:
+                result.update(run_sql(conn, number, result["sql"]))
+            elif isinstance(analyst, ReplayAnalyst):
+                result.update(analyst.recorded_metrics(number))
+                result["status"] = "RECORDED"
+        except Exception as e:
+            logger.error(f"❌ Question {number}: {str(e)}")
+            result["status"] = "ERROR"
+            result["error"] = str(e)
+        results.append(result)
+    return results
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_report(path, results, args):
+    report = {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "semantic_model": args.semantic_model,
+        "replayed_from": args.replay,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    logger.info(f"Report written to {path}")
+
+def format_value(value):
+    if value is None:
+        return "-"
+    if isinstance(value, (int, float)):
+        return f"{value:,.0f}"
+    return str(value)
+
+def print_report(results):
+    print(" ".join(label.ljust(width) for _, label, width in REPORT_COLUMNS))
+    for r in results:
+        print(" ".join(format_value(r.get(key))[:width].ljust(width) for key, _, width in REPORT_COLUMNS))
+
+    timed = [r for r in results if r.get("elapsed_ms") is not None]
+    print(f"\n{len(results)} questions, {sum(r['status'] in ('OK', 'RECORDED') for r in results)} answered, "
+          f"{sum(r['elapsed_ms'] for r in timed):,.0f} ms and "
+          f"{sum(r.get('bytes_scanned') or 0 for r in timed):,.0f} bytes scanned in total")
+
+def print_comparison(results, baseline_path):
+    """Per-question change in elapsed time and bytes scanned against a baseline report"""
+    baseline = {r["number"]: r for r in load_report(baseline_path)["results"]}
+    print(f"\nChange against {baseline_path}")
+    print(f"{'#':<3} {'ELAPSED_MS':>22} {'BYTES_SCANNED':>32}  SQL")
+    for r in results:
+        before = baseline.get(r["number"])
+        if before is None:
+            continue
+        sql_changed = "changed" if (before.get("sql") or "").strip() != (r.get("sql") or "").strip() else "same"
+        print(f"{r['number']:<3} "
+              f"{format_value(before.get('elapsed_ms')):>10} -> {format_value(r.get('elapsed_ms')):<9} "
+              f"{format_value(before.get('bytes_scanned')):>15} -> {format_value(r.get('bytes_scanned')):<14}  "
+              f"{sql_changed}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the semantic model on the example questions")
+    parser.add_argument("--semantic-model",
+                        help="Staged semantic model file, e.g. @DB.SCHEMA.STAGE/telco_network_opt2.yaml (live mode)")
+    parser.add_argument("--replay",
+                        help="Take the SQL from this earlier report instead of calling Cortex Analyst")
+    parser.add_argument("--no-execute", action="store_true",
+                        help="Do not run the SQL; with --replay no Snowflake connection is needed")
+    parser.add_argument("--questions",
+                        help="Question numbers to run, e.g. 1,2,5-10 (default: all)")
+    parser.add_argument("--output",
+                        help="Write the JSON report to this file")
+    parser.add_argument("--compare",
+                        help="Print the change against this earlier report")
+    parser.add_argument("--connection",
+                        default=os.environ.get("SNOWFLAKE_DEFAULT_CONNECTION_NAME"),
+                        help="Connection name from connections.toml")
+    args = parser.parse_args()
+    if not args.replay and not args.semantic_model:
+        parser.error("--semantic-model is required unless --replay is given")
+    return args
+
+def main():
+    args = parse_args()
+    questions = select_questions(load_questions(), args.questions)
+    logger.info(f"Benchmarking {len(questions)} question(s)")
+
+    offline = args.replay and args.no_execute
+    conn = None if offline else get_connection(args.connection)
+    try:
+        if conn is not None:
+            conn.cursor().execute("ALTER SESSION SET USE_CACHED_RESULT = FALSE")
+        analyst = ReplayAnalyst(args.replay) if args.replay else CortexAnalyst(conn, args.semantic_model)
+        results = benchmark(questions, analyst, None if args.no_execute else conn)
+    finally:
+        if conn is not None:
+            conn.close()
+
+    print_report(results)
+    if args.compare:
+        print_comparison(results, args.compare)
+    if args.output:
+        save_report(args.output, results, args)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import streamlit as st
 import snowflake.snowpark.context
+from utils.instrumentation import start_run, run_query, render_perf_panel
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -15,6 +16,7 @@ def init_session():
     return snowflake.snowpark.context.get_active_session()
 
 session = init_session()
+start_run("Home")
 
 # Main page content
 st.title("📡 Telco Network Optimization Suite")
@@ -34,16 +36,18 @@ st.markdown("""
 - **Cell Tower Lookup**: Examine individual cell tower performance metrics
 - **Geospatial Analysis**: Visualize network metrics and support ticket data on maps
 - **Correlation Analytics**: Discover relationships between network metrics and customer experience
-- **Customer Impact Dashboard TBC**: Correlate technical metrics with customer complaints
-- **Loyalty Status Impact View TBC**: Analyze how network issues affect customers by loyalty tier
-- **Time-Series Analysis TBC**: Track performance metrics over time to identify patterns
-- **Service Type Performance Breakdown TBC**: Compare metrics across different service offerings
-- **Issue Prioritization Matrix TBC**: Identify high-impact, easy-to-fix network issues
-- **Problematic Cell Towers TBC**: Identify and diagnose towers with technical or customer issues
-- **Proactive Network Adjustments TBC**: Monitor trends to detect issues before they affect customers
-- **Capacity Planning TBC**: Identify areas needing infrastructure upgrades or expansion
-- **Root Cause Analysis for Complaints TBC**: Link customer complaints to network performance issues
-- **Data Integration and Quality TBC**: Ensure data accuracy and reliability for decision-making
+- **Customer Impact Dashboard**: Find the subscribers hit hardest by failed calls and the tickets on the cells behind them
+- **Loyalty Status Impact View**: Analyze how network issues affect customers by loyalty tier, and rank the cells failing the most valuable customers
+- **Time-Series Analysis**: Track performance metrics over time from hourly, daily and weekly rollups
+- **Service Type Performance Breakdown**: Compare metrics across service categories and ticket service types from pre-aggregated cubes
+- **Issue Prioritization Matrix**: Identify high-impact, easy-to-fix network issues on an impact vs effort matrix
+- **Problematic Cell Towers**: Rank and diagnose towers with technical or customer issues from a precomputed scorecard, and search support tickets for similar complaints
+- **Proactive Network Adjustments**: Early-warning alerts for cells breaking from their own hourly baseline
+- **Capacity Planning**: Identify areas needing infrastructure upgrades or expansion from cached per-cell PRB and RRC forecasts
+- **Root Cause Analysis for Complaints**: Link each customer complaint to KPI deviations and failure cause codes on its cell
+- **Data Integration and Quality**: Null, range, row-count and duplicate checks run on each new batch of measurements
+- **Query Cost Attribution**: Admin view ranking dashboard interactions by elapsed time, bytes scanned and credits
+- **Cache Manager**: Admin view of the shared memory-bounded cache, its hit/miss statistics, byte budget and dataset watermarks
 
 ### Getting Started
 Select a page from the sidebar to begin your analysis.
@@ -53,23 +57,26 @@ Select a page from the sidebar to begin your analysis.
 col1, col2, col3 = st.columns(3)
 
 # Count of cell towers
-total_cells = session.sql("""
+total_cells = run_query(session, """
     SELECT COUNT(DISTINCT cell_id) as total_cells 
     FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
-""").collect()[0]["TOTAL_CELLS"]
+""", "total_cells")["TOTAL_CELLS"][0]
 
 # Average failure rate
-avg_failure = session.sql("""
+avg_failure = run_query(session, """
     SELECT ROUND(AVG(CASE WHEN call_release_code != 0 THEN 1 ELSE 0 END) * 100, 2) as failure_rate
     FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
-""").collect()[0]["FAILURE_RATE"]
+""", "avg_failure")["FAILURE_RATE"][0]
 
 # Count of support tickets
-ticket_count = session.sql("""
+ticket_count = run_query(session, """
     SELECT COUNT(*) as ticket_count 
     FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS
-""").collect()[0]["TICKET_COUNT"]
+""", "ticket_count")["TICKET_COUNT"][0]
 
 col1.metric("Total Cell Towers", f"{total_cells:,}")
 col2.metric("Average Failure Rate", f"{avg_failure}%")
-col3.metric("Support Tickets", f"{ticket_count:,}") 
\ No newline at end of file
+col3.metric("Support Tickets", f"{ticket_count:,}") 
+
+# Stage timings for this run
+render_perf_panel(session)
@@ -1,25 +1,439 @@
+import json
+
 import streamlit as st
+import pandas as pd
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
 
-# Page configuration
+# Page configuration - must be the first Streamlit command
 st.set_page_config(
     page_title="Problematic Cell Towers",
     page_icon="🚨",
-    layout="wide"
+    layout="wide",
+    initial_sidebar_state="expanded"
 )
 
 # Page header
 st.title("🚨 Problematic Cell Towers")
-
-# Page content
 st.markdown("""
-## This page hasn't been built yet. The plan is...
+Identify and diagnose the cell towers behind the most customer pain: ticket volume, negative sentiment,
+complaint categories parsed from the ticket text, and the network metrics of the same towers.
+
+All figures come from the per-cell tower scorecard (`RAW.TOWER_SCORECARD`), which a task keeps up to date
+as new measurements and tickets arrive, so this page never re-joins `SUPPORT_TICKETS` and `CELL_TOWER`.
+The ticket search asks the `Network_Optimise_Support_Tickets_REQUEST` Cortex Search service for similar complaint
+texts instead of scanning `REQUEST` with LIKE.
+""")
+
+SCORECARD_VIEW = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TOWER_SCORECARD_V"
+CELL_CATEGORIES_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_COMPLAINT_CATEGORIES"
+CATEGORY_LIST_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.COMPLAINT_CATEGORIES"
+TICKET_CATEGORIES_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TICKET_CATEGORIES"
+SERVICE_TYPE_CUBE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SERVICE_TYPE_CUBE"
+TICKET_SEARCH_SERVICE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.NETWORK_OPTIMISE_SUPPORT_TICKETS_REQUEST"
+
+# Distinct complaint texts asked from the search service per query, and tickets fetched per "Load more"
+SEARCH_TEXT_LIMIT = 25
+SEARCH_PAGE_SIZE = 25
+SEARCH_PAGES_KEY = "_ticket_search_pages"
+
+# Sortable scorecard columns: label -> (column, sort descending)
+RANK_OPTIONS = {
+    "Problem Score": ("PROBLEM_SCORE", True),
+    "Support Ticket Count": ("TICKET_COUNT", True),
+    "Negative Tickets": ("NEGATIVE_TICKET_COUNT", True),
+    "Sentiment Score (most negative)": ("AVG_SENTIMENT", False),
+    "Failure Rate": ("FAILURE_RATE", True),
+    "RRC Failure Rate": ("RRC_FAILURE_RATE", True),
+    "Downlink Latency": ("AVG_LATENCY_DL", True),
+    "PRB Utilization Downlink": ("AVG_PRB_UTIL_DL", True),
+    "E-RAB Abnormal Release": ("AVG_ERAB_ABNORMAL", True),
+}
+
+COMPLAINT_CATEGORIES = {
+    "LATENCY_TICKETS": "Latency",
+    "CONNECTION_TICKETS": "Connection problems",
+    "DROPPED_TICKETS": "Dropped calls/sessions",
+    "SPEED_TICKETS": "Throughput/speed",
+    "SIGNAL_TICKETS": "Signal quality/coverage",
+}
+
+TABLE_COLUMNS = [
+    "CELL_ID", "VENDOR_NAME", "PERFORMANCE_TIER", "BID_DESCRIPTION", "PROBLEM_SCORE",
+    "TICKET_COUNT", "NEGATIVE_TICKET_COUNT", "AVG_SENTIMENT", "FAILURE_RATE", "RRC_FAILURE_RATE",
+    "AVG_LATENCY_DL", "AVG_PRB_UTIL_DL", "AVG_ERAB_ABNORMAL",
+] + list(COMPLAINT_CATEGORIES)
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Problematic Cell Towers")
+
+def build_filter(vendors, min_tickets):
+    """WHERE clause for the sidebar filters (vendor names come from the scorecard itself)"""
+    conditions = [f"TICKET_COUNT >= {int(min_tickets)}"]
+    if vendors:
+        vendor_list = ", ".join("'" + v.replace("'", "''") + "'" for v in vendors)
+        conditions.append(f"VENDOR_NAME IN ({vendor_list})")
+    return " AND ".join(conditions)
+
+@st.cache_data(ttl="10m")
+def get_vendors():
+    query = f"""
+    SELECT DISTINCT VENDOR_NAME
+    FROM {SCORECARD_VIEW}
+    WHERE VENDOR_NAME IS NOT NULL
+    ORDER BY VENDOR_NAME
+    """
+    return run_query(session, query, "get_vendors")["VENDOR_NAME"].tolist()
+
+@st.cache_data(ttl="2m")
+def get_summary(where_clause):
+    query = f"""
+    SELECT
+        COUNT(*) AS TOWER_COUNT,
+        COALESCE(SUM(TICKET_COUNT), 0) AS TICKET_COUNT,
+        COALESCE(SUM(NEGATIVE_TICKET_COUNT), 0) AS NEGATIVE_TICKET_COUNT,
+        COUNT_IF(RISK_TIER = 'HIGH') AS HIGH_RISK_TOWERS,
+        MAX(UPDATED_AT) AS LAST_REFRESH
+    FROM {SCORECARD_VIEW}
+    WHERE {where_clause}
+    """
+    return run_query(session, query, "get_summary").iloc[0]
+
+@st.cache_data(ttl="2m")
+def get_top_k(where_clause, rank_column, descending, k):
+    """Server-side top-K: Snowflake sorts and only k rows come back"""
+    query = f"""
+    SELECT CELL_ID, VENDOR_NAME, PERFORMANCE_TIER, {rank_column} AS RANK_VALUE
+    FROM {SCORECARD_VIEW}
+    WHERE {where_clause} AND {rank_column} IS NOT NULL
+    ORDER BY {rank_column} {'DESC' if descending else 'ASC'}, CELL_ID
+    LIMIT {int(k)}
+    """
+    return run_query(session, query, "get_top_k")
+
+@st.cache_data(ttl="2m")
+def get_ranked_page(where_clause, rank_column, descending, page_size, page_number):
+    """One page of the ranked scorecard (LIMIT/OFFSET evaluated in Snowflake)"""
+    query = f"""
+    SELECT {', '.join(TABLE_COLUMNS)}
+    FROM {SCORECARD_VIEW}
+    WHERE {where_clause}
+    ORDER BY {rank_column} {'DESC' if descending else 'ASC'} NULLS LAST, CELL_ID
+    LIMIT {int(page_size)} OFFSET {int(page_size) * (int(page_number) - 1)}
+    """
+    return run_query(session, query, "get_ranked_page")
+
+@st.cache_data(ttl="2m")
+def get_category_totals(where_clause):
+    totals = ", ".join(f"COALESCE(SUM({c}), 0) AS {c}" for c in COMPLAINT_CATEGORIES)
+    query = f"""
+    SELECT {totals}
+    FROM {SCORECARD_VIEW}
+    WHERE {where_clause}
+    """
+    return run_query(session, query, "get_category_totals").iloc[0]
+
+@st.cache_data(ttl="2m")
+def get_classified_categories(where_clause):
+    """Ticket counts per classified category for the towers matching the filters"""
+    query = f"""
+    SELECT
+        c.CATEGORY,
+        ANY_VALUE(k.IS_NETWORK_ISSUE) AS IS_NETWORK_ISSUE,
+        SUM(c.TICKETS) AS TICKETS,
+        SUM(c.NEGATIVE_TICKETS) AS NEGATIVE_TICKETS
+    FROM {CELL_CATEGORIES_TABLE} c
+    LEFT JOIN {CATEGORY_LIST_TABLE} k ON k.CATEGORY = c.CATEGORY
+    WHERE c.CELL_ID IN (SELECT CELL_ID FROM {SCORECARD_VIEW} WHERE {where_clause})
+    GROUP BY c.CATEGORY
+    ORDER BY TICKETS DESC
+    """
+    return run_query(session, query, "get_classified_categories")
+
+@st.cache_data(ttl="2m")
+def get_tower_categories(cell_id):
+    query = f"""
+    SELECT CATEGORY, TICKETS, NEGATIVE_TICKETS
+    FROM {CELL_CATEGORIES_TABLE}
+    WHERE CELL_ID = {int(cell_id)}
+    ORDER BY TICKETS DESC
+    """
+    return run_query(session, query, "get_tower_categories")
+
+@st.cache_data(ttl="2m")
+def get_recent_tickets(cell_id, limit=20):
+    query = f"""
+    SELECT TICKET_ID, SERVICE_TYPE, SENTIMENT_SCORE, REQUEST
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS
+    WHERE CELL_ID = {int(cell_id)}
+    ORDER BY TICKET_ID DESC
+    LIMIT {int(limit)}
+    """
+    return run_query(session, query, "get_recent_tickets")
+
+@st.cache_data(ttl="10m")
+def get_category_list():
+    query = f"SELECT CATEGORY FROM {CATEGORY_LIST_TABLE} ORDER BY CATEGORY"
+    return run_query(session, query, "get_category_list")["CATEGORY"].tolist()
+
+@st.cache_data(ttl="10m")
+def get_service_types():
+    query = f"""
+    SELECT DISTINCT SERVICE_TYPE
+    FROM {SERVICE_TYPE_CUBE}
+    WHERE SERVICE_TYPE IS NOT NULL
+    ORDER BY SERVICE_TYPE
+    """
+    return run_query(session, query, "get_service_types")["SERVICE_TYPE"].tolist()
+
+@st.cache_data(ttl="10m")
+def search_complaint_texts(search_text, category, limit):
+    """Closest distinct complaint texts from the Cortex Search service (query -> hits, cached)
+
+    The service indexes one row per distinct text, so the category filter is
+    pushed down to it; cell and service type are per ticket and are applied
+    when the hits are expanded to tickets.
+    """
+    request = {"query": search_text, "columns": ["REQUEST", "TEXT_HASH", "CATEGORY"], "limit": int(limit)}
+    if category:
+        request["filter"] = {"@eq": {"CATEGORY": category}}
+    request_json = json.dumps(request).replace("'", "''")
+    query = f"""
+    SELECT SNOWFLAKE.CORTEX.SEARCH_PREVIEW('{TICKET_SEARCH_SERVICE}', '{request_json}') AS RESULT
+    """
+    result = run_query(session, query, "search_complaint_texts")["RESULT"].iloc[0]
+    hits = pd.DataFrame(json.loads(result).get("results", []), columns=["REQUEST", "TEXT_HASH", "CATEGORY"])
+    hits.insert(0, "HIT_RANK", range(1, len(hits) + 1))
+    return hits
+
+@st.cache_data(ttl="2m")
+def get_matching_tickets(text_hashes, cell_id, service_types, page_size, page_number):
+    """One page of the tickets behind the search hits, in hit order"""
+    hit_rows = ", ".join(f"('{h}', {rank})" for rank, h in enumerate(text_hashes, start=1))
+    conditions = []
+    if cell_id:
+        conditions.append(f"k.CELL_ID = {int(cell_id)}")
+    if service_types:
+        type_list = ", ".join("'" + t.replace("'", "''") + "'" for t in service_types)
+        conditions.append(f"t.SERVICE_TYPE IN ({type_list})")
+    query = f"""
+    WITH hits AS (
+        SELECT column1 AS TEXT_HASH, column2 AS HIT_RANK
+        FROM VALUES {hit_rows}
+    )
+    SELECT h.HIT_RANK, t.TICKET_ID, k.CELL_ID, t.SERVICE_TYPE, k.CATEGORY, t.SENTIMENT_SCORE, t.REQUEST
+    FROM hits h
+    JOIN {TICKET_CATEGORIES_TABLE} k ON k.TEXT_HASH = h.TEXT_HASH
+    JOIN TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS t ON t.TICKET_ID = k.TICKET_ID
+    {"WHERE " + " AND ".join(conditions) if conditions else ""}
+    ORDER BY h.HIT_RANK, t.TICKET_ID DESC
+    LIMIT {int(page_size)} OFFSET {int(page_size) * (int(page_number) - 1)}
+    """
+    return run_query(session, query, "get_matching_tickets")
+
+def load_more_tickets():
+    search_key, page_count = st.session_state[SEARCH_PAGES_KEY]
+    st.session_state[SEARCH_PAGES_KEY] = (search_key, page_count + 1)
+
+# Sidebar options
+st.sidebar.header("Ranking Options")
+rank_by = st.sidebar.selectbox("Rank towers by", list(RANK_OPTIONS), index=0)
+rank_column, descending = RANK_OPTIONS[rank_by]
+
+try:
+    vendor_options = get_vendors()
+except Exception as e:
+    st.error(f"Could not read the tower scorecard. Run Setup/create_tower_scorecard.sql first. ({str(e)})")
+    st.stop()
+
+selected_vendors = st.sidebar.multiselect("Vendors", vendor_options, default=[])
+min_tickets = st.sidebar.number_input("Minimum support tickets", min_value=0, value=0, step=1)
+top_k = st.sidebar.slider("Top-K towers to chart", min_value=5, max_value=50, value=15, step=5)
+page_size = st.sidebar.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+
+where_clause = build_filter(selected_vendors, min_tickets)
+summary = get_summary(where_clause)
+tower_count = int(summary["TOWER_COUNT"])
+
+if tower_count == 0:
+    st.info("No towers match the current filters.")
+    render_perf_panel(session)
+    st.stop()
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Towers", f"{tower_count:,}")
+col2.metric("Support Tickets", f"{int(summary['TICKET_COUNT']):,}")
+col3.metric("Negative Tickets", f"{int(summary['NEGATIVE_TICKET_COUNT']):,}")
+col4.metric("High-Risk Towers (score ≥ 75)", f"{int(summary['HIGH_RISK_TOWERS']):,}")
+if pd.notna(summary["LAST_REFRESH"]):
+    st.caption(f"Scorecard last refreshed: {summary['LAST_REFRESH']}")
+
+tab1, tab2, tab3, tab4 = st.tabs(["🏆 Top Towers", "📋 Ranked Scorecard", "🔍 Tower Diagnosis", "🔎 Ticket Search"])
+
+with tab1:
+    st.subheader(f"Top {top_k} Towers by {rank_by}")
+    top_towers = get_top_k(where_clause, rank_column, descending, top_k)
+    if top_towers.empty:
+        st.info(f"No towers have a value for {rank_by}.")
+    else:
+        top_towers["TOWER"] = top_towers["CELL_ID"].astype(str)
+        fig = px.bar(
+            top_towers.iloc[::-1],
+            x="RANK_VALUE",
+            y="TOWER",
+            color="VENDOR_NAME",
+            orientation="h",
+            hover_data=["PERFORMANCE_TIER"],
+            labels={"RANK_VALUE": rank_by, "TOWER": "Cell ID", "VENDOR_NAME": "Vendor"},
+            height=max(400, 26 * len(top_towers))
+        )
+        fig.update_yaxes(type="category")
+        with timed("chart_render", "top_k"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Complaint Categories")
+    categories = get_category_totals(where_clause)
+    category_df = pd.DataFrame({
+        "Category": [COMPLAINT_CATEGORIES[c] for c in COMPLAINT_CATEGORIES],
+        "Tickets": [int(categories[c]) for c in COMPLAINT_CATEGORIES],
+    }).sort_values("Tickets", ascending=False)
+    fig = px.bar(category_df, x="Category", y="Tickets", color="Category")
+    fig.update_layout(showlegend=False)
+    with timed("chart_render", "complaint_categories"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption("Categories are keyword matches on the ticket REQUEST text; a ticket can fall into several.")
+
+    st.subheader("Classified Complaint Categories")
+    try:
+        classified = get_classified_categories(where_clause)
+    except Exception:
+        classified = None
+        st.info("Run Setup/create_complaint_categories.sql to label every ticket with one Cortex-classified category.")
+    if classified is not None and not classified.empty:
+        classified["Issue"] = classified["IS_NETWORK_ISSUE"].map({True: "Network", False: "Non-network"}).fillna("Other")
+        fig = px.bar(classified, x="CATEGORY", y="TICKETS", color="Issue",
+                     hover_data=["NEGATIVE_TICKETS"],
+                     labels={"CATEGORY": "Category", "TICKETS": "Tickets"})
+        with timed("chart_render", "classified_categories"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption("One category per ticket, from Cortex CLASSIFY_TEXT run once per distinct complaint text.")
+
+with tab2:
+    total_pages = max(1, -(-tower_count // page_size))
+    page_number = st.number_input(
+        f"Page (of {total_pages:,})", min_value=1, max_value=total_pages, value=1, step=1
+    )
+    ranked = get_ranked_page(where_clause, rank_column, descending, page_size, page_number)
+    ranked.insert(0, "RANK", range((page_number - 1) * page_size + 1, (page_number - 1) * page_size + 1 + len(ranked)))
+    st.dataframe(
+        ranked,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "PROBLEM_SCORE": st.column_config.ProgressColumn("Problem Score", min_value=0, max_value=100, format="%.1f"),
+            "AVG_SENTIMENT": st.column_config.NumberColumn("Avg Sentiment", format="%.2f"),
+            "FAILURE_RATE": st.column_config.NumberColumn("Failure Rate %", format="%.2f"),
+            "RRC_FAILURE_RATE": st.column_config.NumberColumn("RRC Failure %", format="%.2f"),
+            "AVG_LATENCY_DL": st.column_config.NumberColumn("DL Latency (ms)", format="%.2f"),
+        }
+    )
+    st.caption(f"Showing towers {(page_number - 1) * page_size + 1:,}–{(page_number - 1) * page_size + len(ranked):,} of {tower_count:,}")
+
+with tab3:
+    page_cells = ranked["CELL_ID"].tolist()
+    if not page_cells:
+        st.info("No towers on the current scorecard page.")
+    else:
+        cell_id = st.selectbox("Tower (from the current scorecard page)", page_cells)
+        tower = ranked[ranked["CELL_ID"] == cell_id].iloc[0]
+
+        st.subheader(f"Cell {cell_id} — {tower['VENDOR_NAME']} ({tower['PERFORMANCE_TIER']})")
+        st.write(tower["BID_DESCRIPTION"])
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Problem Score", f"{tower['PROBLEM_SCORE']:.1f}")
+        col2.metric("Tickets", f"{int(tower['TICKET_COUNT']):,}")
+        col3.metric("Avg Sentiment", "n/a" if pd.isna(tower["AVG_SENTIMENT"]) else f"{tower['AVG_SENTIMENT']:.2f}")
+        col4.metric("RRC Failure", "n/a" if pd.isna(tower["RRC_FAILURE_RATE"]) else f"{tower['RRC_FAILURE_RATE']:.1f}%")
+        col5.metric("DL Latency", "n/a" if pd.isna(tower["AVG_LATENCY_DL"]) else f"{tower['AVG_LATENCY_DL']:.1f} ms")
+
+        tower_categories = pd.DataFrame({
+            "Category": [COMPLAINT_CATEGORIES[c] for c in COMPLAINT_CATEGORIES],
+            "Tickets": [int(tower[c]) for c in COMPLAINT_CATEGORIES],
+        })
+        st.bar_chart(tower_categories, x="Category", y="Tickets")
+
+        try:
+            classified_tower = get_tower_categories(cell_id)
+        except Exception:
+            classified_tower = None
+        if classified_tower is not None and not classified_tower.empty:
+            st.markdown("**Classified categories**")
+            st.dataframe(classified_tower, use_container_width=True, hide_index=True)
+
+        st.subheader("Recent Support Tickets")
+        st.dataframe(get_recent_tickets(cell_id), use_container_width=True, hide_index=True)
+
+with tab4:
+    st.subheader("Find Similar Complaints")
+    search_text = st.text_input("Describe the complaint", placeholder="e.g. video keeps buffering in the evening")
+    col1, col2, col3 = st.columns(3)
+    try:
+        category_options = get_category_list()
+        type_options = get_service_types()
+    except Exception:
+        category_options, type_options = [], []
+    search_category = col1.selectbox("Category", ["All"] + category_options)
+    search_cell = col2.number_input("Cell ID (0 = all cells)", min_value=0, value=0, step=1)
+    search_types = col3.multiselect("Service types", type_options, default=[])
+
+    if search_text.strip():
+        try:
+            hits = search_complaint_texts(search_text.strip(), None if search_category == "All" else search_category,
+                                          SEARCH_TEXT_LIMIT)
+        except Exception as e:
+            hits = None
+            st.error(f"Ticket search failed: {str(e)}")
+            st.info("Run CortexSearch/create_cortex_searches.sql (after Setup/create_complaint_categories.sql) "
+                    "and make sure the search services are resumed.")
+
+        if hits is not None and hits.empty:
+            st.info("No similar complaint texts found.")
+        elif hits is not None:
+            # Tickets are fetched a page at a time; a new search or filter starts again at one page
+            search_key = (search_text.strip(), search_category, int(search_cell), tuple(search_types))
+            pages = st.session_state.get(SEARCH_PAGES_KEY)
+            if pages is None or pages[0] != search_key:
+                pages = (search_key, 1)
+                st.session_state[SEARCH_PAGES_KEY] = pages
+            text_hashes = tuple(hits["TEXT_HASH"])
+            ticket_pages = [
+                get_matching_tickets(text_hashes, int(search_cell), tuple(search_types), SEARCH_PAGE_SIZE, n)
+                for n in range(1, pages[1] + 1)
+            ]
+            tickets = pd.concat(ticket_pages, ignore_index=True)
 
-This page will identify and diagnose problematic cell towers by analyzing:
+            st.caption(f"{len(hits)} similar complaint texts, {len(tickets):,} matching tickets loaded.")
+            st.dataframe(
+                tickets,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "HIT_RANK": st.column_config.NumberColumn("Match", help="Rank of the complaint text in the search results"),
+                    "SENTIMENT_SCORE": st.column_config.NumberColumn("Sentiment", format="%.2f"),
+                }
+            )
+            if len(ticket_pages[-1]) == SEARCH_PAGE_SIZE:
+                st.button("Load more tickets", on_click=load_more_tickets)
 
-- High ticket volume areas to find CELL_IDs with unusually high support ticket counts
-- Negative sentiment scores to pinpoint towers associated with dissatisfied customers
-- Specific complaint categories by parsing the REQUEST field to identify common issues
-- Performance metrics linked to customer complaints by joining SUPPORT_TICKETS with CELL_TOWER data
+            with st.expander("Matched complaint texts"):
+                st.dataframe(hits, use_container_width=True, hide_index=True)
 
-The analysis will focus on latency issues, connection problems, dropped calls/sessions, throughput/speed problems, and signal quality issues to help technicians quickly identify and address the most problematic cell towers.
-""") 
\ No newline at end of file
+# Stage timings for this run
+render_perf_panel(session)
@@ -0,0 +1,168 @@
+import streamlit as st
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+from utils.query_tags import APP_NAME
+
+# Page configuration - must be the first Streamlit command
+st.set_page_config(
+    page_title="Query Cost Attribution",
+    page_icon="💰",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.title("💰 Query Cost Attribution (Admin)")
+st.markdown("""
+Every query issued by this app carries a structured `QUERY_TAG` (page, widget, user).
+This page reads `SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY` for those tags and ranks dashboard interactions
+by elapsed time, bytes scanned and credits, so optimization work goes to the real hot spots.
+
+*Account usage views lag by up to 45 minutes and require IMPORTED PRIVILEGES on the SNOWFLAKE database.*
+""")
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Query Cost Attribution")
+
+# Sidebar options
+st.sidebar.header("Attribution Options")
+lookback_days = st.sidebar.slider("Lookback (days)", min_value=1, max_value=30, value=7)
+rank_by = st.sidebar.selectbox(
+    "Rank interactions by",
+    ["Total Elapsed (s)", "Bytes Scanned", "Compute Credits", "Query Count"],
+    index=0
+)
+top_n = st.sidebar.slider("Interactions to show", min_value=5, max_value=50, value=15, step=5)
+
+# Fetch per-interaction totals for the app's tagged queries
+@st.cache_data(ttl="15m")
+def get_interaction_costs(days):
+    query = f"""
+    WITH tagged AS (
+        SELECT
+            q.query_id,
+            TRY_PARSE_JSON(q.query_tag) AS tag,
+            q.total_elapsed_time,
+            q.bytes_scanned,
+            q.credits_used_cloud_services
+        FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY q
+        WHERE q.start_time >= DATEADD(DAY, -{int(days)}, CURRENT_TIMESTAMP())
+          AND q.query_tag LIKE '%{APP_NAME}%'
+    )
+    SELECT
+        t.tag:page::STRING AS page,
+        t.tag:widget::STRING AS widget,
+        COUNT(*) AS query_count,
+        COUNT(DISTINCT t.tag:user::STRING) AS users,
+        ROUND(SUM(t.total_elapsed_time) / 1000, 2) AS total_elapsed_s,
+        ROUND(AVG(t.total_elapsed_time) / 1000, 2) AS avg_elapsed_s,
+        SUM(t.bytes_scanned) AS bytes_scanned,
+        ROUND(SUM(COALESCE(a.credits_attributed_compute, 0)), 6) AS compute_credits,
+        ROUND(SUM(t.credits_used_cloud_services), 6) AS cloud_services_credits
+    FROM tagged t
+    LEFT JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_ATTRIBUTION_HISTORY a
+        ON a.query_id = t.query_id
+    WHERE t.tag:app::STRING = '{APP_NAME}'
+    GROUP BY page, widget
+    """
+    df = run_query(session, query, "get_interaction_costs")
+    # Convert column names to lowercase for consistent access
+    df.columns = df.columns.str.lower()
+    return df
+
+# Fetch the slowest individual tagged queries
+@st.cache_data(ttl="15m")
+def get_slowest_queries(days, limit=25):
+    query = f"""
+    SELECT
+        q.query_id,
+        q.start_time,
+        TRY_PARSE_JSON(q.query_tag):page::STRING AS page,
+        TRY_PARSE_JSON(q.query_tag):widget::STRING AS widget,
+        TRY_PARSE_JSON(q.query_tag):user::STRING AS app_user,
+        q.warehouse_name,
+        ROUND(q.total_elapsed_time / 1000, 2) AS elapsed_s,
+        q.bytes_scanned,
+        q.execution_status
+    FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY q
+    WHERE q.start_time >= DATEADD(DAY, -{int(days)}, CURRENT_TIMESTAMP())
+      AND q.query_tag LIKE '%{APP_NAME}%'
+    ORDER BY q.total_elapsed_time DESC
+    LIMIT {int(limit)}
+    """
+    df = run_query(session, query, "get_slowest_queries")
+    df.columns = df.columns.str.lower()
+    return df
+
+try:
+    interaction_costs = get_interaction_costs(lookback_days)
+    slowest_queries = get_slowest_queries(lookback_days)
+except Exception as e:
+    st.error(f"Could not read QUERY_HISTORY: {str(e)}")
+    st.stop()
+
+if interaction_costs.empty:
+    st.info(f"No tagged queries found in the last {lookback_days} day(s). Account usage data can take up to 45 minutes to appear.")
+    render_perf_panel(session)
+    st.stop()
+
+rank_column = {
+    "Total Elapsed (s)": "total_elapsed_s",
+    "Bytes Scanned": "bytes_scanned",
+    "Compute Credits": "compute_credits",
+    "Query Count": "query_count",
+}[rank_by]
+
+interaction_costs['interaction'] = interaction_costs['page'] + " › " + interaction_costs['widget']
+ranked = interaction_costs.sort_values(by=rank_column, ascending=False)
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Tagged Queries", f"{int(interaction_costs['query_count'].sum()):,}")
+col2.metric("Total Elapsed", f"{interaction_costs['total_elapsed_s'].sum():,.0f} s")
+col3.metric("Bytes Scanned", f"{interaction_costs['bytes_scanned'].sum() / 1e9:,.2f} GB")
+col4.metric("Compute Credits", f"{interaction_costs['compute_credits'].sum():,.4f}")
+
+tab1, tab2, tab3 = st.tabs(["🏆 Hot Spots", "📄 By Page", "🐢 Slowest Queries"])
+
+with tab1:
+    st.subheader(f"Top {top_n} Interactions by {rank_by}")
+    top_interactions = ranked.head(top_n)
+    fig = px.bar(
+        top_interactions.iloc[::-1],
+        x=rank_column,
+        y='interaction',
+        color='page',
+        orientation='h',
+        labels={rank_column: rank_by, 'interaction': ''},
+        height=max(400, 28 * len(top_interactions))
+    )
+    with timed("chart_render", "hot_spots"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(
+        top_interactions[['page', 'widget', 'query_count', 'users', 'total_elapsed_s',
+                          'avg_elapsed_s', 'bytes_scanned', 'compute_credits', 'cloud_services_credits']],
+        use_container_width=True,
+        hide_index=True
+    )
+
+with tab2:
+    st.subheader("Totals by Page")
+    by_page = interaction_costs.groupby('page', as_index=False)[
+        ['query_count', 'total_elapsed_s', 'bytes_scanned', 'compute_credits']
+    ].sum().sort_values(by=rank_column, ascending=False)
+    st.dataframe(by_page, use_container_width=True, hide_index=True)
+    st.caption("Cached loads never reach the warehouse, so only cache misses and uncached queries are counted here. "
+               "See the Cache Manager page for hit rates.")
+
+with tab3:
+    st.subheader("Slowest Individual Queries")
+    st.dataframe(slowest_queries, use_container_width=True, hide_index=True)
+
+# Stage timings for this run
+render_perf_panel(session)
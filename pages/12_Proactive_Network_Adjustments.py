@@ -0,0 +1,236 @@
+import streamlit as st
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+
+# Page configuration - must be the first Streamlit command
+st.set_page_config(
+    page_title="Proactive Network Adjustments",
+    page_icon="🚨",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.title("🚨 Proactive Network Adjustments")
+st.markdown("""
+Early warnings for cells whose latest hour breaks from their own recent behaviour, before the complaints arrive.
+
+Alerts come from `RAW.NETWORK_ALERTS`, written by a detection task as each generated hour lands. Each cell keeps
+an exponentially weighted baseline per metric; an hour is flagged when its robust z-score against that baseline
+reaches 3 (**WARNING**) or 5 (**CRITICAL**).
+""")
+
+ALERTS_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.NETWORK_ALERTS"
+STATE_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_ANOMALY_STATE"
+DIM_CELL_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL"
+
+METRIC_LABELS = {
+    "FAILURE_RATE": "Call Failure Rate (%)",
+    "LATENCY_DL": "PDCP DL Latency",
+    "PRB_UTIL_DL": "PRB Utilization DL (%)",
+    "ERAB_ABNORMAL": "E-RAB Abnormal Releases",
+}
+SEVERITIES = ["CRITICAL", "WARNING"]
+SEVERITY_COLORS = {"CRITICAL": "#d62728", "WARNING": "#ff7f0e"}
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Proactive Network Adjustments")
+
+def build_filter(lookback_hours, severities, metrics, vendors):
+    """WHERE clause on the alerts (a) and DIM_CELL (d) for the sidebar filters"""
+    conditions = [
+        f"a.PERIOD_START > DATEADD('HOUR', -{int(lookback_hours)}, (SELECT MAX(PERIOD_START) FROM {ALERTS_TABLE}))"
+    ]
+    for column, values in (("a.SEVERITY", severities), ("a.METRIC", metrics), ("d.VENDOR_NAME", vendors)):
+        if values:
+            value_list = ", ".join("'" + v.replace("'", "''") + "'" for v in values)
+            conditions.append(f"{column} IN ({value_list})")
+    return " AND ".join(conditions)
+
+@st.cache_data(ttl="10m")
+def get_vendors():
+    query = f"""
+    SELECT DISTINCT VENDOR_NAME
+    FROM {DIM_CELL_TABLE}
+    WHERE VENDOR_NAME IS NOT NULL
+    ORDER BY VENDOR_NAME
+    """
+    return run_query(session, query, "get_vendors")["VENDOR_NAME"].tolist()
+
+@st.cache_data(ttl="1m")
+def get_summary(where_clause):
+    query = f"""
+    WITH per_cell AS (
+        SELECT
+            a.CELL_ID,
+            COUNT(*) AS ALERTS,
+            COUNT_IF(a.SEVERITY = 'CRITICAL') AS CRITICAL_ALERTS,
+            COUNT(DISTINCT a.METRIC) AS METRICS_ALERTING,
+            MAX(a.PERIOD_START) AS LATEST_HOUR,
+            MAX(a.DETECTED_AT) AS LAST_DETECTION
+        FROM {ALERTS_TABLE} a
+        LEFT JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = a.CELL_ID
+        WHERE {where_clause}
+        GROUP BY a.CELL_ID
+    )
+    SELECT
+        COALESCE(SUM(ALERTS), 0) AS ALERTS,
+        COALESCE(SUM(CRITICAL_ALERTS), 0) AS CRITICAL_ALERTS,
+        COUNT(CELL_ID) AS CELLS,
+        COUNT_IF(CELL_ID IS NOT NULL AND METRICS_ALERTING > 1) AS MULTI_METRIC_CELLS,
+        MAX(LATEST_HOUR) AS LATEST_HOUR,
+        MAX(LAST_DETECTION) AS LAST_DETECTION
+    FROM per_cell
+    """
+    return run_query(session, query, "get_summary").iloc[0]
+
+@st.cache_data(ttl="1m")
+def get_alerting_cells(where_clause, limit=200):
+    """Cells ranked by how many metrics alerted and how far they broke from baseline"""
+    query = f"""
+    SELECT
+        a.CELL_ID,
+        ANY_VALUE(d.VENDOR_NAME) AS VENDOR_NAME,
+        ANY_VALUE(d.REGION) AS REGION,
+        COUNT(DISTINCT a.METRIC) AS METRICS_ALERTING,
+        COUNT(*) AS ALERTS,
+        COUNT_IF(a.SEVERITY = 'CRITICAL') AS CRITICAL_ALERTS,
+        MAX(a.Z_SCORE) AS MAX_Z_SCORE,
+        MAX(a.PERIOD_START) AS LAST_ALERT_HOUR
+    FROM {ALERTS_TABLE} a
+    LEFT JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = a.CELL_ID
+    WHERE {where_clause}
+    GROUP BY a.CELL_ID
+    ORDER BY METRICS_ALERTING DESC, CRITICAL_ALERTS DESC, MAX_Z_SCORE DESC, a.CELL_ID
+    LIMIT {int(limit)}
+    """
+    return run_query(session, query, "get_alerting_cells")
+
+@st.cache_data(ttl="1m")
+def get_alert_timeline(where_clause):
+    query = f"""
+    SELECT a.PERIOD_START, a.METRIC, COUNT(*) AS ALERTS
+    FROM {ALERTS_TABLE} a
+    LEFT JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = a.CELL_ID
+    WHERE {where_clause}
+    GROUP BY a.PERIOD_START, a.METRIC
+    ORDER BY a.PERIOD_START
+    """
+    return run_query(session, query, "get_alert_timeline")
+
+@st.cache_data(ttl="1m")
+def get_cell_alerts(cell_id, where_clause):
+    query = f"""
+    SELECT a.PERIOD_START, a.METRIC, a.OBSERVED_VALUE, a.EXPECTED_VALUE, a.Z_SCORE, a.SEVERITY
+    FROM {ALERTS_TABLE} a
+    LEFT JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = a.CELL_ID
+    WHERE a.CELL_ID = {int(cell_id)} AND {where_clause}
+    ORDER BY a.PERIOD_START DESC, a.Z_SCORE DESC
+    """
+    return run_query(session, query, "get_cell_alerts")
+
+@st.cache_data(ttl="1m")
+def get_cell_baseline(cell_id):
+    query = f"""
+    SELECT METRIC, ROUND(EWMA_MEAN, 3) AS BASELINE, ROUND(1.2533 * EWMA_ABS_DEV, 3) AS TYPICAL_SPREAD,
+           HOURS_SEEN, LAST_PERIOD_START
+    FROM {STATE_TABLE}
+    WHERE CELL_ID = {int(cell_id)}
+    ORDER BY METRIC
+    """
+    return run_query(session, query, "get_cell_baseline")
+
+# Sidebar options
+st.sidebar.header("Alert Options")
+lookback_hours = st.sidebar.slider("Hours to show", min_value=1, max_value=168, value=24, step=1)
+selected_severities = st.sidebar.multiselect("Severity", SEVERITIES, default=[])
+selected_metrics = st.sidebar.multiselect(
+    "Metrics", list(METRIC_LABELS), default=[], format_func=lambda m: METRIC_LABELS[m]
+)
+
+try:
+    vendor_options = get_vendors()
+except Exception as e:
+    st.error(f"Could not read RAW.DIM_CELL. Run Setup/setup_data_generators.sql first. ({str(e)})")
+    render_perf_panel(session)
+    st.stop()
+selected_vendors = st.sidebar.multiselect("Vendors", vendor_options, default=[])
+
+where_clause = build_filter(lookback_hours, selected_severities, selected_metrics, selected_vendors)
+
+try:
+    summary = get_summary(where_clause)
+except Exception as e:
+    st.error(f"Could not read the alerts table: {str(e)}")
+    st.info("Run Setup/create_anomaly_detection.sql to create the detector and `RAW.NETWORK_ALERTS`.")
+    render_perf_panel(session)
+    st.stop()
+
+if int(summary["ALERTS"]) == 0:
+    st.success("No alerts in the selected window. Resume RAW.TASK_DETECT_ANOMALIES to score new hours as they land.")
+    render_perf_panel(session)
+    st.stop()
+
+alerting_cells = get_alerting_cells(where_clause)
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Alerts", f"{int(summary['ALERTS']):,}")
+col2.metric("Critical Alerts", f"{int(summary['CRITICAL_ALERTS']):,}")
+col3.metric("Cells Alerting", f"{int(summary['CELLS']):,}")
+col4.metric("Cells Alerting on 2+ Metrics", f"{int(summary['MULTI_METRIC_CELLS']):,}")
+st.caption(f"Latest alerted hour: {summary['LATEST_HOUR']} · last detection run: {summary['LAST_DETECTION']}")
+
+tab1, tab2, tab3 = st.tabs(["📋 Alerting Cells", "📈 Alert Timeline", "🔍 Cell Drilldown"])
+
+with tab1:
+    st.subheader("Cells to Look at First")
+    st.caption("Ranked by the number of metrics alerting, then critical alerts and the largest z-score.")
+    st.dataframe(
+        alerting_cells,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "MAX_Z_SCORE": st.column_config.NumberColumn("Max Z-Score", format="%.1f"),
+        }
+    )
+
+with tab2:
+    st.subheader("Alerts per Hour")
+    timeline = get_alert_timeline(where_clause)
+    timeline["METRIC"] = timeline["METRIC"].map(METRIC_LABELS).fillna(timeline["METRIC"])
+    fig = px.bar(timeline, x="PERIOD_START", y="ALERTS", color="METRIC",
+                 labels={"PERIOD_START": "Hour", "ALERTS": "Alerts", "METRIC": "Metric"})
+    with timed("chart_render", "alert_timeline"):
+        st.plotly_chart(fig, use_container_width=True)
+
+with tab3:
+    st.subheader("Cell Drilldown")
+    selected_cell = st.selectbox("Cell", alerting_cells["CELL_ID"].tolist())
+    if selected_cell is not None:
+        cell_alerts = get_cell_alerts(selected_cell, where_clause)
+        cell_alerts["METRIC_LABEL"] = cell_alerts["METRIC"].map(METRIC_LABELS).fillna(cell_alerts["METRIC"])
+        fig = px.scatter(cell_alerts, x="PERIOD_START", y="Z_SCORE", color="SEVERITY", symbol="METRIC_LABEL",
+                         color_discrete_map=SEVERITY_COLORS,
+                         hover_data=["OBSERVED_VALUE", "EXPECTED_VALUE"],
+                         labels={"PERIOD_START": "Hour", "Z_SCORE": "Z-Score", "METRIC_LABEL": "Metric"})
+        fig.add_hline(y=3, line_dash="dash", line_color=SEVERITY_COLORS["WARNING"])
+        fig.add_hline(y=5, line_dash="dash", line_color=SEVERITY_COLORS["CRITICAL"])
+        with timed("chart_render", "cell_alerts"):
+            st.plotly_chart(fig, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Alerts**")
+            st.dataframe(cell_alerts.drop(columns=["METRIC_LABEL"]), use_container_width=True, hide_index=True)
+        with col2:
+            st.markdown("**Current baseline**")
+            st.dataframe(get_cell_baseline(selected_cell), use_container_width=True, hide_index=True)
+
+# Stage timings for this run
+render_perf_panel(session)
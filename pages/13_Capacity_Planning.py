@@ -0,0 +1,251 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+
+# Page configuration - must be the first Streamlit command
+st.set_page_config(
+    page_title="Capacity Planning",
+    page_icon="📶",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.title("📶 Capacity Planning")
+st.markdown("""
+Find the cells that will run out of radio capacity, and when, before they start dropping customers.
+
+Each cell has a small seasonal model (level, trend and daily cycle) per metric, fitted in batch by a task
+(`Setup/create_capacity_forecast.sql`). This page only reads the cached results from `RAW.CAPACITY_SUMMARY` and
+`RAW.CAPACITY_FORECAST`; nothing is fitted while you browse.
+""")
+
+SUMMARY_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CAPACITY_SUMMARY"
+FORECAST_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CAPACITY_FORECAST"
+DIM_CELL_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL"
+
+# Forecast metric -> (label, CELL_TOWER expression for the hourly history)
+METRICS = {
+    "PRB_UTIL_DL": ("PRB Utilization DL (%)", "AVG(PM_PRB_UTIL_DL)"),
+    "PRB_UTIL_UL": ("PRB Utilization UL (%)", "AVG(PM_PRB_UTIL_UL)"),
+    "RRC_CONN_MAX": ("Max RRC Connections", "MAX(PM_RRC_CONN_MAX)"),
+}
+
+# Saturation thresholds used by SP_REFRESH_CAPACITY_FORECAST
+SATURATION_THRESHOLDS = {"PRB_UTIL_DL": 85, "PRB_UTIL_UL": 85, "RRC_CONN_MAX": 1200}
+
+# Days of hourly history drawn behind a cell's forecast
+HISTORY_DAYS = 7
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Capacity Planning")
+
+def build_filter(metric, vendors, regions):
+    """WHERE clause on the summary (s) and DIM_CELL (d) for the sidebar filters"""
+    conditions = [f"s.METRIC = '{metric}'"]
+    for column, values in (("d.VENDOR_NAME", vendors), ("d.REGION", regions)):
+        if values:
+            value_list = ", ".join("'" + v.replace("'", "''") + "'" for v in values)
+            conditions.append(f"{column} IN ({value_list})")
+    return " AND ".join(conditions)
+
+@st.cache_data(ttl="10m")
+def get_dimension_values(column):
+    query = f"""
+    SELECT DISTINCT {column} AS VALUE
+    FROM {DIM_CELL_TABLE}
+    WHERE {column} IS NOT NULL
+    ORDER BY VALUE
+    """
+    return run_query(session, query, "get_dimension_values")["VALUE"].tolist()
+
+@st.cache_data(ttl="10m")
+def get_summary(where_clause, horizon_hours):
+    query = f"""
+    SELECT
+        COUNT(*) AS MODELS,
+        COUNT_IF(s.HOURS_TO_SATURATION = 0) AS SATURATED_NOW,
+        COUNT_IF(s.HOURS_TO_SATURATION > 0 AND s.HOURS_TO_SATURATION <= {int(horizon_hours)}) AS SATURATING,
+        COUNT_IF(s.TREND_PER_DAY > 0) AS GROWING,
+        MAX(s.FITTED_AT) AS FITTED_AT
+    FROM {SUMMARY_TABLE} s
+    LEFT JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = s.CELL_ID
+    WHERE {where_clause}
+    """
+    return run_query(session, query, "get_summary").iloc[0]
+
+@st.cache_data(ttl="10m")
+def get_at_risk_cells(where_clause, horizon_hours, limit):
+    """Cells saturated now or forecast to saturate within the horizon, soonest first"""
+    query = f"""
+    SELECT
+        s.CELL_ID,
+        d.VENDOR_NAME,
+        d.REGION,
+        s.CURRENT_PEAK,
+        s.FORECAST_PEAK,
+        s.SATURATION_THRESHOLD,
+        s.TREND_PER_DAY,
+        s.HOURS_TO_SATURATION,
+        s.SATURATION_AT,
+        s.RMSE
+    FROM {SUMMARY_TABLE} s
+    LEFT JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = s.CELL_ID
+    WHERE {where_clause}
+      AND s.HOURS_TO_SATURATION <= {int(horizon_hours)}
+    ORDER BY s.HOURS_TO_SATURATION, s.TREND_PER_DAY DESC, s.CELL_ID
+    LIMIT {int(limit)}
+    """
+    return run_query(session, query, "get_at_risk_cells")
+
+@st.cache_data(ttl="10m")
+def get_risk_by_region(where_clause, horizon_hours):
+    query = f"""
+    SELECT
+        COALESCE(d.REGION, 'Unknown') AS REGION,
+        COUNT_IF(s.HOURS_TO_SATURATION = 0) AS SATURATED_NOW,
+        COUNT_IF(s.HOURS_TO_SATURATION > 0 AND s.HOURS_TO_SATURATION <= {int(horizon_hours)}) AS SATURATING
+    FROM {SUMMARY_TABLE} s
+    LEFT JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = s.CELL_ID
+    WHERE {where_clause}
+    GROUP BY REGION
+    HAVING SATURATED_NOW + SATURATING > 0
+    ORDER BY SATURATED_NOW + SATURATING DESC
+    """
+    return run_query(session, query, "get_risk_by_region")
+
+@st.cache_data(ttl="10m")
+def get_cell_forecast(cell_id, metric):
+    query = f"""
+    SELECT FORECAST_DAY, PEAK_FORECAST, PEAK_LOWER, PEAK_UPPER
+    FROM {FORECAST_TABLE}
+    WHERE CELL_ID = {int(cell_id)} AND METRIC = '{metric}'
+    ORDER BY FORECAST_DAY
+    """
+    return run_query(session, query, "get_cell_forecast")
+
+@st.cache_data(ttl="10m")
+def get_cell_history(cell_id, metric):
+    """Daily busy-hour peak of the last HISTORY_DAYS days, to compare with the forecast peaks"""
+    query = f"""
+    WITH hourly AS (
+        SELECT DATE_TRUNC('HOUR', TIMESTAMP) AS PERIOD_START, {METRICS[metric][1]} AS VALUE
+        FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
+        WHERE CELL_ID = {int(cell_id)}
+          AND TIMESTAMP >= (SELECT DATEADD('DAY', -{HISTORY_DAYS}, MAX(TIMESTAMP)) FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER)
+        GROUP BY PERIOD_START
+    )
+    SELECT PERIOD_START::DATE AS DAY, MAX(VALUE) AS PEAK
+    FROM hourly
+    GROUP BY DAY
+    ORDER BY DAY
+    """
+    return run_query(session, query, "get_cell_history")
+
+# Sidebar options
+st.sidebar.header("Capacity Options")
+metric = st.sidebar.selectbox("Metric", list(METRICS), format_func=lambda m: METRICS[m][0])
+horizon_days = st.sidebar.slider("Planning horizon (days)", min_value=1, max_value=14, value=14, step=1)
+horizon_hours = horizon_days * 24
+top_k = st.sidebar.slider("Cells to list", min_value=10, max_value=200, value=50, step=10)
+
+try:
+    selected_vendors = st.sidebar.multiselect("Vendors", get_dimension_values("VENDOR_NAME"))
+    selected_regions = st.sidebar.multiselect("Regions", get_dimension_values("REGION"))
+except Exception as e:
+    st.error(f"Could not read RAW.DIM_CELL. Run Setup/setup_data_generators.sql first. ({str(e)})")
+    render_perf_panel(session)
+    st.stop()
+
+where_clause = build_filter(metric, selected_vendors, selected_regions)
+
+try:
+    summary = get_summary(where_clause, horizon_hours)
+except Exception as e:
+    st.error(f"Could not read the capacity forecasts: {str(e)}")
+    st.info("Run Setup/create_capacity_forecast.sql to fit the models and cache the forecasts.")
+    render_perf_panel(session)
+    st.stop()
+
+if int(summary["MODELS"]) == 0:
+    st.info("No forecasts for the selected filters yet.")
+    render_perf_panel(session)
+    st.stop()
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Cells Modelled", f"{int(summary['MODELS']):,}")
+col2.metric("Saturated Now", f"{int(summary['SATURATED_NOW']):,}")
+col3.metric(f"Saturating in {horizon_days} Days", f"{int(summary['SATURATING']):,}")
+col4.metric("Growing Demand", f"{int(summary['GROWING']):,}")
+st.caption(f"Models last fitted: {summary['FITTED_AT']}")
+
+tab1, tab2, tab3 = st.tabs(["🚧 At-Risk Cells", "🗺️ By Region", "🔍 Cell Forecast"])
+
+at_risk = get_at_risk_cells(where_clause, horizon_hours, top_k)
+
+with tab1:
+    st.subheader(f"Cells Reaching {METRICS[metric][0]} Saturation")
+    if at_risk.empty:
+        st.success(f"No cells are forecast to saturate within {horizon_days} days.")
+    else:
+        st.dataframe(
+            at_risk,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "CURRENT_PEAK": st.column_config.NumberColumn("Current Peak", format="%.1f"),
+                "FORECAST_PEAK": st.column_config.NumberColumn("Forecast Peak", format="%.1f"),
+                "TREND_PER_DAY": st.column_config.NumberColumn("Trend / Day", format="%.2f"),
+                "HOURS_TO_SATURATION": st.column_config.NumberColumn("Hours to Saturation", format="%d"),
+            }
+        )
+        st.caption("Hours to saturation is 0 when the busy hour of the last day already reached the threshold.")
+
+with tab2:
+    st.subheader("Capacity Risk by Region")
+    by_region = get_risk_by_region(where_clause, horizon_hours)
+    if by_region.empty:
+        st.success("No region has cells at risk within the horizon.")
+    else:
+        chart_data = by_region.melt(id_vars=["REGION"], value_vars=["SATURATED_NOW", "SATURATING"],
+                                    var_name="STATUS", value_name="CELLS")
+        chart_data["STATUS"] = chart_data["STATUS"].map({"SATURATED_NOW": "Saturated now", "SATURATING": "Saturating"})
+        fig = px.bar(chart_data, x="REGION", y="CELLS", color="STATUS", barmode="stack",
+                     color_discrete_map={"Saturated now": "#d62728", "Saturating": "#ff7f0e"},
+                     labels={"REGION": "Region", "CELLS": "Cells", "STATUS": ""})
+        with timed("chart_render", "risk_by_region"):
+            st.plotly_chart(fig, use_container_width=True)
+
+with tab3:
+    st.subheader("Cell Forecast")
+    default_cell = int(at_risk["CELL_ID"].iloc[0]) if not at_risk.empty else 0
+    cell_id = st.number_input("Cell ID", min_value=0, value=default_cell, step=1)
+    forecast = get_cell_forecast(cell_id, metric)
+    if forecast.empty:
+        st.info("No forecast for this cell (it needs at least 48 hours of history).")
+    else:
+        history = get_cell_history(cell_id, metric)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=forecast["FORECAST_DAY"], y=forecast["PEAK_UPPER"], mode="lines",
+                                 line=dict(width=0), showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=forecast["FORECAST_DAY"], y=forecast["PEAK_LOWER"], mode="lines",
+                                 line=dict(width=0), fill="tonexty", fillcolor="rgba(31,119,180,0.2)",
+                                 name="95% band"))
+        fig.add_trace(go.Scatter(x=forecast["FORECAST_DAY"], y=forecast["PEAK_FORECAST"], mode="lines+markers",
+                                 name="Forecast peak", line=dict(color="#1f77b4", dash="dash")))
+        fig.add_trace(go.Scatter(x=history["DAY"], y=history["PEAK"], mode="lines+markers",
+                                 name="Observed peak", line=dict(color="#2ca02c")))
+        fig.add_hline(y=SATURATION_THRESHOLDS[metric], line_dash="dot", line_color="#d62728", annotation_text="Saturation")
+        fig.update_layout(yaxis_title=METRICS[metric][0], xaxis_title="Day", height=500)
+        with timed("chart_render", "cell_forecast"):
+            st.plotly_chart(fig, use_container_width=True)
+
+# Stage timings for this run
+render_perf_panel(session)
@@ -0,0 +1,262 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+
+# Page configuration - must be the first Streamlit command
+st.set_page_config(
+    page_title="Root Cause Analysis",
+    page_icon="🧭",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.title("🧭 Root Cause Analysis for Complaints")
+st.markdown("""
+See what the network was doing on a ticket's cell when the customer complained.
+
+Each ticket is compared, over the 6 hours up to its complaint hour, with the week before on the same cell: which KPI
+moved furthest from normal and which failure cause codes became more frequent. The analysis is precomputed per
+ticket by a task (`RAW.TICKET_RCA`, `RAW.TICKET_RCA_DETAIL`), so looking a ticket up is a single keyed read.
+""")
+
+RCA_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TICKET_RCA"
+DETAIL_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TICKET_RCA_DETAIL"
+TICKETS_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS"
+
+METRIC_LABELS = {
+    "FAILURE_RATE": "Call Failure Rate (%)",
+    "RRC_FAILURE_RATE": "RRC Setup Failure Rate (%)",
+    "LATENCY_DL": "PDCP DL Latency",
+    "PRB_UTIL_DL": "PRB Utilization DL (%)",
+    "ERAB_ABNORMAL": "E-RAB Abnormal Releases",
+}
+
+# Finding prefixes written by SP_REFRESH_TICKET_RCA -> category shown on the page
+FINDING_CATEGORIES = {
+    "Network degradation": "Network degradation",
+    "Unusual failures": "Unusual failure causes",
+    "No network anomaly": "No network anomaly",
+    "No measurements": "No measurements",
+}
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Root Cause Analysis")
+
+def finding_category_sql():
+    cases = " ".join(
+        f"WHEN STARTSWITH(r.FINDING, '{prefix}') THEN '{label}'" for prefix, label in FINDING_CATEGORIES.items()
+    )
+    return f"CASE {cases} ELSE 'Other' END"
+
+def build_filter(categories, service_types):
+    conditions = ["1 = 1"]
+    if categories:
+        category_list = ", ".join("'" + c.replace("'", "''") + "'" for c in categories)
+        conditions.append(f"{finding_category_sql()} IN ({category_list})")
+    if service_types:
+        type_list = ", ".join("'" + s.replace("'", "''") + "'" for s in service_types)
+        conditions.append(f"t.SERVICE_TYPE IN ({type_list})")
+    return " AND ".join(conditions)
+
+@st.cache_data(ttl="10m")
+def get_service_types():
+    query = f"""
+    SELECT DISTINCT SERVICE_TYPE
+    FROM {TICKETS_TABLE}
+    WHERE SERVICE_TYPE IS NOT NULL
+    ORDER BY SERVICE_TYPE
+    """
+    return run_query(session, query, "get_service_types")["SERVICE_TYPE"].tolist()
+
+@st.cache_data(ttl="2m")
+def get_finding_summary(where_clause):
+    query = f"""
+    SELECT
+        {finding_category_sql()} AS CATEGORY,
+        COALESCE(r.PRIMARY_METRIC, 'None') AS PRIMARY_METRIC,
+        COUNT(*) AS TICKETS,
+        MAX(r.COMPUTED_AT) AS LAST_REFRESH
+    FROM {RCA_TABLE} r
+    LEFT JOIN {TICKETS_TABLE} t ON t.TICKET_ID = r.TICKET_ID
+    WHERE {where_clause}
+    GROUP BY CATEGORY, PRIMARY_METRIC
+    """
+    df = run_query(session, query, "get_finding_summary")
+    df["TICKETS"] = pd.to_numeric(df["TICKETS"], errors="coerce")
+    return df
+
+@st.cache_data(ttl="2m")
+def get_top_cause_codes(where_clause, limit=15):
+    query = f"""
+    SELECT
+        r.TOP_CAUSE_CODE AS CAUSE_CODE,
+        COUNT(*) AS TICKETS,
+        ROUND(AVG(r.TOP_CAUSE_LIFT), 2) AS AVG_LIFT
+    FROM {RCA_TABLE} r
+    LEFT JOIN {TICKETS_TABLE} t ON t.TICKET_ID = r.TICKET_ID
+    WHERE {where_clause}
+      AND r.TOP_CAUSE_CODE IS NOT NULL
+    GROUP BY CAUSE_CODE
+    ORDER BY TICKETS DESC
+    LIMIT {int(limit)}
+    """
+    return run_query(session, query, "get_top_cause_codes")
+
+@st.cache_data(ttl="2m")
+def get_ticket_page(where_clause, page_size, page_number):
+    query = f"""
+    SELECT
+        r.TICKET_ID, r.CELL_ID, t.SERVICE_TYPE, t.SENTIMENT_SCORE, r.ANCHOR_HOUR,
+        r.PRIMARY_METRIC, r.PRIMARY_Z_SCORE, r.TOP_CAUSE_CODE, r.TOP_CAUSE_LIFT, r.FINDING
+    FROM {RCA_TABLE} r
+    LEFT JOIN {TICKETS_TABLE} t ON t.TICKET_ID = r.TICKET_ID
+    WHERE {where_clause}
+    ORDER BY r.PRIMARY_Z_SCORE DESC NULLS LAST, r.TICKET_ID
+    LIMIT {int(page_size)} OFFSET {int(page_size) * (int(page_number) - 1)}
+    """
+    return run_query(session, query, "get_ticket_page")
+
+@st.cache_data(ttl="2m")
+def lookup_ticket(ticket_id):
+    """Header, detail rows and ticket text for one ticket (keyed reads)"""
+    ticket_id = ticket_id.replace("'", "''")
+    header = run_query(session, f"""
+    SELECT r.*, t.SERVICE_TYPE, t.SENTIMENT_SCORE, t.REQUEST
+    FROM {RCA_TABLE} r
+    LEFT JOIN {TICKETS_TABLE} t ON t.TICKET_ID = r.TICKET_ID
+    WHERE r.TICKET_ID = '{ticket_id}'
+    """, "lookup_ticket")
+    detail = run_query(session, f"""
+    SELECT DETAIL_TYPE, NAME, WINDOW_VALUE, BASELINE_VALUE, SCORE
+    FROM {DETAIL_TABLE}
+    WHERE TICKET_ID = '{ticket_id}'
+    ORDER BY DETAIL_TYPE, SCORE DESC NULLS LAST
+    """, "lookup_ticket_detail")
+    return header, detail
+
+# Sidebar options
+st.sidebar.header("RCA Options")
+selected_categories = st.sidebar.multiselect("Finding", list(FINDING_CATEGORIES.values()), default=[])
+
+try:
+    service_type_options = get_service_types()
+except Exception as e:
+    st.error(f"Could not read SUPPORT_TICKETS: {str(e)}")
+    render_perf_panel(session)
+    st.stop()
+selected_service_types = st.sidebar.multiselect("Service types", service_type_options, default=[])
+page_size = st.sidebar.selectbox("Rows per page", [25, 50, 100], index=1)
+
+where_clause = build_filter(selected_categories, selected_service_types)
+
+try:
+    summary = get_finding_summary(where_clause)
+except Exception as e:
+    st.error(f"Could not read the ticket RCA tables: {str(e)}")
+    st.info("Run Setup/create_ticket_rca.sql (after Setup/create_kpi_rollups.sql) to build `RAW.TICKET_RCA`.")
+    render_perf_panel(session)
+    st.stop()
+
+ticket_count = int(summary["TICKETS"].sum()) if not summary.empty else 0
+if ticket_count == 0:
+    st.info("No analysed tickets match the current filters.")
+    render_perf_panel(session)
+    st.stop()
+
+# Headline numbers
+by_category = summary.groupby("CATEGORY")["TICKETS"].sum()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Tickets Analysed", f"{ticket_count:,}")
+col2.metric("Network Degradation", f"{int(by_category.get('Network degradation', 0)):,}")
+col3.metric("Unusual Failure Causes", f"{int(by_category.get('Unusual failure causes', 0)):,}")
+col4.metric("No Network Anomaly", f"{int(by_category.get('No network anomaly', 0)):,}")
+st.caption(f"Analysis last refreshed: {summary['LAST_REFRESH'].max()}")
+
+tab1, tab2, tab3 = st.tabs(["📊 Findings", "📋 Tickets", "🔍 Ticket Lookup"])
+
+with tab1:
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Most Deviating KPI")
+        degraded = summary[summary["CATEGORY"] == "Network degradation"].copy()
+        if degraded.empty:
+            st.info("No tickets with a KPI well above its baseline.")
+        else:
+            degraded["METRIC"] = degraded["PRIMARY_METRIC"].map(METRIC_LABELS).fillna(degraded["PRIMARY_METRIC"])
+            fig = px.bar(degraded.sort_values("TICKETS"), x="TICKETS", y="METRIC", orientation="h",
+                         labels={"TICKETS": "Tickets", "METRIC": ""})
+            with timed("chart_render", "primary_metric"):
+                st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.subheader("Most Frequent Cause Codes")
+        causes = get_top_cause_codes(where_clause)
+        if causes.empty:
+            st.info("No failed calls around the selected tickets.")
+        else:
+            fig = px.bar(causes.iloc[::-1], x="TICKETS", y="CAUSE_CODE", orientation="h", color="AVG_LIFT",
+                         color_continuous_scale="Reds",
+                         labels={"TICKETS": "Tickets", "CAUSE_CODE": "", "AVG_LIFT": "Avg Lift"})
+            with timed("chart_render", "top_cause_codes"):
+                st.plotly_chart(fig, use_container_width=True)
+            st.caption("Lift compares a cause code's share of failures in the complaint window with the week before.")
+
+with tab2:
+    total_pages = max(1, -(-ticket_count // page_size))
+    page_number = st.number_input(
+        f"Page (of {total_pages:,})", min_value=1, max_value=total_pages, value=1, step=1
+    )
+    tickets = get_ticket_page(where_clause, page_size, page_number)
+    st.dataframe(
+        tickets,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "PRIMARY_Z_SCORE": st.column_config.NumberColumn("Primary Z-Score", format="%.2f"),
+            "TOP_CAUSE_LIFT": st.column_config.NumberColumn("Cause Lift", format="%.2f"),
+        }
+    )
+    st.caption("Sorted by how far the most deviating KPI moved from the cell's baseline.")
+
+with tab3:
+    st.subheader("Ticket Lookup")
+    ticket_id = st.text_input("Ticket ID", placeholder="e.g. TR10001").strip()
+    if ticket_id:
+        header, detail = lookup_ticket(ticket_id)
+        if header.empty:
+            st.info("No analysis for that ticket yet.")
+        else:
+            row = header.iloc[0]
+            st.markdown(f"**{row['FINDING']}**")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Cell", str(row["CELL_ID"]))
+            col2.metric("Complaint Hour", str(row["ANCHOR_HOUR"]))
+            col3.metric("Sentiment", "-" if pd.isna(row["SENTIMENT_SCORE"]) else f"{row['SENTIMENT_SCORE']:.2f}")
+            st.markdown(f"> {row['REQUEST']}")
+
+            kpis = detail[detail["DETAIL_TYPE"] == "KPI"].copy()
+            if not kpis.empty:
+                kpis["METRIC"] = kpis["NAME"].map(METRIC_LABELS).fillna(kpis["NAME"])
+                fig = px.bar(kpis, x="METRIC", y="SCORE", color="SCORE", color_continuous_scale="RdYlGn_r",
+                             labels={"METRIC": "", "SCORE": "Z-Score vs baseline"})
+                fig.add_hline(y=2, line_dash="dash", line_color="gray")
+                with timed("chart_render", "ticket_kpis"):
+                    st.plotly_chart(fig, use_container_width=True)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**KPIs: complaint window vs baseline**")
+                st.dataframe(kpis.drop(columns=["DETAIL_TYPE"], errors="ignore"), use_container_width=True, hide_index=True)
+            with col2:
+                st.markdown("**Top failure cause codes in the window**")
+                st.dataframe(detail[detail["DETAIL_TYPE"] == "CAUSE_CODE"].drop(columns=["DETAIL_TYPE"]).rename(
+                    columns={"NAME": "CAUSE_CODE", "WINDOW_VALUE": "WINDOW_FAILED", "BASELINE_VALUE": "BASELINE_FAILED",
+                             "SCORE": "LIFT"}), use_container_width=True, hide_index=True)
+
+# Stage timings for this run
+render_perf_panel(session)
@@ -0,0 +1,179 @@
+import streamlit as st
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+
+# Page configuration - must be the first Streamlit command
+st.set_page_config(
+    page_title="Data Quality",
+    page_icon="🧪",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.title("🧪 Data Integration and Quality")
+st.markdown("""
+Is the data behind the dashboards complete and plausible?
+
+Declarative checks (null rates, value ranges per performance tier, rows per hour and duplicate keys) run on each
+newly arrived batch of `CELL_TOWER` rows and record one result per check and hour in `RAW.DQ_METRICS`. This page
+only reads those results, so it stays fast however large the measurement table grows.
+""")
+
+METRICS_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DQ_METRICS"
+CHECKS_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DQ_CHECKS"
+
+CHECK_TYPES = ["NULL_RATE", "RANGE", "ROW_COUNT", "DUPLICATE_KEY"]
+STATUS_COLORS = {"PASS": "#2ca02c", "FAIL": "#d62728"}
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Data Quality")
+
+def build_filter(lookback_hours, check_types, failing_only):
+    """WHERE clause on the metrics (m) and checks (c) for the sidebar filters"""
+    conditions = [
+        f"m.PARTITION_HOUR > DATEADD('HOUR', -{int(lookback_hours)}, (SELECT MAX(PARTITION_HOUR) FROM {METRICS_TABLE}))"
+    ]
+    if check_types:
+        type_list = ", ".join("'" + t.replace("'", "''") + "'" for t in check_types)
+        conditions.append(f"c.CHECK_TYPE IN ({type_list})")
+    if failing_only:
+        conditions.append("m.STATUS = 'FAIL'")
+    return " AND ".join(conditions)
+
+@st.cache_data(ttl="1m")
+def get_summary(where_clause):
+    query = f"""
+    SELECT
+        COUNT(DISTINCT m.CHECK_NAME) AS CHECKS,
+        COUNT(DISTINCT m.PARTITION_HOUR) AS HOURS,
+        COUNT_IF(m.STATUS = 'FAIL') AS FAILING_RESULTS,
+        COUNT(DISTINCT IFF(m.STATUS = 'FAIL', m.CHECK_NAME, NULL)) AS FAILING_CHECKS,
+        MAX(m.PARTITION_HOUR) AS LATEST_HOUR,
+        MAX(m.CHECKED_AT) AS LAST_CHECK
+    FROM {METRICS_TABLE} m
+    JOIN {CHECKS_TABLE} c ON c.CHECK_NAME = m.CHECK_NAME
+    WHERE {where_clause}
+    """
+    return run_query(session, query, "get_summary").iloc[0]
+
+@st.cache_data(ttl="1m")
+def get_check_status(where_clause):
+    """One row per check: latest result plus failing hours in the window"""
+    query = f"""
+    SELECT
+        m.CHECK_NAME,
+        ANY_VALUE(c.CHECK_TYPE) AS CHECK_TYPE,
+        ANY_VALUE(c.COLUMN_NAME) AS COLUMN_NAME,
+        ANY_VALUE(c.PERFORMANCE_TIER) AS PERFORMANCE_TIER,
+        MAX_BY(m.STATUS, m.PARTITION_HOUR) AS LATEST_STATUS,
+        MAX_BY(m.OBSERVED_VALUE, m.PARTITION_HOUR) AS LATEST_VALUE,
+        COUNT_IF(m.STATUS = 'FAIL') AS FAILING_HOURS,
+        COUNT(*) AS HOURS_CHECKED,
+        SUM(m.ROWS_CHECKED) AS ROWS_CHECKED,
+        SUM(m.FAILED_ROWS) AS FAILED_ROWS,
+        ANY_VALUE(c.DESCRIPTION) AS DESCRIPTION
+    FROM {METRICS_TABLE} m
+    JOIN {CHECKS_TABLE} c ON c.CHECK_NAME = m.CHECK_NAME
+    WHERE {where_clause}
+    GROUP BY m.CHECK_NAME
+    ORDER BY FAILING_HOURS DESC, m.CHECK_NAME
+    """
+    return run_query(session, query, "get_check_status")
+
+@st.cache_data(ttl="1m")
+def get_hourly_results(where_clause):
+    query = f"""
+    SELECT m.PARTITION_HOUR, m.CHECK_NAME, m.STATUS, m.OBSERVED_VALUE, m.ROWS_CHECKED, m.FAILED_ROWS
+    FROM {METRICS_TABLE} m
+    JOIN {CHECKS_TABLE} c ON c.CHECK_NAME = m.CHECK_NAME
+    WHERE {where_clause}
+    ORDER BY m.PARTITION_HOUR
+    """
+    return run_query(session, query, "get_hourly_results")
+
+@st.cache_data(ttl="10m")
+def get_check_definitions():
+    query = f"""
+    SELECT CHECK_NAME, CHECK_TYPE, COLUMN_NAME, PERFORMANCE_TIER, MIN_VALUE, MAX_VALUE, MAX_FAILED_PCT,
+           ENABLED, DESCRIPTION
+    FROM {CHECKS_TABLE}
+    ORDER BY CHECK_TYPE, CHECK_NAME
+    """
+    return run_query(session, query, "get_check_definitions")
+
+# Sidebar options
+st.sidebar.header("Quality Options")
+lookback_hours = st.sidebar.slider("Hours to show", min_value=1, max_value=168, value=48, step=1)
+selected_types = st.sidebar.multiselect("Check types", CHECK_TYPES, default=[])
+failing_only = st.sidebar.checkbox("Failing results only", value=False)
+
+where_clause = build_filter(lookback_hours, selected_types, failing_only)
+
+try:
+    summary = get_summary(where_clause)
+except Exception as e:
+    st.error(f"Could not read the data quality metrics: {str(e)}")
+    st.info("Run Setup/create_data_quality.sql to define the checks and build `RAW.DQ_METRICS`.")
+    render_perf_panel(session)
+    st.stop()
+
+if int(summary["CHECKS"]) == 0:
+    st.success("No check results match the current filters.")
+    render_perf_panel(session)
+    st.stop()
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Checks", f"{int(summary['CHECKS']):,}")
+col2.metric("Hours Checked", f"{int(summary['HOURS']):,}")
+col3.metric("Checks Failing", f"{int(summary['FAILING_CHECKS']):,}")
+col4.metric("Failing Check-Hours", f"{int(summary['FAILING_RESULTS']):,}")
+st.caption(f"Latest hour checked: {summary['LATEST_HOUR']} · last check run: {summary['LAST_CHECK']}")
+
+tab1, tab2, tab3 = st.tabs(["📋 Check Status", "🗓️ Hourly Results", "⚙️ Check Definitions"])
+
+with tab1:
+    st.subheader("Checks")
+    st.caption("Latest status per check and how many hours in the window failed it.")
+    check_status = get_check_status(where_clause)
+    st.dataframe(
+        check_status,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "LATEST_VALUE": st.column_config.NumberColumn("Latest Value (%)", format="%.3f"),
+        }
+    )
+
+with tab2:
+    st.subheader("Results per Hour")
+    hourly = get_hourly_results(where_clause)
+    fig = px.scatter(hourly, x="PARTITION_HOUR", y="CHECK_NAME", color="STATUS",
+                     color_discrete_map=STATUS_COLORS,
+                     hover_data=["OBSERVED_VALUE", "ROWS_CHECKED", "FAILED_ROWS"],
+                     labels={"PARTITION_HOUR": "Hour", "CHECK_NAME": "", "STATUS": "Status"})
+    fig.update_layout(height=max(400, 22 * hourly["CHECK_NAME"].nunique()))
+    with timed("chart_render", "hourly_results"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    selected_check = st.selectbox("Check", sorted(hourly["CHECK_NAME"].unique()))
+    if selected_check is not None:
+        check_rows = hourly[hourly["CHECK_NAME"] == selected_check]
+        fig = px.line(check_rows, x="PARTITION_HOUR", y="OBSERVED_VALUE", markers=True,
+                      labels={"PARTITION_HOUR": "Hour", "OBSERVED_VALUE": "Observed Value (%)"})
+        with timed("chart_render", "check_trend"):
+            st.plotly_chart(fig, use_container_width=True)
+
+with tab3:
+    st.subheader("Check Definitions")
+    st.caption("Edit `RAW.DQ_CHECKS` to add or tune checks; they apply to rows arriving from then on.")
+    st.dataframe(get_check_definitions(), use_container_width=True, hide_index=True)
+
+# Stage timings for this run
+render_perf_panel(session)
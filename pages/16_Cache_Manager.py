@@ -0,0 +1,118 @@
+import streamlit as st
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, render_perf_panel
+from utils.cache_manager import get_cache_manager
+from utils.data_store import refresh_snapshot
+
+# Page configuration - must be the first Streamlit command
+st.set_page_config(
+    page_title="Cache Manager",
+    page_icon="🗄️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.title("🗄️ Cache Manager (Admin)")
+st.markdown("""
+The shared data snapshot and the derived map colors and quantiles are held in one memory-bounded cache used by
+every session of the app. Entries are evicted least recently used first once the byte budget is exceeded, expire
+after their TTL, and are dropped per dataset when its data watermark changes.
+
+*Statistics count since the app process started (or since they were last reset) and cover all users.*
+""")
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Cache Manager")
+
+manager = get_cache_manager()
+
+# Sidebar controls
+st.sidebar.header("Cache Controls")
+budget_mb = st.sidebar.number_input(
+    "Memory budget (MB)", min_value=16, max_value=8192,
+    value=int(manager.budget_bytes // (1024 * 1024)), step=16,
+    help="Applies to the whole app process; lowering it evicts entries immediately"
+)
+if budget_mb * 1024 * 1024 != manager.budget_bytes:
+    manager.set_budget(budget_mb * 1024 * 1024)
+
+if st.sidebar.button("🔄 Check for New Data", help="Re-read the data watermark; a changed dataset drops its entries"):
+    refresh_snapshot()
+    st.sidebar.success("The next page that reads the snapshot re-checks the watermark.")
+if st.sidebar.button("Reset statistics"):
+    manager.reset_stats()
+
+stats = manager.stats()
+entries = manager.entries()
+
+# Headline numbers
+hits, misses = int(stats["hits"].sum()), int(stats["misses"].sum())
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Cached", f"{manager.total_bytes / (1024 * 1024):,.1f} MB",
+            f"{manager.total_bytes * 100.0 / manager.budget_bytes:.0f}% of budget", delta_color="off")
+col2.metric("Entries", f"{len(entries):,}")
+col3.metric("Hit Rate", "n/a" if hits + misses == 0 else f"{hits * 100.0 / (hits + misses):.1f}%")
+col4.metric("Evictions", f"{int(stats['evictions'].sum()):,}")
+st.progress(min(1.0, manager.total_bytes / manager.budget_bytes))
+
+tab1, tab2, tab3 = st.tabs(["📊 Statistics", "📦 Entries", "🏷️ Datasets"])
+
+with tab1:
+    st.subheader("Hits and Misses by Namespace")
+    if stats.empty:
+        st.info("Nothing has been cached yet. Open the Geospatial Analysis or Correlation Analytics page.")
+    else:
+        chart_data = stats.melt(id_vars="namespace", value_vars=["hits", "misses"],
+                                var_name="lookup", value_name="count")
+        fig = px.bar(chart_data, x="namespace", y="count", color="lookup", barmode="group",
+                     color_discrete_map={"hits": "#2ca02c", "misses": "#d62728"},
+                     labels={"namespace": "", "count": "Lookups", "lookup": ""})
+        with timed("chart_render", "cache_hits"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(
+            stats,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "bytes": st.column_config.NumberColumn("Bytes", format="%d"),
+                "hit_rate": st.column_config.NumberColumn("Hit Rate %", format="%.1f"),
+            }
+        )
+        st.caption("`expirations` = TTL passed; `evictions` = dropped for the byte budget; "
+                   "`invalidations` = dropped by a new watermark or by hand; `oversize` = larger than the whole budget.")
+
+with tab2:
+    st.subheader("Cached Entries")
+    st.caption("Most recently used first; the bottom rows are evicted next.")
+    st.dataframe(entries, use_container_width=True, hide_index=True)
+
+    namespaces = sorted(entries["namespace"].unique())
+    if namespaces:
+        selected_namespace = st.selectbox("Namespace", namespaces)
+        if st.button("Invalidate namespace"):
+            dropped = manager.invalidate(namespace=selected_namespace)
+            st.success(f"Dropped {dropped} entries from {selected_namespace}.")
+
+with tab3:
+    st.subheader("Dataset Watermarks")
+    st.caption("Entries tagged with a dataset are dropped as soon as a newer watermark of that dataset is seen.")
+    watermarks = manager.watermarks()
+    if not watermarks:
+        st.info("No dataset watermark has been recorded yet.")
+    for dataset, watermark in watermarks.items():
+        dataset_entries = entries[entries["dataset"] == dataset]
+        st.markdown(f"**{dataset}** — {len(dataset_entries):,} entries, "
+                    f"{dataset_entries['bytes'].sum() / (1024 * 1024):,.1f} MB")
+        st.code(watermark.replace("|", "\n"), language=None)
+        if st.button(f"Invalidate {dataset}", key=f"invalidate_{dataset}"):
+            dropped = manager.invalidate(dataset=dataset)
+            st.success(f"Dropped {dropped} entries of {dataset}.")
+
+# Stage timings for this run
+render_perf_panel(session)
@@ -4,6 +4,7 @@ import pydeck as pdk
 import matplotlib.pyplot as plt
 from snowflake.snowpark.context import get_active_session
 import _snowflake
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -21,21 +22,33 @@ def init_session():
     return get_active_session()
 
 session = init_session()
+start_run("Cell Tower Lookup")
 
 # Original networkoptimisation.py logic
+# Rates are aggregated per cell; the location comes from the DIM_CELL dimension.
 query = """
+WITH cells AS (
     SELECT
     cell_id,
-    ROUND(cell_latitude, 2) AS cell_latitude, 
-    ROUND(cell_longitude, 2) AS cell_longitude, 
     SUM(CASE WHEN call_release_code = 0 THEN 1 ELSE 0 END) AS total_success, 
     COUNT(*) AS total_calls, 
     ROUND((SUM(CASE WHEN call_release_code != 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*)), 2) AS failure_rate, 
     ROUND((SUM(CASE WHEN call_release_code = 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*)), 2) AS success_rate
-FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
-GROUP BY cell_id, cell_latitude, cell_longitude;
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
+    GROUP BY cell_id
+)
+SELECT
+    c.cell_id,
+    ROUND(d.cell_latitude, 2) AS cell_latitude, 
+    ROUND(d.cell_longitude, 2) AS cell_longitude, 
+    c.total_success,
+    c.total_calls,
+    c.failure_rate,
+    c.success_rate
+FROM cells c
+JOIN TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL d ON c.cell_id = d.cell_id;
 """
-data = session.sql(query).to_pandas()
+data = run_query(session, query, "cell_failure_rates")
 
 # Function to generate color based on failure rate
 def get_color(failure_rate):
@@ -48,7 +61,8 @@ def get_color(failure_rate):
         return [0, 255, 0, 160]  # Green  
 
 # Apply the color function to create a color column
-data['COLOR'] = data['FAILURE_RATE'].apply(get_color)
+with timed("color_map", "failure_rate"):
+    data['COLOR'] = data['FAILURE_RATE'].apply(get_color)
 
 # Find the average failure rate location
 avg_failure = data.groupby(['CELL_LATITUDE', 'CELL_LONGITUDE']).agg({'FAILURE_RATE': 'mean'}).reset_index()
@@ -78,14 +92,15 @@ view_state = pdk.ViewState(
 
 # Display the map using PyDeck without requiring explicit Mapbox API key
 # Snowflake's Streamlit environment provides access to Mapbox tiles by default
-st.session_state.event = st.pydeck_chart(
-    pdk.Deck(
-        map_provider="mapbox",
-        map_style="mapbox://styles/mapbox/light-v9",
-        layers=[grid_layer],
-        initial_view_state=view_state,
-    ), on_select="rerun", selection_mode="single-object"
-)
+with timed("chart_render", "pydeck"):
+    st.session_state.event = st.pydeck_chart(
+        pdk.Deck(
+            map_provider="mapbox",
+            map_style="mapbox://styles/mapbox/light-v9",
+            layers=[grid_layer],
+            initial_view_state=view_state,
+        ), on_select="rerun", selection_mode="single-object"
+    )
 
 cell_tower_objects = st.session_state.event.selection.get("objects", {}).get("cell_tower_grid", [])
 selection_data = []
@@ -124,7 +139,7 @@ if len(selection_data) > 0:
   
   prompt = prompt.replace("'", "''")
 
-  selection_text = session.sql(f"select snowflake.cortex.complete('mistral-large', '{prompt}') as res").to_pandas()
+  selection_text = run_query(session, f"select snowflake.cortex.complete('mistral-large', '{prompt}') as res", "cortex_selection_summary")
   st.write("#### Selected Grid Cells")
   st.markdown(selection_text["RES"][0])
 
@@ -136,28 +151,26 @@ if len(selection_data) > 0:
   df.plot(kind="bar", x="Cell ID", y="Failure Rate (%)", color="orange", ax=ax1)
   ax1.set_ylabel("Failure Rate (%)")
   ax1.set_title("Failure Rate for Each Cell")
-  col1.pyplot(fig1)
+  with timed("chart_render", "failure_rate_bar"):
+    col1.pyplot(fig1)
 
 
   cell_ids_list = df["Cell ID"].to_list()
   cell_ids_str = ','.join(map(str, cell_ids_list))
-  loyalty_data = session.sql(f"""SELECT 
-        c.cell_id,
-        COUNT(CASE WHEN cl.status = 'Bronze' THEN 1 END) AS bronze_count,
-        COUNT(CASE WHEN cl.status = 'Silver' THEN 1 END) AS silver_count,
-        COUNT(CASE WHEN cl.status = 'Gold' THEN 1 END) AS gold_count
+  # Keyed lookup on the precomputed loyalty bridge (Setup/create_loyalty_bridge.sql)
+  loyalty_data = run_query(session, f"""SELECT 
+        cell_id,
+        SUM(IFF(loyalty_status = 'Bronze', failed_calls, 0)) AS bronze_count,
+        SUM(IFF(loyalty_status = 'Silver', failed_calls, 0)) AS silver_count,
+        SUM(IFF(loyalty_status = 'Gold', failed_calls, 0)) AS gold_count
     FROM 
-        TELCO_NETWORK_OPTIMIZATION_PROD.raw.customer_loyalty cl
-    JOIN 
-        TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER c
-    ON 
-        cl.phone_number = c.msisdn
+        TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_LOYALTY_BRIDGE
     WHERE 
-        c.call_release_code != 0
-        AND c.cell_id IN ({cell_ids_str})
+        cell_id IN ({cell_ids_str})
+        AND loyalty_status IN ('Bronze', 'Silver', 'Gold')
     GROUP BY 
-        c.cell_id;
-    """).to_pandas()
+        cell_id;
+    """, "loyalty_counts")
   # Set 'cell_id' as the index for better visualization
   loyalty_data.set_index('CELL_ID', inplace=True)
 
@@ -173,9 +186,10 @@ if len(selection_data) > 0:
   ax2.legend(title="Loyalty Status", labels=["Bronze", "Silver", "Gold"])
 
   # Show the plot in Streamlit
-  col2.pyplot(fig2)
+  with timed("chart_render", "loyalty_bar"):
+    col2.pyplot(fig2)
 
-  sentiment_score = session.sql(f"""SELECT 
+  sentiment_score = run_query(session, f"""SELECT 
       cell_id,
       AVG(sentiment_score) + 20 AS avg_sentiment_score
   FROM 
@@ -185,7 +199,7 @@ if len(selection_data) > 0:
       cell_id
   ORDER BY 
       avg_sentiment_score DESC;
-  """).to_pandas()
+  """, "sentiment_scores")
 
   # Create the figure and axes for plotting
   fig3, ax3 = plt.subplots()
@@ -198,7 +212,8 @@ if len(selection_data) > 0:
   ax3.set_title("Call Center Transcripts Sentiment Score by Cell")
 
   # Show the plot in Streamlit
-  col3.pyplot(fig3)
+  with timed("chart_render", "sentiment_bar"):
+    col3.pyplot(fig3)
 
   st.write("#### Suggestion from LLM:")
   
@@ -233,11 +248,14 @@ if len(selection_data) > 0:
     prompt = prompt.replace("'", "''")
 
     with st.spinner("Generating AI recommendations..."):
-      suggestion = session.sql(f"select snowflake.cortex.complete('mistral-large', '{prompt}') as res").to_pandas()
+      suggestion = run_query(session, f"select snowflake.cortex.complete('mistral-large', '{prompt}') as res", "cortex_recommendation")
       st.markdown(suggestion["RES"][0])
       
   except Exception as e:
     st.error(f"Error generating LLM suggestion: {str(e)}")
     st.write("Debug info:")
     st.write(f"Number of cells selected: {len(df)}")
-    st.write(f"Cell IDs: {df['Cell ID'].tolist() if len(df) > 0 else 'None'}") 
\ No newline at end of file
+    st.write(f"Cell IDs: {df['Cell ID'].tolist() if len(df) > 0 else 'None'}") 
+
+# Stage timings for this run
+render_perf_panel(session)
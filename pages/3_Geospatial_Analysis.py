@@ -7,7 +7,9 @@ import plotly.graph_objects as go
 from snowflake.snowpark.context import get_active_session
 import _snowflake
 import branca.colormap as cm
-import h3
+from utils.instrumentation import start_run, timed, render_perf_panel
+from utils.data_store import get_snapshot, refresh_snapshot
+from utils.cache_manager import managed_cache
 
 # Define Branca colormap color lists globally
 colors_yellow_blue = ['#fafa6e','#e1f46e','#caee70','#b3e773','#9ddf77','#89d77b','#75cf7f','#62c682',
@@ -56,18 +58,15 @@ def init_session():
     return get_active_session()
 
 session = init_session()
+start_run("Geospatial Analysis")
 
 # Sidebar options
 st.sidebar.header("Visualization Options")
 
-# Add a clear cache button
-if st.sidebar.button("🔄 Clear Data Cache", help="Refresh all data from the database"):
-    # Clear all cached data
-    st.cache_data.clear()
-    # Show a message instead of using experimental_rerun
-    st.sidebar.success("Cache cleared! Please refresh the page manually.")
-    # Add instructions for manual refresh
-    st.sidebar.info("Please click the 'Refresh' button in your browser or press F5 to load fresh data.")
+# Re-check the data watermark now; only data that changed is reloaded (see the Cache Manager page)
+if st.sidebar.button("🔄 Check for New Data", help="Reload the map data if the source tables have changed"):
+    refresh_snapshot()
+    st.rerun()
 
 # Heatmap type selector - replacing radio button with multiselect
 available_metrics = [
@@ -293,72 +292,10 @@ normalize_heights = st.sidebar.checkbox(
     help="Normalize values to range from 0 to 100, making height differences more visible for metrics with small values or little variation."
 )
 
-# Fetch cell tower data
-@st.cache_data(ttl="1h")
-def get_cell_data():
-    query = """
-    SELECT
-        cell_id,
-        ROUND(cell_latitude, 4) AS latitude, 
-        ROUND(cell_longitude, 4) AS longitude, 
-        SUM(CASE WHEN call_release_code = 0 THEN 1 ELSE 0 END) AS total_success, 
-        COUNT(*) AS total_calls, 
-        ROUND((SUM(CASE WHEN call_release_code != 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*)), 2) AS failure_rate,
-        AVG(PM_PDCP_LAT_TIME_DL) AS avg_dl_latency,
-        SUM(PM_RRC_CONN_ESTAB_SUCC) AS total_conn_succ,
-        SUM(PM_RRC_CONN_ESTAB_ATT) AS total_conn_att,
-        CASE 
-            WHEN SUM(PM_RRC_CONN_ESTAB_ATT) > 0 
-            THEN ROUND((SUM(PM_RRC_CONN_ESTAB_SUCC) * 100.0 / SUM(PM_RRC_CONN_ESTAB_ATT)), 2)
-            ELSE NULL
-        END AS conn_success_rate,
-        AVG(PM_ERAB_REL_ABNORMAL_ENB) AS avg_abnormal_drop,
-        AVG(PM_ACTIVE_UE_DL_MAX) AS avg_dl_speed,
-        AVG(PM_ACTIVE_UE_UL_MAX) AS avg_ul_speed,
-        AVG(PM_PRB_UTIL_DL) AS avg_dl_util,
-        AVG(PM_PRB_UTIL_UL) AS avg_ul_util,
-        SUM(PM_S1_SIG_CONN_ESTAB_SUCC) AS total_sig_conn_succ,
-        SUM(PM_S1_SIG_CONN_ESTAB_ATT) AS total_sig_conn_att,
-        CASE 
-            WHEN SUM(PM_S1_SIG_CONN_ESTAB_ATT) > 0 
-            THEN ROUND((SUM(PM_S1_SIG_CONN_ESTAB_SUCC) * 100.0 / SUM(PM_S1_SIG_CONN_ESTAB_ATT)), 2)
-            ELSE NULL
-        END AS sig_conn_success_rate
-    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
-    GROUP BY cell_id, latitude, longitude
-    """
-    df = session.sql(query).to_pandas()
-    # Convert column names to lowercase for consistent access
-    df.columns = df.columns.str.lower()
-    return df
-
-# Fetch support ticket data
-@st.cache_data(ttl="1h")
-def get_ticket_data():
-    query = """
-    SELECT 
-        st.cell_id,
-        COUNT(DISTINCT st.ticket_id) AS ticket_count,  -- Count distinct ticket IDs to avoid duplicates
-        AVG(st.sentiment_score) AS avg_sentiment,
-        ROUND(c.cell_latitude, 4) AS latitude,
-        ROUND(c.cell_longitude, 4) AS longitude,
-        COUNT(DISTINCT CASE WHEN st.service_type = 'Cellular' THEN st.ticket_id END) AS cellular_tickets,
-        COUNT(DISTINCT CASE WHEN st.service_type = 'Business Internet' THEN st.ticket_id END) AS business_tickets,
-        COUNT(DISTINCT CASE WHEN st.service_type = 'Home Internet' THEN st.ticket_id END) AS home_tickets
-    FROM 
-        TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS st
-    JOIN 
-        TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER c ON st.cell_id = c.cell_id
-    GROUP BY st.cell_id, latitude, longitude
-    """
-    df = session.sql(query).to_pandas()
-    # Convert column names to lowercase for consistent access
-    df.columns = df.columns.str.lower()
-    return df
-
-# Fetch and process our data
-cell_data = get_cell_data()
-ticket_data = get_ticket_data()
+# Per-cell network and ticket aggregates, shared with the other pages (see utils/data_store.py)
+snapshot = get_snapshot(session)
+cell_data = snapshot["cell_data"]
+ticket_data = snapshot["ticket_data"]
 
 # Merge data for combined view
 merged_data = pd.merge(
@@ -384,12 +321,12 @@ def get_map_center(data):
         return 32.7157, -117.1611
 
 # Function to get quantiles for colormap
-@st.cache_data
+@managed_cache("geo_quantiles", dataset="network")
 def get_quantiles(df_column, num_quantiles=20): # Default to 20 quantiles for smoother gradients
     return df_column.quantile(np.linspace(0, 1, num_quantiles + 1))
 
 # Function to get RGBA colors based on values
-@st.cache_data
+@managed_cache("geo_colors", dataset="network")
 def calculate_rgba_color(df_column, colors_hex_list, quantiles, opacity, reverse=False):
     if reverse:
         colors_hex_list = colors_hex_list[::-1]
@@ -412,7 +349,6 @@ def calculate_rgba_color(df_column, colors_hex_list, quantiles, opacity, reverse
     return rgba_colors
 
 # Replace the blend_colors function with a more robust version
-@st.cache_data(show_spinner=False)
 def blend_colors(color_arrays):
     """Blend multiple RGBA color arrays by averaging their values"""
     show_debug("blend_colors received:", color_arrays)
@@ -517,7 +453,8 @@ def prepare_visualization_data(metric_name, config):
         return pd.DataFrame(), 0, 0, title, value_column
 
     # --- Stage 1: Prepare per-cell data --- 
-    df['h3_actual_index'] = df.apply(lambda row: h3.geo_to_h3(float(row['latitude']), float(row['longitude']), config['resolution']), axis=1)
+    with timed("h3_index", metric_name):
+        df['h3_actual_index'] = df[f"h3_res{config['resolution']}"]
     df['numeric_metric_value'] = pd.to_numeric(df[value_column], errors='coerce')
     df = df.dropna(subset=['numeric_metric_value', 'h3_actual_index'])
     df['cell_id_str'] = df['cell_id'].astype(str) # Ensure cell_id is string for aggregation
@@ -579,18 +516,19 @@ def prepare_visualization_data(metric_name, config):
     elif style == "White-Green": colors_hex_list = colors_white_green
     # Fixed colors removed
 
-    if colors_hex_list and not aggregated_df.empty: 
-        if aggregated_df['agg_numeric_value'].nunique() > 1: 
-            quantiles = get_quantiles(aggregated_df['agg_numeric_value'], num_quantiles=len(colors_hex_list) - 1)
-            aggregated_df['rgba_color'] = calculate_rgba_color(aggregated_df['agg_numeric_value'], colors_hex_list, quantiles, opacity, reverse=reverse_colormap)
-        else: 
-            mid_color_hex = colors_hex_list[len(colors_hex_list) // 2] if len(colors_hex_list) > 0 else '#808080'
-            r = int(mid_color_hex[1:3], 16); g = int(mid_color_hex[3:5], 16); b = int(mid_color_hex[5:7], 16)
-            aggregated_df['rgba_color'] = [[r,g,b, int(opacity*255)]] * len(aggregated_df)
-    elif not aggregated_df.empty:
-         aggregated_df['rgba_color'] = [[128, 128, 128, int(opacity*255)]] * len(aggregated_df) # Grey
-    else: # Handle case where aggregated_df might be empty
-        aggregated_df['rgba_color'] = []
+    with timed("color_map", metric_name):
+        if colors_hex_list and not aggregated_df.empty: 
+            if aggregated_df['agg_numeric_value'].nunique() > 1: 
+                quantiles = get_quantiles(aggregated_df['agg_numeric_value'], num_quantiles=len(colors_hex_list) - 1)
+                aggregated_df['rgba_color'] = calculate_rgba_color(aggregated_df['agg_numeric_value'], colors_hex_list, quantiles, opacity, reverse=reverse_colormap)
+            else: 
+                mid_color_hex = colors_hex_list[len(colors_hex_list) // 2] if len(colors_hex_list) > 0 else '#808080'
+                r = int(mid_color_hex[1:3], 16); g = int(mid_color_hex[3:5], 16); b = int(mid_color_hex[5:7], 16)
+                aggregated_df['rgba_color'] = [[r,g,b, int(opacity*255)]] * len(aggregated_df)
+        elif not aggregated_df.empty:
+             aggregated_df['rgba_color'] = [[128, 128, 128, int(opacity*255)]] * len(aggregated_df) # Grey
+        else: # Handle case where aggregated_df might be empty
+            aggregated_df['rgba_color'] = []
 
     # Calculate center based on original data (more stable than aggregated means)
     center_lat, center_lon = get_map_center(df)
@@ -662,98 +600,99 @@ for i, metric_name in enumerate(selected_metrics):
         st.sidebar.warning(f"Could not generate layer for {metric_name} due to lack of valid data.")
 
 # Second pass: create a combined dataframe with blended colors
-if all_h3_indices and len(selected_metrics) > 1:
-    # Create a new dataframe with all unique H3 indices
-    combined_df = pd.DataFrame({'h3_actual_index': list(all_h3_indices)})
-    
-    # For each H3 index, collect colors from all metrics and blend them
-    color_data = []
-    show_debug("Starting to process H3 indices for color blending", f"Total indices: {len(all_h3_indices)}")
+with timed("layer_build", "blended" if len(selected_metrics) > 1 else "single"):
+    if all_h3_indices and len(selected_metrics) > 1:
+        # Create a new dataframe with all unique H3 indices
+        combined_df = pd.DataFrame({'h3_actual_index': list(all_h3_indices)})
+    
+        # For each H3 index, collect colors from all metrics and blend them
+        color_data = []
+        show_debug("Starting to process H3 indices for color blending", f"Total indices: {len(all_h3_indices)}")
 
-    # First pass to find min/max values for height metric if normalization is enabled
-    height_min_val = None
-    height_max_val = None
+        # First pass to find min/max values for height metric if normalization is enabled
+        height_min_val = None
+        height_max_val = None
 
-    if normalize_heights and height_metric in data_for_metric:
-        height_data = data_for_metric[height_metric]
-        if 'agg_numeric_value' in height_data.columns and not height_data.empty:
-            height_min_val = height_data['agg_numeric_value'].min()
-            height_max_val = height_data['agg_numeric_value'].max()
-            show_debug("Height metric normalization range:", f"Min: {height_min_val}, Max: {height_max_val}")
+        if normalize_heights and height_metric in data_for_metric:
+            height_data = data_for_metric[height_metric]
+            if 'agg_numeric_value' in height_data.columns and not height_data.empty:
+                height_min_val = height_data['agg_numeric_value'].min()
+                height_max_val = height_data['agg_numeric_value'].max()
+                show_debug("Height metric normalization range:", f"Min: {height_min_val}, Max: {height_max_val}")
 
-    for h3_index in all_h3_indices:
-        colors_for_cell = []
-        tooltip_parts = []
-        cell_towers = []
-        agg_value = 0
+        for h3_index in all_h3_indices:
+            colors_for_cell = []
+            tooltip_parts = []
+            cell_towers = []
+            agg_value = 0
         
-        for metric_name in selected_metrics:
-            if metric_name in data_for_metric:
-                metric_df = data_for_metric[metric_name]
-                if h3_index in metric_df['h3_actual_index'].values:
-                    row = metric_df[metric_df['h3_actual_index'] == h3_index].iloc[0]
-                    # Add a check for the type of color data
-                    if 'rgba_color' in row:
-                        color_value = row['rgba_color']
-                        # Skip None or empty values
-                        if color_value is not None and color_value != []:
-                            colors_for_cell.append(color_value)
-                    tooltip_parts.append(f"{row['metric_name_for_tooltip']}: {row['aggregated_value_display']}")
-                    if len(cell_towers) == 0 and 'cell_towers_display' in row:
-                        cell_towers = [row['cell_towers_display']]
-                    if metric_name == height_metric and 'agg_numeric_value' in row:
-                        # If normalization is enabled and we have min/max values, normalize the value
-                        if normalize_heights and height_min_val is not None and height_max_val is not None and height_min_val != height_max_val:
-                            agg_value = ((row['agg_numeric_value'] - height_min_val) / (height_max_val - height_min_val)) * 100
-                        else:
-                            agg_value = row['agg_numeric_value']
+            for metric_name in selected_metrics:
+                if metric_name in data_for_metric:
+                    metric_df = data_for_metric[metric_name]
+                    if h3_index in metric_df['h3_actual_index'].values:
+                        row = metric_df[metric_df['h3_actual_index'] == h3_index].iloc[0]
+                        # Add a check for the type of color data
+                        if 'rgba_color' in row:
+                            color_value = row['rgba_color']
+                            # Skip None or empty values
+                            if color_value is not None and color_value != []:
+                                colors_for_cell.append(color_value)
+                        tooltip_parts.append(f"{row['metric_name_for_tooltip']}: {row['aggregated_value_display']}")
+                        if len(cell_towers) == 0 and 'cell_towers_display' in row:
+                            cell_towers = [row['cell_towers_display']]
+                        if metric_name == height_metric and 'agg_numeric_value' in row:
+                            # If normalization is enabled and we have min/max values, normalize the value
+                            if normalize_heights and height_min_val is not None and height_max_val is not None and height_min_val != height_max_val:
+                                agg_value = ((row['agg_numeric_value'] - height_min_val) / (height_max_val - height_min_val)) * 100
+                            else:
+                                agg_value = row['agg_numeric_value']
         
-        # Blend colors if we have multiple
-        if len(colors_for_cell) > 1:
-            show_debug(f"Blending colors for h3_index {h3_index}", colors_for_cell)
-            blended_color = blend_colors(colors_for_cell)
-            show_debug("Resulting blended color:", blended_color)
-        elif len(colors_for_cell) == 1:
-            blended_color = colors_for_cell[0]
-        else:
-            blended_color = [0, 0, 0, 0]  # Transparent if no data
+            # Blend colors if we have multiple
+            if len(colors_for_cell) > 1:
+                show_debug(f"Blending colors for h3_index {h3_index}", colors_for_cell)
+                blended_color = blend_colors(colors_for_cell)
+                show_debug("Resulting blended color:", blended_color)
+            elif len(colors_for_cell) == 1:
+                blended_color = colors_for_cell[0]
+            else:
+                blended_color = [0, 0, 0, 0]  # Transparent if no data
         
-        color_data.append({
-            'h3_actual_index': h3_index,
-            'rgba_color': blended_color,
-            'tooltip_text': "\n".join(tooltip_parts),
-            'cell_towers_display': cell_towers[0] if cell_towers else "No cell tower data",
-            'agg_numeric_value': agg_value
-        })
-    
-    # Create the combined dataframe
-    combined_df = pd.DataFrame(color_data)
-    
-    # Create a single layer with blended colors
-    blended_layer = pdk.Layer(
-        "H3HexagonLayer",
-        data=combined_df,
-        id="h3_blended_layer",
-        pickable=True,
-        stroked=True,
-        filled=True,
-        get_hexagon="h3_actual_index",
-        get_fill_color="rgba_color",
-        extruded=(height_metric in selected_metrics),
-        get_elevation="agg_numeric_value" if height_metric in selected_metrics else 0,
-        elevation_scale=height_multiplier if height_metric in selected_metrics else 0
-    )
+            color_data.append({
+                'h3_actual_index': h3_index,
+                'rgba_color': blended_color,
+                'tooltip_text': "\n".join(tooltip_parts),
+                'cell_towers_display': cell_towers[0] if cell_towers else "No cell tower data",
+                'agg_numeric_value': agg_value
+            })
     
-    # Replace all individual layers with our blended layer
-    layers = [blended_layer]
-else:
-    # If we only have one metric or no data, use the original approach
-    layers = []
-    for i, metric_name in enumerate(selected_metrics):
-        if metric_name in data_for_metric:
-            config = layer_configs[metric_name]
-            layer = create_layer(metric_name, data_for_metric[metric_name], None, config, z_index=i)
-            layers.append(layer)
+        # Create the combined dataframe
+        combined_df = pd.DataFrame(color_data)
+    
+        # Create a single layer with blended colors
+        blended_layer = pdk.Layer(
+            "H3HexagonLayer",
+            data=combined_df,
+            id="h3_blended_layer",
+            pickable=True,
+            stroked=True,
+            filled=True,
+            get_hexagon="h3_actual_index",
+            get_fill_color="rgba_color",
+            extruded=(height_metric in selected_metrics),
+            get_elevation="agg_numeric_value" if height_metric in selected_metrics else 0,
+            elevation_scale=height_multiplier if height_metric in selected_metrics else 0
+        )
+    
+        # Replace all individual layers with our blended layer
+        layers = [blended_layer]
+    else:
+        # If we only have one metric or no data, use the original approach
+        layers = []
+        for i, metric_name in enumerate(selected_metrics):
+            if metric_name in data_for_metric:
+                config = layer_configs[metric_name]
+                layer = create_layer(metric_name, data_for_metric[metric_name], None, config, z_index=i)
+                layers.append(layer)
 
 # Calculate the overall map center from all selected metrics
 if selected_metrics and metric_info: 
@@ -783,28 +722,29 @@ height: 600px !important;
 st.subheader("🗺️ Multi-Metric Geospatial Analysis")
 
 # Always render the main visualization using H3HexagonLayers
-st.pydeck_chart(
-    pdk.Deck(
-        map_provider="mapbox",
-        map_style="mapbox://styles/mapbox/light-v9", 
-        initial_view_state=pdk.ViewState(
-            latitude=center_lat,
-            longitude=center_lon,
-            zoom=5, 
-            pitch=45 if any(metric == height_metric for metric in selected_metrics) else 0,
-            bearing=0,
-            height=600  
+with timed("chart_render", "pydeck"):
+    st.pydeck_chart(
+        pdk.Deck(
+            map_provider="mapbox",
+            map_style="mapbox://styles/mapbox/light-v9", 
+            initial_view_state=pdk.ViewState(
+                latitude=center_lat,
+                longitude=center_lon,
+                zoom=5, 
+                pitch=45 if any(metric == height_metric for metric in selected_metrics) else 0,
+                bearing=0,
+                height=600  
+            ),
+            layers=layers, 
+            tooltip={
+                "text": "{cell_towers_display}\n{tooltip_text}" if len(selected_metrics) > 1 else "{cell_towers_display}\n{metric_name_for_tooltip}: {aggregated_value_display}",
+                "style": {"backgroundColor": "rgb(14, 17, 23)", "color": "white"}
+            }
         ),
-        layers=layers, 
-        tooltip={
-            "text": "{cell_towers_display}\n{tooltip_text}" if len(selected_metrics) > 1 else "{cell_towers_display}\n{metric_name_for_tooltip}: {aggregated_value_display}",
-            "style": {"backgroundColor": "rgb(14, 17, 23)", "color": "white"}
-        }
-    ),
-    use_container_width=True,
-    height=600,
-    key=f"map_main_h3_{'_'.join(selected_metrics)}_{hash(str(layer_configs))}"
-)
+        use_container_width=True,
+        height=600,
+        key=f"map_main_h3_{'_'.join(selected_metrics)}_{hash(str(layer_configs))}"
+    )
 
 # Statistics section - Now using tabs for better organization
 st.subheader("📈 Data Analysis")
@@ -1139,4 +1079,7 @@ with st.expander("Cell Data Explorer", expanded=False):
             st.write("No cell IDs available to explore. Ensure data is loaded.")
             
     except Exception as e:
-        st.error(f"Error in Cell Data Explorer: {str(e)}") 
\ No newline at end of file
+        st.error(f"Error in Cell Data Explorer: {str(e)}") 
+
+# Stage timings for this run
+render_perf_panel(session)
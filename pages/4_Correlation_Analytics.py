@@ -8,6 +8,8 @@ from snowflake.snowpark.context import get_active_session
 import scipy.stats as stats
 from io import BytesIO
 import base64
+from utils.instrumentation import start_run, timed, render_perf_panel
+from utils.data_store import get_snapshot, refresh_snapshot
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -140,13 +142,13 @@ def init_session():
     return get_active_session()
 
 session = init_session()
+start_run("Correlation Analytics")
 
-# Add a clear cache button to sidebar
+# Re-check the data watermark now; only data that changed is reloaded (see the Cache Manager page)
 st.sidebar.header("Analysis Options")
-if st.sidebar.button("🔄 Clear Data Cache", help="Refresh all data from the database"):
-    st.cache_data.clear()
-    st.sidebar.success("Cache cleared! Please refresh the page manually.")
-    st.sidebar.info("Please click the 'Refresh' button in your browser or press F5 to load fresh data.")
+if st.sidebar.button("🔄 Check for New Data", help="Reload the analysis data if the source tables have changed"):
+    refresh_snapshot()
+    st.rerun()
 
 # Add metric descriptions below the selector to help users understand metrics
 with st.sidebar.expander("📊 Metric Description", expanded=False):
@@ -232,72 +234,10 @@ with st.sidebar.expander("🔍 Data Filters", expanded=True):
         help="Statistical significance threshold (lower values are more stringent)"
     )
 
-# Fetch cell tower data
-@st.cache_data(ttl="1h")
-def get_cell_data():
-    query = """
-    SELECT
-        cell_id,
-        ROUND(cell_latitude, 4) AS latitude, 
-        ROUND(cell_longitude, 4) AS longitude, 
-        SUM(CASE WHEN call_release_code = 0 THEN 1 ELSE 0 END) AS total_success, 
-        COUNT(*) AS total_calls, 
-        ROUND((SUM(CASE WHEN call_release_code != 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*)), 2) AS failure_rate,
-        AVG(PM_PDCP_LAT_TIME_DL) AS avg_dl_latency,
-        SUM(PM_RRC_CONN_ESTAB_SUCC) AS total_conn_succ,
-        SUM(PM_RRC_CONN_ESTAB_ATT) AS total_conn_att,
-        CASE 
-            WHEN SUM(PM_RRC_CONN_ESTAB_ATT) > 0 
-            THEN ROUND((SUM(PM_RRC_CONN_ESTAB_SUCC) * 100.0 / SUM(PM_RRC_CONN_ESTAB_ATT)), 2)
-            ELSE NULL
-        END AS conn_success_rate,
-        AVG(PM_ERAB_REL_ABNORMAL_ENB) AS avg_abnormal_drop,
-        AVG(PM_ACTIVE_UE_DL_MAX) AS avg_dl_speed,
-        AVG(PM_ACTIVE_UE_UL_MAX) AS avg_ul_speed,
-        AVG(PM_PRB_UTIL_DL) AS avg_dl_util,
-        AVG(PM_PRB_UTIL_UL) AS avg_ul_util,
-        SUM(PM_S1_SIG_CONN_ESTAB_SUCC) AS total_sig_conn_succ,
-        SUM(PM_S1_SIG_CONN_ESTAB_ATT) AS total_sig_conn_att,
-        CASE 
-            WHEN SUM(PM_S1_SIG_CONN_ESTAB_ATT) > 0 
-            THEN ROUND((SUM(PM_S1_SIG_CONN_ESTAB_SUCC) * 100.0 / SUM(PM_S1_SIG_CONN_ESTAB_ATT)), 2)
-            ELSE NULL
-        END AS sig_conn_success_rate
-    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
-    GROUP BY cell_id, latitude, longitude
-    """
-    df = session.sql(query).to_pandas()
-    # Convert column names to lowercase for consistent access
-    df.columns = df.columns.str.lower()
-    return df
-
-# Fetch support ticket data
-@st.cache_data(ttl="1h")
-def get_ticket_data():
-    query = """
-    SELECT 
-        st.cell_id,
-        COUNT(DISTINCT st.ticket_id) AS ticket_count,  -- Count distinct ticket IDs to avoid duplicates
-        AVG(st.sentiment_score) AS avg_sentiment,
-        ROUND(c.cell_latitude, 4) AS latitude,
-        ROUND(c.cell_longitude, 4) AS longitude,
-        COUNT(DISTINCT CASE WHEN st.service_type = 'Cellular' THEN st.ticket_id END) AS cellular_tickets,
-        COUNT(DISTINCT CASE WHEN st.service_type = 'Business Internet' THEN st.ticket_id END) AS business_tickets,
-        COUNT(DISTINCT CASE WHEN st.service_type = 'Home Internet' THEN st.ticket_id END) AS home_tickets
-    FROM 
-        TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS st
-    JOIN 
-        TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER c ON st.cell_id = c.cell_id
-    GROUP BY st.cell_id, latitude, longitude
-    """
-    df = session.sql(query).to_pandas()
-    # Convert column names to lowercase for consistent access
-    df.columns = df.columns.str.lower()
-    return df
-
-# Fetch and process our data
-cell_data = get_cell_data()
-ticket_data = get_ticket_data()
+# Per-cell network and ticket aggregates, shared with the other pages (see utils/data_store.py)
+snapshot = get_snapshot(session)
+cell_data = snapshot["cell_data"]
+ticket_data = snapshot["ticket_data"]
 
 # Status indicator while processing
 status_placeholder = st.empty()
@@ -368,10 +308,11 @@ if len(analysis_data) < min_sample_size:
     st.stop()
 
 # Calculate correlation matrix
-if correlation_method == "Pearson":
-    correlation_matrix = analysis_data[correlation_columns].corr(method='pearson')
-else:  # Spearman
-    correlation_matrix = analysis_data[correlation_columns].corr(method='spearman')
+with timed("correlation", correlation_method):
+    if correlation_method == "Pearson":
+        correlation_matrix = analysis_data[correlation_columns].corr(method='pearson')
+    else:  # Spearman
+        correlation_matrix = analysis_data[correlation_columns].corr(method='spearman')
 
 # Calculate p-values for correlation coefficients
 def calculate_correlation_pvalues(df, method='pearson'):
@@ -388,7 +329,8 @@ def calculate_correlation_pvalues(df, method='pearson'):
     return pvalues
 
 # Calculate p-values
-pvalues = calculate_correlation_pvalues(analysis_data[correlation_columns], method=correlation_method.lower())
+with timed("p_values", correlation_method):
+    pvalues = calculate_correlation_pvalues(analysis_data[correlation_columns], method=correlation_method.lower())
 
 # Update UI status
 status_placeholder.success("Data processing complete. Rendering visualizations...")
@@ -462,7 +404,7 @@ with tab1:
     st.markdown(f"**Currently analyzing correlations for: __{primary_metric}__**")
     if st.button("⬆️ Change Selected Metric", key="change_metric_tab1"):
         st.session_state.scroll_to_top = True
-        st.experimental_rerun()
+        st.rerun()
     
     # Display information about the primary metric
     st.subheader(f"Analysis of {primary_metric}")
@@ -502,7 +444,8 @@ with tab1:
         else:
             chart = hist_chart
             
-        st.altair_chart(chart, use_container_width=True)
+        with timed("chart_render", "distribution"):
+            st.altair_chart(chart, use_container_width=True)
     
     with col2:
         # Show the top significant correlations
@@ -525,7 +468,8 @@ with tab1:
                 title=f"Top Correlations with {primary_metric}"
             )
             
-            st.altair_chart(bar_chart, use_container_width=True)
+            with timed("chart_render", "top_correlations"):
+                st.altair_chart(bar_chart, use_container_width=True)
         else:
             st.info("No statistically significant correlations found.")
     
@@ -600,7 +544,7 @@ with tab2:
     st.markdown(f"**Currently analyzing correlations for: __{primary_metric}__**")
     if st.button("⬆️ Change Selected Metric", key="change_metric_tab2"):
         st.session_state.scroll_to_top = True
-        st.experimental_rerun()
+        st.rerun()
     
     # Create a clean correlation matrix with display names
     display_corr_matrix = correlation_matrix.copy()
@@ -668,7 +612,8 @@ with tab2:
             anchor='middle'
         )
         
-        st.altair_chart(chart, use_container_width=True)
+        with timed("chart_render", "correlation_matrix"):
+            st.altair_chart(chart, use_container_width=True)
     
     with col2:
         st.write("#### Significance Indicators")
@@ -701,7 +646,7 @@ with tab3:
     st.markdown(f"**Currently analyzing correlations for: __{primary_metric}__**")
     if st.button("⬆️ Change Selected Metric", key="change_metric_tab3"):
         st.session_state.scroll_to_top = True
-        st.experimental_rerun()
+        st.rerun()
     
     # Find the top correlations to show scatter plots for
     metrics_to_plot = correlation_results.head(6)['Metric'].tolist()
@@ -776,7 +721,8 @@ with tab3:
                     }
                 )
             
-            st.altair_chart(chart, use_container_width=True)
+            with timed("chart_render", f"scatter {metric}"):
+                st.altair_chart(chart, use_container_width=True)
             
             # Add description of the relationship
             relationship = correlation_results[correlation_results['Metric'] == metric]['Relationship'].values[0]
@@ -795,7 +741,7 @@ with tab4:
     st.markdown(f"**Currently analyzing correlations for: __{primary_metric}__**")
     if st.button("⬆️ Change Selected Metric", key="change_metric_tab4"):
         st.session_state.scroll_to_top = True
-        st.experimental_rerun()
+        st.rerun()
     
     # Complete correlation table with all metrics
     st.subheader("Complete Correlation Results")
@@ -874,4 +820,7 @@ st.markdown("""
 """)
 
 # Update status at the end
-st.success("Analysis complete! Use the tabs to explore correlations from different perspectives.") 
\ No newline at end of file
+st.success("Analysis complete! Use the tabs to explore correlations from different perspectives.") 
+
+# Stage timings for this run
+render_perf_panel(session)
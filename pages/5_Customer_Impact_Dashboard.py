@@ -1,4 +1,8 @@
 import streamlit as st
+import pandas as pd
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -9,4 +13,226 @@ st.set_page_config(
 )
 
 st.title("👥 Customer Impact Dashboard")
-st.info("This page is under development. Check back soon!") 
\ No newline at end of file
+st.markdown("""
+Find the subscribers hit hardest by network failures, and the towers and tickets behind them.
+
+All figures come from the customer impact ledger (`RAW.CUSTOMER_IMPACT_LEDGER`), which holds one row per MSISDN
+and is updated by a task as each new hour of measurements arrives. Sorting and paging run in Snowflake, so only
+the rows on screen are returned however many subscribers there are.
+""")
+
+LEDGER_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CUSTOMER_IMPACT_LEDGER"
+SCORECARD_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TOWER_SCORECARD"
+
+LOYALTY_TIERS = ["Gold", "Silver", "Bronze", "Non-member"]
+TIER_COLORS = {"Gold": "#ffd700", "Silver": "#c0c0c0", "Bronze": "#cd7f32", "Non-member": "#9e9e9e"}
+
+# Sortable ledger columns: label -> (expression, sort descending)
+RANK_OPTIONS = {
+    "Failed Calls": ("FAILED_CALLS", True),
+    "Failure Rate": ("FAILED_CALLS * 100.0 / NULLIF(TOTAL_CALLS, 0)", True),
+    "Most Recent Failure": ("LAST_FAILED_TS", True),
+    "Total Calls": ("TOTAL_CALLS", True),
+}
+
+# Failed-call histogram buckets; the last one collects everything above it
+MAX_FAILED_BUCKET = 20
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Customer Impact Dashboard")
+
+def build_filter(tiers, min_failed):
+    """WHERE clause for the sidebar filters (tier names come from a fixed list)"""
+    conditions = [f"FAILED_CALLS >= {int(min_failed)}"]
+    if tiers:
+        tier_list = ", ".join("'" + t.replace("'", "''") + "'" for t in tiers)
+        conditions.append(f"LOYALTY_STATUS IN ({tier_list})")
+    return " AND ".join(conditions)
+
+@st.cache_data(ttl="2m")
+def get_tier_summary(where_clause):
+    query = f"""
+    SELECT
+        LOYALTY_STATUS,
+        COUNT(*) AS SUBSCRIBERS,
+        COUNT_IF(FAILED_CALLS > 0) AS IMPACTED_SUBSCRIBERS,
+        SUM(TOTAL_CALLS) AS TOTAL_CALLS,
+        SUM(FAILED_CALLS) AS FAILED_CALLS,
+        MAX(UPDATED_AT) AS LAST_REFRESH
+    FROM {LEDGER_TABLE}
+    WHERE {where_clause}
+    GROUP BY LOYALTY_STATUS
+    """
+    df = run_query(session, query, "get_tier_summary")
+    for column in ["SUBSCRIBERS", "IMPACTED_SUBSCRIBERS", "TOTAL_CALLS", "FAILED_CALLS"]:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+@st.cache_data(ttl="2m")
+def get_failed_call_distribution(where_clause):
+    query = f"""
+    SELECT
+        LEAST(FAILED_CALLS, {MAX_FAILED_BUCKET}) AS FAILED_BUCKET,
+        LOYALTY_STATUS,
+        COUNT(*) AS SUBSCRIBERS
+    FROM {LEDGER_TABLE}
+    WHERE {where_clause}
+    GROUP BY FAILED_BUCKET, LOYALTY_STATUS
+    ORDER BY FAILED_BUCKET
+    """
+    return run_query(session, query, "get_failed_call_distribution")
+
+@st.cache_data(ttl="2m")
+def get_ranked_page(where_clause, rank_expression, descending, page_size, page_number):
+    """One page of ranked subscribers (LIMIT/OFFSET in Snowflake, tickets joined for that page only)"""
+    query = f"""
+    WITH page AS (
+        SELECT *, {rank_expression} AS RANK_VALUE
+        FROM {LEDGER_TABLE}
+        WHERE {where_clause}
+        ORDER BY RANK_VALUE {'DESC' if descending else 'ASC'} NULLS LAST, MSISDN
+        LIMIT {int(page_size)} OFFSET {int(page_size) * (int(page_number) - 1)}
+    )
+    SELECT
+        p.MSISDN,
+        p.LOYALTY_STATUS,
+        p.FAILED_CALLS,
+        p.TOTAL_CALLS,
+        ROUND(p.FAILED_CALLS * 100.0 / NULLIF(p.TOTAL_CALLS, 0), 2) AS FAILURE_RATE,
+        p.LAST_FAILED_TS,
+        p.LAST_FAILED_CELL_ID,
+        s.VENDOR_NAME AS LAST_FAILED_VENDOR,
+        s.TICKET_COUNT AS LINKED_TICKETS,
+        ROUND(s.SENTIMENT_SUM / NULLIF(s.SENTIMENT_ROWS, 0), 3) AS LINKED_AVG_SENTIMENT
+    FROM page p
+    LEFT JOIN {SCORECARD_TABLE} s ON s.CELL_ID = p.LAST_FAILED_CELL_ID
+    ORDER BY p.RANK_VALUE {'DESC' if descending else 'ASC'} NULLS LAST, p.MSISDN
+    """
+    return run_query(session, query, "get_ranked_page")
+
+@st.cache_data(ttl="2m")
+def lookup_subscriber(msisdn):
+    query = f"""
+    SELECT *
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CUSTOMER_IMPACT_V
+    WHERE MSISDN = {int(msisdn)}
+    """
+    return run_query(session, query, "lookup_subscriber")
+
+@st.cache_data(ttl="2m")
+def get_cell_tickets(cell_id, limit=10):
+    query = f"""
+    SELECT TICKET_ID, SERVICE_TYPE, SENTIMENT_SCORE, REQUEST
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS
+    WHERE CELL_ID = {int(cell_id)}
+    ORDER BY SENTIMENT_SCORE ASC NULLS LAST, TICKET_ID
+    LIMIT {int(limit)}
+    """
+    return run_query(session, query, "get_cell_tickets")
+
+# Sidebar options
+st.sidebar.header("Impact Options")
+selected_tiers = st.sidebar.multiselect("Loyalty tiers", LOYALTY_TIERS, default=[])
+min_failed = st.sidebar.number_input("Minimum failed calls", min_value=0, value=1, step=1)
+rank_by = st.sidebar.selectbox("Rank subscribers by", list(RANK_OPTIONS), index=0)
+rank_expression, descending = RANK_OPTIONS[rank_by]
+page_size = st.sidebar.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+
+where_clause = build_filter(selected_tiers, min_failed)
+
+try:
+    summary = get_tier_summary(where_clause)
+except Exception as e:
+    st.error(f"Could not read the customer impact ledger: {str(e)}")
+    st.info("Run Setup/create_customer_impact_ledger.sql to create and load `RAW.CUSTOMER_IMPACT_LEDGER`.")
+    render_perf_panel(session)
+    st.stop()
+
+subscriber_count = int(summary["SUBSCRIBERS"].sum()) if not summary.empty else 0
+if subscriber_count == 0:
+    st.info("No subscribers match the current filters.")
+    render_perf_panel(session)
+    st.stop()
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Subscribers", f"{subscriber_count:,}")
+col2.metric("Impacted Subscribers", f"{int(summary['IMPACTED_SUBSCRIBERS'].sum()):,}")
+col3.metric("Failed Calls", f"{int(summary['FAILED_CALLS'].sum()):,}")
+gold = summary[summary["LOYALTY_STATUS"] == "Gold"]
+col4.metric("Impacted Gold Members", f"{int(gold['IMPACTED_SUBSCRIBERS'].sum()):,}")
+if pd.notna(summary["LAST_REFRESH"].max()):
+    st.caption(f"Ledger last refreshed: {summary['LAST_REFRESH'].max()}")
+
+tab1, tab2, tab3 = st.tabs(["📊 Overview", "📋 Most Affected Subscribers", "🔍 Subscriber Lookup"])
+
+with tab1:
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Impacted Subscribers by Tier")
+        fig = px.bar(summary, x="LOYALTY_STATUS", y="IMPACTED_SUBSCRIBERS", color="LOYALTY_STATUS",
+                     color_discrete_map=TIER_COLORS, category_orders={"LOYALTY_STATUS": LOYALTY_TIERS},
+                     labels={"LOYALTY_STATUS": "", "IMPACTED_SUBSCRIBERS": "Impacted Subscribers"})
+        fig.update_layout(showlegend=False)
+        with timed("chart_render", "impacted_by_tier"):
+            st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.subheader("Failed Calls per Subscriber")
+        distribution = get_failed_call_distribution(where_clause)
+        fig = px.bar(distribution, x="FAILED_BUCKET", y="SUBSCRIBERS", color="LOYALTY_STATUS",
+                     color_discrete_map=TIER_COLORS, category_orders={"LOYALTY_STATUS": LOYALTY_TIERS},
+                     labels={"FAILED_BUCKET": "Failed Calls", "SUBSCRIBERS": "Subscribers", "LOYALTY_STATUS": "Tier"})
+        with timed("chart_render", "failed_call_distribution"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"The last bar collects subscribers with {MAX_FAILED_BUCKET} or more failed calls.")
+
+with tab2:
+    total_pages = max(1, -(-subscriber_count // page_size))
+    page_number = st.number_input(
+        f"Page (of {total_pages:,})", min_value=1, max_value=total_pages, value=1, step=1
+    )
+    ranked = get_ranked_page(where_clause, rank_expression, descending, page_size, page_number)
+    ranked.insert(0, "RANK", range((page_number - 1) * page_size + 1, (page_number - 1) * page_size + 1 + len(ranked)))
+    st.dataframe(
+        ranked,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "MSISDN": st.column_config.NumberColumn("MSISDN", format="%d"),
+            "FAILURE_RATE": st.column_config.NumberColumn("Failure Rate %", format="%.2f"),
+            "LINKED_AVG_SENTIMENT": st.column_config.NumberColumn("Cell Avg Sentiment", format="%.2f"),
+        }
+    )
+    st.caption(
+        f"Showing subscribers {(page_number - 1) * page_size + 1:,}–{(page_number - 1) * page_size + len(ranked):,} "
+        f"of {subscriber_count:,}. Linked tickets are those raised on the cell of the subscriber's last failed call."
+    )
+
+with tab3:
+    st.subheader("Subscriber Lookup")
+    msisdn_input = st.text_input("MSISDN", placeholder="e.g. 61412345678")
+    if msisdn_input.strip().isdigit():
+        subscriber = lookup_subscriber(msisdn_input.strip())
+        if subscriber.empty:
+            st.info("No calls recorded for that MSISDN.")
+        else:
+            row = subscriber.iloc[0]
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Loyalty Tier", row["LOYALTY_STATUS"])
+            col2.metric("Failed Calls", f"{int(row['FAILED_CALLS']):,}")
+            col3.metric("Failure Rate", f"{row['FAILURE_RATE'] or 0:.2f}%")
+            col4.metric("Last Failed Cell", "-" if pd.isna(row["LAST_FAILED_CELL_ID"]) else str(int(row["LAST_FAILED_CELL_ID"])))
+            st.dataframe(subscriber, use_container_width=True, hide_index=True)
+            if pd.notna(row["LAST_FAILED_CELL_ID"]):
+                st.markdown("**Most negative tickets on the cell of the last failed call**")
+                st.dataframe(get_cell_tickets(row["LAST_FAILED_CELL_ID"]), use_container_width=True, hide_index=True)
+    elif msisdn_input:
+        st.warning("Enter the MSISDN as digits only.")
+
+# Stage timings for this run
+render_perf_panel(session)
@@ -1,4 +1,8 @@
 import streamlit as st
+import pandas as pd
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -9,4 +13,237 @@ st.set_page_config(
 )
 
 st.title("🥇 Loyalty Status Impact")
-st.info("This page is under development. Check back soon!") 
\ No newline at end of file
+st.markdown("""
+See how network failures land on customers in each loyalty tier, and which towers fail the most valuable customers.
+
+Figures come from the loyalty bridge (`RAW.CELL_LOYALTY_BRIDGE`), which holds total and failed calls per cell and
+loyalty tier and is kept up to date by a task. Every view is a keyed lookup or roll-up over that table, so this page
+never joins `CUSTOMER_LOYALTY` to `CELL_TOWER`.
+""")
+
+BRIDGE_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_LOYALTY_BRIDGE"
+DIM_CELL_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL"
+
+LOYALTY_TIERS = ["Gold", "Silver", "Bronze"]
+TIER_COLORS = {"Gold": "#ffd700", "Silver": "#c0c0c0", "Bronze": "#cd7f32", "Non-member": "#9e9e9e"}
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Loyalty Status Impact")
+
+def build_filter(vendors, regions):
+    """WHERE clause on DIM_CELL for the sidebar filters (values come from DIM_CELL itself)"""
+    conditions = ["1 = 1"]
+    for column, values in (("d.VENDOR_NAME", vendors), ("d.REGION", regions)):
+        if values:
+            value_list = ", ".join("'" + v.replace("'", "''") + "'" for v in values)
+            conditions.append(f"{column} IN ({value_list})")
+    return " AND ".join(conditions)
+
+def impact_score_sql(weights):
+    """Weighted failed calls: each tier's failures count with the tier's weight"""
+    terms = " ".join(
+        f"WHEN '{tier}' THEN {float(weight)}" for tier, weight in weights.items()
+    )
+    return f"SUM(b.FAILED_CALLS * CASE b.LOYALTY_STATUS {terms} ELSE 0 END)"
+
+@st.cache_data(ttl="10m")
+def get_dimension_values(column):
+    query = f"""
+    SELECT DISTINCT {column} AS VALUE
+    FROM {DIM_CELL_TABLE}
+    WHERE {column} IS NOT NULL
+    ORDER BY VALUE
+    """
+    return run_query(session, query, "get_dimension_values")["VALUE"].tolist()
+
+@st.cache_data(ttl="2m")
+def get_tier_totals(where_clause):
+    query = f"""
+    SELECT
+        b.LOYALTY_STATUS,
+        SUM(b.TOTAL_CALLS) AS TOTAL_CALLS,
+        SUM(b.FAILED_CALLS) AS FAILED_CALLS,
+        ROUND(SUM(b.FAILED_CALLS) * 100.0 / NULLIF(SUM(b.TOTAL_CALLS), 0), 2) AS FAILURE_RATE,
+        COUNT(DISTINCT b.CELL_ID) AS CELLS,
+        MAX(b.UPDATED_AT) AS LAST_REFRESH
+    FROM {BRIDGE_TABLE} b
+    JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = b.CELL_ID
+    WHERE {where_clause}
+    GROUP BY b.LOYALTY_STATUS
+    """
+    df = run_query(session, query, "get_tier_totals")
+    for column in ["TOTAL_CALLS", "FAILED_CALLS", "FAILURE_RATE", "CELLS"]:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+@st.cache_data(ttl="2m")
+def get_tier_by_dimension(where_clause, column):
+    query = f"""
+    SELECT
+        d.{column} AS MEMBER,
+        b.LOYALTY_STATUS,
+        SUM(b.FAILED_CALLS) AS FAILED_CALLS,
+        ROUND(SUM(b.FAILED_CALLS) * 100.0 / NULLIF(SUM(b.TOTAL_CALLS), 0), 2) AS FAILURE_RATE
+    FROM {BRIDGE_TABLE} b
+    JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = b.CELL_ID
+    WHERE {where_clause}
+    GROUP BY MEMBER, b.LOYALTY_STATUS
+    ORDER BY MEMBER
+    """
+    df = run_query(session, query, "get_tier_by_dimension")
+    df["FAILED_CALLS"] = pd.to_numeric(df["FAILED_CALLS"], errors="coerce")
+    df["FAILURE_RATE"] = pd.to_numeric(df["FAILURE_RATE"], errors="coerce")
+    return df
+
+@st.cache_data(ttl="2m")
+def get_most_affected_cells(where_clause, weights, k):
+    """Server-side top-K cells by weighted failed calls to loyalty members"""
+    weights = dict(weights)
+    tier_columns = ", ".join(
+        f"SUM(IFF(b.LOYALTY_STATUS = '{tier}', b.FAILED_CALLS, 0)) AS {tier.upper()}_FAILED"
+        for tier in LOYALTY_TIERS
+    )
+    query = f"""
+    SELECT
+        b.CELL_ID,
+        ANY_VALUE(d.VENDOR_NAME) AS VENDOR_NAME,
+        ANY_VALUE(d.REGION) AS REGION,
+        {impact_score_sql(weights)} AS IMPACT_SCORE,
+        {tier_columns},
+        SUM(b.FAILED_CALLS) AS ALL_FAILED,
+        ROUND(SUM(b.FAILED_CALLS) * 100.0 / NULLIF(SUM(b.TOTAL_CALLS), 0), 2) AS FAILURE_RATE
+    FROM {BRIDGE_TABLE} b
+    JOIN {DIM_CELL_TABLE} d ON d.CELL_ID = b.CELL_ID
+    WHERE {where_clause}
+    GROUP BY b.CELL_ID
+    ORDER BY IMPACT_SCORE DESC, b.CELL_ID
+    LIMIT {int(k)}
+    """
+    return run_query(session, query, "get_most_affected_cells")
+
+@st.cache_data(ttl="2m")
+def lookup_cells(cell_ids):
+    """Keyed lookup of the bridge rows for the given cells"""
+    id_list = ", ".join(str(int(c)) for c in cell_ids)
+    query = f"""
+    SELECT CELL_ID, LOYALTY_STATUS, TOTAL_CALLS, FAILED_CALLS
+    FROM {BRIDGE_TABLE}
+    WHERE CELL_ID IN ({id_list})
+    ORDER BY CELL_ID, LOYALTY_STATUS
+    """
+    return run_query(session, query, "lookup_cells")
+
+# Sidebar options
+st.sidebar.header("Loyalty Options")
+selected_vendors = st.sidebar.multiselect("Vendors", get_dimension_values("VENDOR_NAME"))
+selected_regions = st.sidebar.multiselect("Regions", get_dimension_values("REGION"))
+st.sidebar.subheader("Impact Weights")
+st.sidebar.caption("How much one failed call counts for each tier in the impact score.")
+weights = {
+    "Gold": st.sidebar.slider("Gold", min_value=0.0, max_value=10.0, value=3.0, step=0.5),
+    "Silver": st.sidebar.slider("Silver", min_value=0.0, max_value=10.0, value=2.0, step=0.5),
+    "Bronze": st.sidebar.slider("Bronze", min_value=0.0, max_value=10.0, value=1.0, step=0.5),
+}
+top_k = st.sidebar.slider("Cells to rank", min_value=5, max_value=100, value=20, step=5)
+
+where_clause = build_filter(selected_vendors, selected_regions)
+
+try:
+    tier_totals = get_tier_totals(where_clause)
+except Exception as e:
+    st.error(f"Could not read the loyalty bridge: {str(e)}")
+    st.info("Run Setup/create_loyalty_bridge.sql to create and load `RAW.CELL_LOYALTY_BRIDGE`.")
+    render_perf_panel(session)
+    st.stop()
+
+if tier_totals.empty:
+    st.info("No calls match the selected filters.")
+    render_perf_panel(session)
+    st.stop()
+
+members = tier_totals[tier_totals["LOYALTY_STATUS"].isin(LOYALTY_TIERS)]
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+for column, tier in zip([col1, col2, col3], LOYALTY_TIERS):
+    row = tier_totals[tier_totals["LOYALTY_STATUS"] == tier]
+    if row.empty:
+        column.metric(f"{tier} Failed Calls", "0")
+    else:
+        column.metric(f"{tier} Failed Calls", f"{int(row['FAILED_CALLS'].iloc[0]):,}",
+                      f"{row['FAILURE_RATE'].iloc[0]:.2f}% failure rate", delta_color="off")
+member_share = members["TOTAL_CALLS"].sum() * 100.0 / max(tier_totals["TOTAL_CALLS"].sum(), 1)
+col4.metric("Calls from Loyalty Members", f"{member_share:.1f}%")
+
+tab1, tab2, tab3 = st.tabs(["🏅 By Tier", "🚨 Most Affected Cells", "🔎 Cell Lookup"])
+
+with tab1:
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Failure Rate by Tier")
+        fig = px.bar(tier_totals, x="LOYALTY_STATUS", y="FAILURE_RATE", color="LOYALTY_STATUS",
+                     color_discrete_map=TIER_COLORS, labels={"LOYALTY_STATUS": "", "FAILURE_RATE": "Failure Rate (%)"})
+        with timed("chart_render", "tier_failure_rate"):
+            st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.subheader("Failed Calls by Tier")
+        fig = px.pie(tier_totals, names="LOYALTY_STATUS", values="FAILED_CALLS", color="LOYALTY_STATUS",
+                     color_discrete_map=TIER_COLORS)
+        with timed("chart_render", "tier_failed_share"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    breakdown_label = st.radio("Break down by", ["Vendor", "Region"], horizontal=True)
+    breakdown_column = {"Vendor": "VENDOR_NAME", "Region": "REGION"}[breakdown_label]
+    by_dimension = get_tier_by_dimension(where_clause, breakdown_column)
+    by_dimension = by_dimension[by_dimension["LOYALTY_STATUS"].isin(LOYALTY_TIERS)]
+    fig = px.bar(by_dimension, x="MEMBER", y="FAILED_CALLS", color="LOYALTY_STATUS", barmode="stack",
+                 color_discrete_map=TIER_COLORS, category_orders={"LOYALTY_STATUS": LOYALTY_TIERS},
+                 labels={"MEMBER": breakdown_label, "FAILED_CALLS": "Failed Calls", "LOYALTY_STATUS": "Tier"})
+    with timed("chart_render", "tier_by_dimension"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(tier_totals, use_container_width=True, hide_index=True)
+
+with tab2:
+    st.subheader(f"Top {top_k} Cells by Loyalty Impact")
+    st.caption("Impact score = failed calls per tier × the tier's weight from the sidebar.")
+    affected = get_most_affected_cells(where_clause, tuple(weights.items()), top_k)
+    if affected.empty:
+        st.info("No failed calls to loyalty members for the selected filters.")
+    else:
+        chart_data = affected.melt(
+            id_vars=["CELL_ID"], value_vars=[f"{tier.upper()}_FAILED" for tier in LOYALTY_TIERS],
+            var_name="TIER", value_name="FAILED_CALLS"
+        )
+        chart_data["TIER"] = chart_data["TIER"].str.replace("_FAILED", "").str.title()
+        chart_data["CELL_ID"] = chart_data["CELL_ID"].astype(str)
+        fig = px.bar(chart_data, x="CELL_ID", y="FAILED_CALLS", color="TIER", barmode="stack",
+                     color_discrete_map=TIER_COLORS, category_orders={"CELL_ID": affected["CELL_ID"].astype(str).tolist()},
+                     labels={"CELL_ID": "Cell ID", "FAILED_CALLS": "Failed Calls", "TIER": "Tier"})
+        with timed("chart_render", "most_affected_cells"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(affected, use_container_width=True, hide_index=True)
+
+with tab3:
+    st.subheader("Loyalty Impact for Specific Cells")
+    cell_input = st.text_input("Cell IDs (comma separated)", placeholder="e.g. 30380850, 30030006")
+    cell_ids = [c.strip() for c in cell_input.split(",") if c.strip().isdigit()]
+    if cell_ids:
+        looked_up = lookup_cells(tuple(cell_ids))
+        if looked_up.empty:
+            st.info("No calls recorded for those cells.")
+        else:
+            looked_up["CELL_ID"] = looked_up["CELL_ID"].astype(str)
+            fig = px.bar(looked_up, x="CELL_ID", y="FAILED_CALLS", color="LOYALTY_STATUS", barmode="stack",
+                         color_discrete_map=TIER_COLORS,
+                         labels={"CELL_ID": "Cell ID", "FAILED_CALLS": "Failed Calls", "LOYALTY_STATUS": "Tier"})
+            with timed("chart_render", "cell_lookup"):
+                st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(looked_up, use_container_width=True, hide_index=True)
+
+# Stage timings for this run
+render_perf_panel(session)
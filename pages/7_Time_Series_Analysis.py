@@ -1,4 +1,11 @@
 import streamlit as st
+import pandas as pd
+import plotly.express as px
+from collections import deque
+from datetime import datetime, time, timedelta
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+from utils.timeseries import GRAINS, MAX_PERIODS_PER_SERIES, downsample, periods_in_span, pick_grain
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -9,4 +16,337 @@ st.set_page_config(
 )
 
 st.title("📈 Time-Series Analysis")
-st.info("This page is under development. Check back soon!") 
\ No newline at end of file
+st.markdown("""
+Track network KPIs over time for the whole network, a vendor, a region or individual cells.
+
+Data comes from the KPI rollup (`RAW.KPI_ROLLUP`), which holds hourly, daily and weekly totals per cell,
+vendor and region. The page picks the finest granularity that fits the selected date range and
+downsamples each series (LTTB) before charting, so long ranges stay fast without reading raw measurements.
+Turn on **Live tail** to follow the newest hours as the data generators write them.
+""")
+
+ROLLUP_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.KPI_ROLLUP"
+
+# KPI label -> expression over the additive rollup totals
+METRICS = {
+    "Failure Rate (%)": "SUM(FAILED_CALLS) * 100.0 / NULLIF(SUM(MEASUREMENT_ROWS), 0)",
+    "RRC Failure Rate (%)": "(SUM(RRC_ATT_SUM) - SUM(RRC_SUCC_SUM)) * 100.0 / NULLIF(SUM(RRC_ATT_SUM), 0)",
+    "Downlink Latency": "SUM(LATENCY_DL_SUM) / NULLIF(SUM(LATENCY_DL_ROWS), 0)",
+    "PRB Utilization Downlink": "SUM(PRB_DL_SUM) / NULLIF(SUM(PRB_DL_ROWS), 0)",
+    "PRB Utilization Uplink": "SUM(PRB_UL_SUM) / NULLIF(SUM(PRB_UL_ROWS), 0)",
+    "E-RAB Abnormal Release": "SUM(ERAB_ABNORMAL_SUM) / NULLIF(SUM(ERAB_ABNORMAL_ROWS), 0)",
+    "Active UEs Downlink": "SUM(ACTIVE_UE_DL_SUM) / NULLIF(SUM(ACTIVE_UE_DL_ROWS), 0)",
+    "Measurements": "SUM(MEASUREMENT_ROWS)",
+}
+
+# Sidebar label -> DIMENSION value in the rollup
+DIMENSIONS = {
+    "Whole Network": "NETWORK",
+    "Vendor": "VENDOR",
+    "Region": "REGION",
+    "Cell": "CELL",
+}
+
+GRAIN_LABELS = {"HOUR": "Hourly", "DAY": "Daily", "WEEK": "Weekly"}
+
+# Additive totals for the newest measurements, named like the rollup columns so
+# the METRICS expressions apply to them unchanged
+LIVE_TOTALS = """
+    COUNT(*) AS MEASUREMENT_ROWS,
+    COUNT_IF(CALL_RELEASE_CODE != 0) AS FAILED_CALLS,
+    COALESCE(SUM(PM_RRC_CONN_ESTAB_ATT), 0) AS RRC_ATT_SUM,
+    COALESCE(SUM(PM_RRC_CONN_ESTAB_SUCC), 0) AS RRC_SUCC_SUM,
+    COALESCE(SUM(PM_PDCP_LAT_TIME_DL), 0) AS LATENCY_DL_SUM,
+    COUNT(PM_PDCP_LAT_TIME_DL) AS LATENCY_DL_ROWS,
+    COALESCE(SUM(PM_PRB_UTIL_DL), 0) AS PRB_DL_SUM,
+    COUNT(PM_PRB_UTIL_DL) AS PRB_DL_ROWS,
+    COALESCE(SUM(PM_PRB_UTIL_UL), 0) AS PRB_UL_SUM,
+    COUNT(PM_PRB_UTIL_UL) AS PRB_UL_ROWS,
+    COALESCE(SUM(PM_ERAB_REL_ABNORMAL_ENB), 0) AS ERAB_ABNORMAL_SUM,
+    COUNT(PM_ERAB_REL_ABNORMAL_ENB) AS ERAB_ABNORMAL_ROWS,
+    COALESCE(SUM(PM_ACTIVE_UE_DL_MAX), 0) AS ACTIVE_UE_DL_SUM,
+    COUNT(PM_ACTIVE_UE_DL_MAX) AS ACTIVE_UE_DL_ROWS
+"""
+
+# KPIs shown as headline numbers in live mode
+LIVE_HEADLINE_METRICS = ["Failure Rate (%)", "RRC Failure Rate (%)", "Downlink Latency", "PRB Utilization Downlink"]
+
+LIVE_BUFFER_KEY = "_ts_live_buffer"
+
+# Upper bound on lines in one chart
+MAX_SERIES = 20
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Time-Series Analysis")
+
+def member_filter(members):
+    """AND clause restricting MEMBER to the given values (empty string for no filter)"""
+    if not members:
+        return ""
+    member_list = ", ".join("'" + str(m).replace("'", "''") + "'" for m in members)
+    return f"AND MEMBER IN ({member_list})"
+
+@st.cache_data(ttl="2m")
+def get_time_bounds():
+    query = f"""
+    SELECT MIN(PERIOD_START) AS FIRST_HOUR, MAX(PERIOD_START) AS LAST_HOUR
+    FROM {ROLLUP_TABLE}
+    WHERE GRAIN = 'HOUR' AND DIMENSION = 'NETWORK'
+    """
+    return run_query(session, query, "get_time_bounds").iloc[0]
+
+@st.cache_data(ttl="10m")
+def get_members(dimension):
+    query = f"""
+    SELECT DISTINCT MEMBER
+    FROM {ROLLUP_TABLE}
+    WHERE GRAIN = 'WEEK' AND DIMENSION = '{dimension}'
+    ORDER BY TRY_TO_NUMBER(MEMBER), MEMBER
+    """
+    return run_query(session, query, "get_members")["MEMBER"].tolist()
+
+@st.cache_data(ttl="5m")
+def get_top_members(dimension, metric_expr, start, end, n):
+    """Members with the highest KPI over the range, ranked on the daily rollup in Snowflake"""
+    query = f"""
+    SELECT MEMBER, {metric_expr} AS RANK_VALUE
+    FROM {ROLLUP_TABLE}
+    WHERE GRAIN = 'DAY' AND DIMENSION = '{dimension}'
+      AND PERIOD_START >= DATE_TRUNC('DAY', '{start}'::TIMESTAMP_NTZ)
+      AND PERIOD_START < '{end}'::TIMESTAMP_NTZ
+    GROUP BY MEMBER
+    HAVING RANK_VALUE IS NOT NULL
+    ORDER BY RANK_VALUE DESC, MEMBER
+    LIMIT {int(n)}
+    """
+    return run_query(session, query, "get_top_members")["MEMBER"].tolist()
+
+@st.cache_data(ttl="5m")
+def get_series(grain, dimension, members, metric_expr, start, end):
+    query = f"""
+    SELECT PERIOD_START, MEMBER, {metric_expr} AS VALUE
+    FROM {ROLLUP_TABLE}
+    WHERE GRAIN = '{grain}' AND DIMENSION = '{dimension}'
+      AND PERIOD_START >= DATE_TRUNC('{grain}', '{start}'::TIMESTAMP_NTZ)
+      AND PERIOD_START < '{end}'::TIMESTAMP_NTZ
+      {member_filter(members)}
+    GROUP BY PERIOD_START, MEMBER
+    ORDER BY MEMBER, PERIOD_START
+    """
+    df = run_query(session, query, "get_series")
+    # Convert column names to lowercase for consistent access
+    df.columns = df.columns.str.lower()
+    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    return df
+
+def metric_columns():
+    return ", ".join(f'{expr} AS "{label}"' for label, expr in METRICS.items())
+
+def seed_live_buffer(hours):
+    """Last `hours` network-wide hours from the rollup, oldest first"""
+    query = f"""
+    SELECT PERIOD_START, {metric_columns()}
+    FROM {ROLLUP_TABLE}
+    WHERE GRAIN = 'HOUR' AND DIMENSION = 'NETWORK'
+      AND PERIOD_START > DATEADD(HOUR, -{int(hours)}, (
+          SELECT MAX(PERIOD_START) FROM {ROLLUP_TABLE} WHERE GRAIN = 'HOUR' AND DIMENSION = 'NETWORK'))
+    GROUP BY PERIOD_START
+    ORDER BY PERIOD_START
+    """
+    return run_query(session, query, "live_seed")
+
+def poll_newest_hours(after_hour):
+    """KPIs for the CELL_TOWER hours after `after_hour` (only the newest TIMESTAMP partitions are scanned)"""
+    if after_hour is None:
+        since = "(SELECT DATE_TRUNC('HOUR', MAX(TIMESTAMP)) FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER)"
+    else:
+        since = f"'{pd.Timestamp(after_hour) + timedelta(hours=1)}'::TIMESTAMP_NTZ"
+    query = f"""
+    WITH newest AS (
+        SELECT DATE_TRUNC('HOUR', TIMESTAMP) AS PERIOD_START, {LIVE_TOTALS}
+        FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
+        WHERE TIMESTAMP >= {since}
+        GROUP BY PERIOD_START
+    )
+    SELECT PERIOD_START, {metric_columns()}
+    FROM newest
+    GROUP BY PERIOD_START
+    ORDER BY PERIOD_START
+    """
+    return run_query(session, query, "live_poll")
+
+def render_live_tail(metric_label, buffer_hours):
+    """Live panel; runs as a fragment so each poll reruns only this panel"""
+    buffer = st.session_state.get(LIVE_BUFFER_KEY)
+    if buffer is None:
+        seed = seed_live_buffer(buffer_hours)
+        buffer = deque(seed.to_dict('records'), maxlen=buffer_hours)
+    elif buffer.maxlen != buffer_hours:
+        buffer = deque(buffer, maxlen=buffer_hours)
+    st.session_state[LIVE_BUFFER_KEY] = buffer
+
+    newest = poll_newest_hours(buffer[-1]['PERIOD_START'] if buffer else None)
+    # The generator writes each hour in one INSERT, so a polled hour is complete
+    buffer.extend(newest.to_dict('records'))
+
+    if not buffer:
+        st.info("Waiting for measurements...")
+        return
+
+    latest = buffer[-1]
+    previous = buffer[-2] if len(buffer) > 1 else None
+    columns = st.columns(len(LIVE_HEADLINE_METRICS))
+    for column, label in zip(columns, LIVE_HEADLINE_METRICS):
+        value = latest.get(label)
+        delta = None
+        if previous is not None and value is not None and previous.get(label) is not None:
+            delta = f"{float(value) - float(previous[label]):+.2f}"
+        column.metric(label, "n/a" if value is None else f"{float(value):,.2f}", delta, delta_color="inverse")
+
+    live_data = pd.DataFrame(list(buffer))
+    live_data[metric_label] = pd.to_numeric(live_data[metric_label], errors='coerce')
+    fig = px.line(live_data, x='PERIOD_START', y=metric_label, markers=True, labels={'PERIOD_START': ''}, height=320)
+    with timed("chart_render", "live_tail"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        f"Latest data hour: {pd.Timestamp(latest['PERIOD_START']):%Y-%m-%d %H:00} · "
+        f"{len(newest)} new hour(s) this poll · buffer {len(buffer)}/{buffer.maxlen} hours · "
+        f"polled at {datetime.now():%H:%M:%S}"
+    )
+
+try:
+    bounds = get_time_bounds()
+except Exception as e:
+    st.error(f"Could not read the KPI rollup: {str(e)}")
+    st.info("Run Setup/create_kpi_rollups.sql to create and load `RAW.KPI_ROLLUP`.")
+    render_perf_panel(session)
+    st.stop()
+
+if pd.isna(bounds['LAST_HOUR']):
+    st.warning("The KPI rollup is empty. Run `CALL RAW.SP_REBUILD_KPI_ROLLUP();` to load it.")
+    render_perf_panel(session)
+    st.stop()
+
+first_day = pd.Timestamp(bounds['FIRST_HOUR']).date()
+last_day = pd.Timestamp(bounds['LAST_HOUR']).date()
+
+# Sidebar options
+st.sidebar.header("Time-Series Options")
+metric_label = st.sidebar.selectbox("KPI", list(METRICS), index=0)
+metric_expr = METRICS[metric_label]
+
+live_mode = st.sidebar.toggle(
+    "Live tail", value=False,
+    help="Poll only the newest measurement hours and append them to a fixed-length buffer, "
+         "refreshing just the live panel instead of the whole page."
+)
+if live_mode:
+    poll_seconds = st.sidebar.slider("Poll interval (seconds)", min_value=5, max_value=60, value=10, step=5)
+    buffer_hours = st.sidebar.slider("Live window (hours)", min_value=24, max_value=336, value=72, step=24)
+    st.subheader(f"🔴 Live Tail: {metric_label} (whole network)")
+    st.fragment(run_every=poll_seconds)(render_live_tail)(metric_label, buffer_hours)
+else:
+    st.session_state.pop(LIVE_BUFFER_KEY, None)
+
+dimension_label = st.sidebar.selectbox("Break down by", list(DIMENSIONS), index=0)
+dimension = DIMENSIONS[dimension_label]
+
+date_range = st.sidebar.date_input(
+    "Date range",
+    value=(max(first_day, last_day - timedelta(days=30)), last_day),
+    min_value=first_day,
+    max_value=last_day
+)
+# date_input returns a single date while the user is still picking the range
+if not isinstance(date_range, (list, tuple)) or len(date_range) != 2:
+    st.info("Select a start and end date.")
+    render_perf_panel(session)
+    st.stop()
+range_start = datetime.combine(date_range[0], time.min)
+range_end = datetime.combine(date_range[1], time.min) + timedelta(days=1)
+
+# Only offer grains that keep each series within the period budget
+allowed_grains = [g for g in GRAINS if periods_in_span(range_start, range_end, g) <= MAX_PERIODS_PER_SERIES]
+grain_choice = st.sidebar.selectbox(
+    "Granularity",
+    ["Auto"] + allowed_grains,
+    format_func=lambda g: g if g == "Auto" else GRAIN_LABELS[g],
+    help="Auto uses the finest granularity that keeps each series within "
+         f"{MAX_PERIODS_PER_SERIES:,} periods for the selected range."
+)
+grain = pick_grain(range_start, range_end) if grain_choice == "Auto" else grain_choice
+
+max_points = st.sidebar.slider(
+    "Max points per chart", min_value=200, max_value=5000, value=1500, step=100,
+    help="Series are downsampled with LTTB (Largest-Triangle-Three-Buckets) to stay within this many points."
+)
+
+# Which members to plot
+members = None
+if dimension in ("VENDOR", "REGION"):
+    options = get_members(dimension)
+    members = st.sidebar.multiselect(
+        f"{dimension_label}s", options, default=options[:MAX_SERIES], max_selections=MAX_SERIES
+    )
+elif dimension == "CELL":
+    cell_mode = st.sidebar.radio("Cells", ["Highest KPI in range", "Choose cells"], index=0)
+    if cell_mode == "Highest KPI in range":
+        top_n = st.sidebar.slider("Number of cells", min_value=1, max_value=MAX_SERIES, value=10)
+        members = get_top_members(dimension, metric_expr, range_start, range_end, top_n)
+    else:
+        members = st.sidebar.multiselect("Cell IDs", get_members(dimension), max_selections=MAX_SERIES)
+
+if members is not None and not members:
+    st.info(f"Select at least one {dimension_label.lower()} to plot.")
+    render_perf_panel(session)
+    st.stop()
+
+series = get_series(grain, dimension, tuple(members or ()), metric_expr, range_start, range_end)
+
+if series.empty:
+    st.info("No data for the selected range.")
+    render_perf_panel(session)
+    st.stop()
+
+with timed("downsample", grain):
+    plot_data = downsample(series, 'period_start', 'value', 'member', max_points)
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Granularity", GRAIN_LABELS[grain])
+col2.metric("Series", f"{series['member'].nunique():,}")
+col3.metric("Rows Fetched", f"{len(series):,}")
+col4.metric("Points Plotted", f"{len(plot_data):,}")
+
+st.subheader(f"{metric_label} by {dimension_label} ({GRAIN_LABELS[grain].lower()})")
+fig = px.line(
+    plot_data,
+    x='period_start',
+    y='value',
+    color='member' if dimension != "NETWORK" else None,
+    labels={'period_start': '', 'value': metric_label, 'member': dimension_label},
+    height=500
+)
+fig.update_layout(hovermode='x unified')
+with timed("chart_render", "kpi_trend"):
+    st.plotly_chart(fig, use_container_width=True)
+
+if len(plot_data) < len(series):
+    st.caption(f"Downsampled from {len(series):,} to {len(plot_data):,} points with LTTB; peaks and troughs are preserved.")
+
+# Per-series summary over the full (not downsampled) data
+st.subheader("Summary")
+summary = series.groupby('member')['value'].agg(['mean', 'min', 'max', 'last']).reset_index()
+summary.columns = [dimension_label, 'Average', 'Minimum', 'Maximum', 'Latest']
+st.dataframe(summary.round(2), use_container_width=True, hide_index=True)
+
+with st.expander("Show data"):
+    st.dataframe(series, use_container_width=True, hide_index=True)
+
+# Stage timings for this run
+render_perf_panel(session)
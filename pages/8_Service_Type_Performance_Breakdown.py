@@ -1,4 +1,10 @@
 import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime, time, timedelta
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+from utils.timeseries import GRAINS, pick_grain
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -9,4 +15,279 @@ st.set_page_config(
 )
 
 st.title("🔄 Service Type Breakdown")
-st.info("This page is under development. Check back soon!") 
\ No newline at end of file
+st.markdown("""
+Compare network performance across service categories (VOICE, GPRS, SMS) and customer pain across
+ticket service types (Cellular, Home Internet, Business Internet), then drill down by vendor, region and cell.
+
+Every view is a roll-up over two small pre-aggregated cubes: `RAW.SERVICE_CATEGORY_CUBE`, with totals per
+hour, cell and service category, and `RAW.SERVICE_TYPE_CUBE`, with ticket totals per cell and service type.
+A task keeps both up to date, so this page never scans `CELL_TOWER` or `SUPPORT_TICKETS`.
+""")
+
+CATEGORY_CUBE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SERVICE_CATEGORY_CUBE"
+TYPE_CUBE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SERVICE_TYPE_CUBE"
+
+# Rollup grain -> label for the trend chart title
+GRAIN_ADJECTIVES = {"HOUR": "hourly", "DAY": "daily", "WEEK": "weekly"}
+
+# KPI label -> expression over the additive SERVICE_CATEGORY_CUBE totals
+CATEGORY_METRICS = {
+    "Failure Rate (%)": "SUM(FAILED_EVENTS) * 100.0 / NULLIF(SUM(EVENT_ROWS), 0)",
+    "Events": "SUM(EVENT_ROWS)",
+    "Average Duration": "SUM(DURATION_SUM) / NULLIF(SUM(DURATION_ROWS), 0)",
+    "Charged Units": "SUM(CHARGED_UNITS_SUM)",
+    "RRC Failure Rate (%)": "(SUM(RRC_ATT_SUM) - SUM(RRC_SUCC_SUM)) * 100.0 / NULLIF(SUM(RRC_ATT_SUM), 0)",
+    "Downlink Latency": "SUM(LATENCY_DL_SUM) / NULLIF(SUM(LATENCY_DL_ROWS), 0)",
+    "PRB Utilization Downlink": "SUM(PRB_DL_SUM) / NULLIF(SUM(PRB_DL_ROWS), 0)",
+    "E-RAB Abnormal Release": "SUM(ERAB_ABNORMAL_SUM) / NULLIF(SUM(ERAB_ABNORMAL_ROWS), 0)",
+}
+
+# KPI label -> expression over the additive SERVICE_TYPE_CUBE totals
+TYPE_METRICS = {
+    "Tickets": "SUM(TICKET_COUNT)",
+    "Negative Tickets": "SUM(NEGATIVE_TICKET_COUNT)",
+    "Negative Share (%)": "SUM(NEGATIVE_TICKET_COUNT) * 100.0 / NULLIF(SUM(TICKET_COUNT), 0)",
+    "Average Sentiment": "SUM(SENTIMENT_SUM) / NULLIF(SUM(SENTIMENT_ROWS), 0)",
+}
+
+# Drilldown label -> cube column
+BREAKDOWNS = {
+    "Vendor": "VENDOR_NAME",
+    "Region": "REGION",
+}
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Service Type Breakdown")
+
+def metric_columns(metrics):
+    return ", ".join(f'{expr} AS "{label}"' for label, expr in metrics.items())
+
+def to_numeric(df, metrics):
+    """Snowflake NUMBER results can arrive as Decimal objects; make the KPI columns floats"""
+    df[list(metrics)] = df[list(metrics)].apply(pd.to_numeric, errors="coerce")
+    return df
+
+def build_filter(vendors, regions, start=None, end=None):
+    """WHERE clause for the sidebar filters (values come from DIM_CELL)"""
+    conditions = ["1 = 1"]
+    if start is not None:
+        conditions.append(f"TS_HOUR >= '{start}'::TIMESTAMP_NTZ AND TS_HOUR < '{end}'::TIMESTAMP_NTZ")
+    for column, values in (("VENDOR_NAME", vendors), ("REGION", regions)):
+        if values:
+            value_list = ", ".join("'" + v.replace("'", "''") + "'" for v in values)
+            conditions.append(f"{column} IN ({value_list})")
+    return " AND ".join(conditions)
+
+@st.cache_data(ttl="2m")
+def get_cube_bounds():
+    query = f"""
+    SELECT MIN(TS_HOUR) AS FIRST_HOUR, MAX(TS_HOUR) AS LAST_HOUR, MAX(UPDATED_AT) AS LAST_REFRESH
+    FROM {CATEGORY_CUBE}
+    """
+    return run_query(session, query, "get_cube_bounds").iloc[0]
+
+@st.cache_data(ttl="10m")
+def get_dimension_values(column):
+    query = f"""
+    SELECT DISTINCT {column} AS VALUE
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL
+    WHERE {column} IS NOT NULL
+    ORDER BY VALUE
+    """
+    return run_query(session, query, "get_dimension_values")["VALUE"].tolist()
+
+@st.cache_data(ttl="2m")
+def rollup_categories(where_clause, group_columns):
+    """SERVICE_CATEGORY_CUBE rolled up to the given columns"""
+    group_by = ", ".join(group_columns)
+    query = f"""
+    SELECT {group_by}, {metric_columns(CATEGORY_METRICS)}
+    FROM {CATEGORY_CUBE}
+    WHERE {where_clause}
+    GROUP BY {group_by}
+    ORDER BY {group_by}
+    """
+    return to_numeric(run_query(session, query, "rollup_categories"), CATEGORY_METRICS)
+
+@st.cache_data(ttl="2m")
+def rollup_category_trend(where_clause, grain):
+    query = f"""
+    SELECT DATE_TRUNC('{grain}', TS_HOUR) AS PERIOD_START, SERVICE_CATEGORY, {metric_columns(CATEGORY_METRICS)}
+    FROM {CATEGORY_CUBE}
+    WHERE {where_clause}
+    GROUP BY PERIOD_START, SERVICE_CATEGORY
+    ORDER BY SERVICE_CATEGORY, PERIOD_START
+    """
+    return to_numeric(run_query(session, query, "rollup_category_trend"), CATEGORY_METRICS)
+
+@st.cache_data(ttl="2m")
+def get_top_cells(where_clause, service_category, metric_label, k):
+    """Server-side top-K cells for one service category"""
+    category = service_category.replace("'", "''")
+    query = f"""
+    SELECT CELL_ID, ANY_VALUE(VENDOR_NAME) AS VENDOR_NAME, ANY_VALUE(REGION) AS REGION,
+           {metric_columns(CATEGORY_METRICS)}
+    FROM {CATEGORY_CUBE}
+    WHERE {where_clause} AND SERVICE_CATEGORY = '{category}'
+    GROUP BY CELL_ID
+    HAVING SUM(EVENT_ROWS) > 0
+    ORDER BY "{metric_label}" DESC NULLS LAST, CELL_ID
+    LIMIT {int(k)}
+    """
+    return to_numeric(run_query(session, query, "get_top_cells"), CATEGORY_METRICS)
+
+@st.cache_data(ttl="2m")
+def rollup_service_types(where_clause, group_columns):
+    """SERVICE_TYPE_CUBE rolled up to the given columns"""
+    group_by = ", ".join(group_columns)
+    query = f"""
+    SELECT {group_by}, {metric_columns(TYPE_METRICS)}
+    FROM {TYPE_CUBE}
+    WHERE {where_clause}
+    GROUP BY {group_by}
+    ORDER BY {group_by}
+    """
+    return to_numeric(run_query(session, query, "rollup_service_types"), TYPE_METRICS)
+
+try:
+    bounds = get_cube_bounds()
+except Exception as e:
+    st.error(f"Could not read the service cubes: {str(e)}")
+    st.info("Run Setup/create_service_cubes.sql to create and load them.")
+    render_perf_panel(session)
+    st.stop()
+
+if pd.isna(bounds['LAST_HOUR']):
+    st.warning("The service cubes are empty. Run `CALL RAW.SP_REBUILD_SERVICE_CUBES();` to load them.")
+    render_perf_panel(session)
+    st.stop()
+
+first_day = pd.Timestamp(bounds['FIRST_HOUR']).date()
+last_day = pd.Timestamp(bounds['LAST_HOUR']).date()
+
+# Sidebar options
+st.sidebar.header("Breakdown Options")
+date_range = st.sidebar.date_input(
+    "Date range",
+    value=(first_day, last_day),
+    min_value=first_day,
+    max_value=last_day,
+    help="Applies to network measurements. Support tickets have no timestamp and always cover all history."
+)
+# date_input returns a single date while the user is still picking the range
+if not isinstance(date_range, (list, tuple)) or len(date_range) != 2:
+    st.info("Select a start and end date.")
+    render_perf_panel(session)
+    st.stop()
+range_start = datetime.combine(date_range[0], time.min)
+range_end = datetime.combine(date_range[1], time.min) + timedelta(days=1)
+
+selected_vendors = st.sidebar.multiselect("Vendors", get_dimension_values("VENDOR_NAME"))
+selected_regions = st.sidebar.multiselect("Regions", get_dimension_values("REGION"))
+metric_label = st.sidebar.selectbox("Network KPI", list(CATEGORY_METRICS), index=0)
+breakdown_label = st.sidebar.selectbox("Drill down by", list(BREAKDOWNS), index=0)
+breakdown_column = BREAKDOWNS[breakdown_label]
+
+category_filter = build_filter(selected_vendors, selected_regions, range_start, range_end)
+type_filter = build_filter(selected_vendors, selected_regions)
+
+by_category = rollup_categories(category_filter, ("SERVICE_CATEGORY",))
+if by_category.empty:
+    st.info("No measurements match the selected filters.")
+    render_perf_panel(session)
+    st.stop()
+
+# Headline numbers
+total_events = by_category["Events"].sum()
+failure_rate = (by_category["Events"] * by_category["Failure Rate (%)"]).sum() / max(total_events, 1)
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Events", f"{int(total_events):,}")
+col2.metric("Failure Rate", f"{failure_rate:.2f}%")
+col3.metric("Service Categories", f"{len(by_category):,}")
+col4.metric("Last Refresh", "n/a" if pd.isna(bounds['LAST_REFRESH']) else pd.Timestamp(bounds['LAST_REFRESH']).strftime("%Y-%m-%d %H:%M"))
+
+tab1, tab2, tab3, tab4 = st.tabs(["📊 Service Categories", "📈 Trend", "🔍 Drilldown", "🎫 Ticket Service Types"])
+
+with tab1:
+    st.subheader(f"{metric_label} by Service Category")
+    col1, col2 = st.columns(2)
+    fig = px.bar(by_category, x="SERVICE_CATEGORY", y=metric_label, color="SERVICE_CATEGORY",
+                 labels={"SERVICE_CATEGORY": "Service Category"})
+    with timed("chart_render", "category_kpi"):
+        col1.plotly_chart(fig, use_container_width=True)
+    fig = px.pie(by_category, names="SERVICE_CATEGORY", values="Events", title="Share of Events")
+    with timed("chart_render", "category_share"):
+        col2.plotly_chart(fig, use_container_width=True)
+
+    st.subheader(f"Service Category × {breakdown_label}")
+    by_breakdown = rollup_categories(category_filter, ("SERVICE_CATEGORY", breakdown_column))
+    heatmap = by_breakdown.pivot_table(
+        index=breakdown_column, columns="SERVICE_CATEGORY", values=metric_label, aggfunc="first"
+    )
+    fig = px.imshow(heatmap, text_auto=".2f", aspect="auto", color_continuous_scale="Reds",
+                    labels={"x": "Service Category", "y": breakdown_label, "color": metric_label},
+                    height=max(350, 28 * len(heatmap)))
+    with timed("chart_render", "category_heatmap"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(by_category.round(2), use_container_width=True, hide_index=True)
+
+with tab2:
+    grain = pick_grain(range_start, range_end)
+    st.subheader(f"{metric_label} over Time ({GRAIN_ADJECTIVES[grain]})")
+    trend = rollup_category_trend(category_filter, grain)
+    fig = px.line(trend, x="PERIOD_START", y=metric_label, color="SERVICE_CATEGORY",
+                  labels={"PERIOD_START": "", "SERVICE_CATEGORY": "Service Category"}, height=450)
+    with timed("chart_render", "category_trend"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Granularity picked automatically for the selected range ({', '.join(g.lower() for g in GRAINS)}).")
+
+with tab3:
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        drill_category = st.selectbox("Service category", by_category["SERVICE_CATEGORY"].tolist())
+        top_k = st.slider("Cells to show", min_value=5, max_value=50, value=15, step=5)
+    with col2:
+        st.subheader(f"{breakdown_label}s for {drill_category}")
+        drill = by_breakdown[by_breakdown["SERVICE_CATEGORY"] == drill_category].copy()
+        drill = drill.sort_values(metric_label, ascending=False)
+        fig = px.bar(drill, x=breakdown_column, y=metric_label, labels={breakdown_column: breakdown_label})
+        with timed("chart_render", "drilldown_breakdown"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader(f"Top {top_k} Cells for {drill_category} by {metric_label}")
+    top_cells = get_top_cells(category_filter, drill_category, metric_label, top_k)
+    st.dataframe(top_cells.round(2), use_container_width=True, hide_index=True)
+
+with tab4:
+    st.subheader("Support Tickets by Service Type")
+    st.caption("Tickets have no timestamp, so the date range does not apply here; vendor and region filters do.")
+    by_type = rollup_service_types(type_filter, ("SERVICE_TYPE",))
+    if by_type.empty:
+        st.info("No tickets match the selected filters.")
+    else:
+        col1, col2, col3 = st.columns(3)
+        fig = px.bar(by_type, x="SERVICE_TYPE", y="Tickets", color="SERVICE_TYPE", labels={"SERVICE_TYPE": ""})
+        with timed("chart_render", "service_type_tickets"):
+            col1.plotly_chart(fig, use_container_width=True)
+        fig = px.bar(by_type, x="SERVICE_TYPE", y="Average Sentiment", color="SERVICE_TYPE", labels={"SERVICE_TYPE": ""})
+        with timed("chart_render", "service_type_sentiment"):
+            col2.plotly_chart(fig, use_container_width=True)
+        fig = px.bar(by_type, x="SERVICE_TYPE", y="Negative Share (%)", color="SERVICE_TYPE", labels={"SERVICE_TYPE": ""})
+        with timed("chart_render", "service_type_negative"):
+            col3.plotly_chart(fig, use_container_width=True)
+
+        st.subheader(f"Service Type × {breakdown_label}")
+        type_breakdown = rollup_service_types(type_filter, ("SERVICE_TYPE", breakdown_column))
+        fig = px.bar(type_breakdown, x=breakdown_column, y="Tickets", color="SERVICE_TYPE", barmode="stack",
+                     labels={breakdown_column: breakdown_label, "SERVICE_TYPE": "Service Type"})
+        with timed("chart_render", "service_type_breakdown"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(by_type.round(3), use_container_width=True, hide_index=True)
+
+# Stage timings for this run
+render_perf_panel(session)
@@ -1,4 +1,11 @@
 import streamlit as st
+import pandas as pd
+import plotly.express as px
+from snowflake.snowpark.context import get_active_session
+from utils.instrumentation import start_run, timed, run_query, render_perf_panel
+from utils.prioritization import (
+    PriorityRanker, QUADRANTS, IMPACT_THRESHOLD, EFFORT_THRESHOLD, IMPACT_WEIGHTS, EFFORT_WEIGHTS,
+)
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -9,4 +16,164 @@ st.set_page_config(
 )
 
 st.title("⚠️ Issue Prioritization Matrix")
-st.info("This page is under development. Check back soon!") 
\ No newline at end of file
+st.markdown("""
+Rank every tower by the **impact** of its problems (support tickets, negative sentiment, failed calls from Gold
+customers and call failure rate) against the **effort** to fix them (vendor, performance tier and PRB headroom).
+
+Inputs come from the tower scorecard (`RAW.TOWER_SCORECARD`) and the loyalty bridge (`RAW.CELL_LOYALTY_BRIDGE`).
+Scores are kept for the session: each rerun fetches only the towers the refresh tasks have updated since the last
+run and re-scores just those, so the ranking stays fast as towers and refresh frequency grow.
+""")
+
+SCORECARD_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.TOWER_SCORECARD"
+BRIDGE_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_LOYALTY_BRIDGE"
+RANKER_KEY = "_priority_ranker"
+
+QUADRANT_COLORS = {
+    "Quick Wins": "#2ca02c",
+    "Major Projects": "#d62728",
+    "Fill-ins": "#1f77b4",
+    "Deprioritize": "#9e9e9e",
+}
+
+# Initialize Snowpark session
+@st.cache_resource
+def init_session():
+    return get_active_session()
+
+session = init_session()
+start_run("Issue Prioritization")
+
+def fetch_changed_towers(since):
+    """Scoring inputs for the towers updated after since (all towers when it is None)"""
+    changed_filter = ""
+    if since is not None:
+        changed_filter = f"WHERE GREATEST_IGNORE_NULLS(s.UPDATED_AT, g.UPDATED_AT) > '{since}'::TIMESTAMP_NTZ"
+    query = f"""
+    WITH gold AS (
+        SELECT
+            CELL_ID,
+            SUM(IFF(LOYALTY_STATUS = 'Gold', FAILED_CALLS, 0)) AS GOLD_FAILED_CALLS,
+            MAX(UPDATED_AT) AS UPDATED_AT
+        FROM {BRIDGE_TABLE}
+        GROUP BY CELL_ID
+    )
+    SELECT
+        s.CELL_ID,
+        s.VENDOR_NAME,
+        s.BID_DESCRIPTION,
+        s.PERFORMANCE_TIER,
+        s.TICKET_COUNT,
+        s.NEGATIVE_TICKET_COUNT,
+        s.MEASUREMENT_ROWS,
+        s.FAILED_CALLS,
+        s.PRB_DL_SUM / NULLIF(s.PRB_DL_ROWS, 0) AS AVG_PRB_UTIL_DL,
+        COALESCE(g.GOLD_FAILED_CALLS, 0) AS GOLD_FAILED_CALLS,
+        GREATEST_IGNORE_NULLS(s.UPDATED_AT, g.UPDATED_AT) AS UPDATED_AT
+    FROM {SCORECARD_TABLE} s
+    LEFT JOIN gold g ON g.CELL_ID = s.CELL_ID
+    {changed_filter}
+    """
+    return run_query(session, query, "fetch_changed_towers" if since is not None else "fetch_all_towers")
+
+# Sidebar options
+st.sidebar.header("Prioritization Options")
+if st.sidebar.button("Re-score all towers"):
+    st.session_state.pop(RANKER_KEY, None)
+
+ranker = st.session_state.setdefault(RANKER_KEY, PriorityRanker())
+
+try:
+    changed = fetch_changed_towers(ranker.fetch_since)
+except Exception as e:
+    st.error(f"Could not read the scoring inputs: {str(e)}")
+    st.info("Run Setup/create_tower_scorecard.sql and Setup/create_loyalty_bridge.sql to create the input tables.")
+    render_perf_panel(session)
+    st.stop()
+
+with timed("score", "rescore_changed"):
+    rescored = ranker.update(changed)
+
+if ranker.scores.empty:
+    st.info("No towers in the scorecard yet.")
+    render_perf_panel(session)
+    st.stop()
+
+scores = ranker.scores
+vendor_options = sorted(scores["VENDOR_NAME"].dropna().unique().tolist())
+selected_vendors = st.sidebar.multiselect("Vendors", vendor_options)
+min_tickets = st.sidebar.number_input("Minimum tickets", min_value=0, value=0, step=1)
+top_k = st.sidebar.slider("Towers to rank", min_value=5, max_value=100, value=20, step=5)
+st.sidebar.caption(
+    f"Re-scored {rescored:,} of {len(scores):,} towers this run"
+    + (f" (inputs as of {ranker.watermark:%Y-%m-%d %H:%M})" if ranker.watermark is not None else "")
+)
+
+mask = scores["TICKET_COUNT"] >= min_tickets
+if selected_vendors:
+    mask &= scores["VENDOR_NAME"].isin(selected_vendors)
+filtered = scores[mask]
+filtered_ids = None if mask.all() else set(filtered.index)
+
+if filtered.empty:
+    st.info("No towers match the selected filters.")
+    render_perf_panel(session)
+    st.stop()
+
+# Headline numbers
+col1, col2, col3, col4 = st.columns(4)
+quadrant_counts = filtered["QUADRANT"].value_counts()
+for column, quadrant in zip([col1, col2, col3, col4], QUADRANTS):
+    column.metric(quadrant, f"{int(quadrant_counts.get(quadrant, 0)):,}")
+
+tab1, tab2, tab3 = st.tabs(["🎯 Matrix", "📋 Priority List", "⚖️ Scoring"])
+
+with tab1:
+    st.subheader("Impact vs Effort")
+    plot_data = filtered.reset_index()
+    plot_data["CELL_ID"] = plot_data["CELL_ID"].astype(str)
+    fig = px.scatter(
+        plot_data, x="EFFORT_SCORE", y="IMPACT_SCORE", color="QUADRANT",
+        color_discrete_map=QUADRANT_COLORS, category_orders={"QUADRANT": QUADRANTS},
+        hover_data=["CELL_ID", "VENDOR_NAME", "PERFORMANCE_TIER", "TICKET_COUNT", "FAILURE_RATE", "PRIORITY_SCORE"],
+        labels={"EFFORT_SCORE": "Effort", "IMPACT_SCORE": "Impact", "QUADRANT": "Quadrant"},
+        opacity=0.6,
+    )
+    fig.add_hline(y=IMPACT_THRESHOLD, line_dash="dash", line_color="gray")
+    fig.add_vline(x=EFFORT_THRESHOLD, line_dash="dash", line_color="gray")
+    fig.update_layout(height=600, xaxis_range=[0, 1], yaxis_range=[0, 1])
+    with timed("chart_render", "priority_matrix"):
+        st.plotly_chart(fig, use_container_width=True)
+
+with tab2:
+    st.subheader(f"Top {top_k} Towers by Priority")
+    with timed("rank", "top_k"):
+        top = ranker.top_k(top_k, filtered_ids)
+    top = top.reset_index()
+    st.dataframe(
+        top[["CELL_ID", "VENDOR_NAME", "BID_DESCRIPTION", "PERFORMANCE_TIER", "QUADRANT", "PRIORITY_SCORE",
+             "IMPACT_SCORE", "EFFORT_SCORE", "TICKET_COUNT", "NEGATIVE_TICKET_COUNT", "GOLD_FAILED_CALLS",
+             "FAILURE_RATE", "AVG_PRB_UTIL_DL"]],
+        use_container_width=True, hide_index=True,
+    )
+    csv = top.to_csv(index=False)
+    st.download_button("Download priority list", csv, "priority_list.csv", "text/csv")
+
+with tab3:
+    st.subheader("How the Scores Are Built")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Impact** (0-1)")
+        st.dataframe(pd.DataFrame(IMPACT_WEIGHTS.items(), columns=["Component", "Weight"]), hide_index=True)
+    with col2:
+        st.markdown("**Effort** (0-1)")
+        st.dataframe(pd.DataFrame(EFFORT_WEIGHTS.items(), columns=["Component", "Weight"]), hide_index=True)
+    st.markdown("""
+    - Each component is scaled against a fixed reference (ticket and Gold counts on a log scale), so a tower's
+      score depends only on its own inputs and unchanged towers never need re-scoring.
+    - **Priority** = impact × (1 − 0.5 × effort): high-impact towers lead, and cheaper fixes break ties.
+    - **Quick Wins** are high impact and low effort; **Major Projects** high impact and high effort.
+    """)
+
+# Stage timings for this run
+render_perf_panel(session)
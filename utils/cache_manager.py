@@ -0,0 +1,256 @@
+"""
+Memory-bounded cache shared by every session of the app.
+
+st.cache_data has no notion of how much memory its entries take, and the only
+way to drop stale data from a page was st.cache_data.clear(), which wipes
+every cache of every user. CacheManager keeps a single process-wide store
+instead:
+
+- each entry's size is measured when it is stored (deep size for DataFrames)
+- entries expire after their TTL, and the least recently used entries are
+  evicted whenever the total exceeds the global byte budget
+- entries can belong to a dataset; when set_watermark() sees a new watermark
+  for a dataset, only that dataset's older entries are dropped
+- hits, misses, expirations and evictions are counted per namespace and shown
+  on the Cache Manager admin page
+
+Use the decorator for derived values, e.g.
+
+    @managed_cache("geo_quantiles", dataset="network")
+    def get_quantiles(df_column, num_quantiles=20):
+        ...
+
+Arguments are hashed like st.cache_data does (DataFrames and Series by
+content); parameters whose name starts with an underscore are not hashed.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DEFAULT_BUDGET_MB = 512
+
+STAT_COUNTERS = ("hits", "misses", "expirations", "evictions", "invalidations", "oversize")
+
+
+def entry_size(value):
+    """Approximate memory held by a cached value, in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(entry_size(k) + entry_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(entry_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _hash_value(value, digest):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(type(value).__name__.encode())
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}[{len(value)}]".encode())
+        for v in value:
+            _hash_value(v, digest)
+    elif isinstance(value, dict):
+        digest.update(f"dict[{len(value)}]".encode())
+        for k in sorted(value, key=repr):
+            _hash_value(k, digest)
+            _hash_value(value[k], digest)
+    else:
+        digest.update(repr(value).encode())
+
+
+def hash_arguments(func, args, kwargs):
+    """Cache key for a call: hash of the bound arguments, skipping _-prefixed parameters"""
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    digest = hashlib.md5()
+    for name, value in bound.arguments.items():
+        if name.startswith("_"):
+            continue
+        digest.update(name.encode())
+        _hash_value(value, digest)
+    return digest.hexdigest()
+
+
+class CacheManager:
+    """Process-wide LRU/TTL cache with a byte budget and dataset watermarks"""
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # (namespace, key) -> entry, least recently used first
+        self._watermarks = {}          # dataset -> current watermark
+        self._stats = {}
+        self._lock = threading.RLock()
+
+    def _count(self, namespace, counter, n=1):
+        stats = self._stats.setdefault(namespace, dict.fromkeys(STAT_COUNTERS, 0))
+        stats[counter] += n
+
+    def _remove(self, entry_key, counter):
+        entry = self._entries.pop(entry_key)
+        self.total_bytes -= entry["size"]
+        self._count(entry_key[0], counter)
+
+    def _evict_to_budget(self):
+        while self.total_bytes > self.budget_bytes and self._entries:
+            self._remove(next(iter(self._entries)), "evictions")
+
+    def get(self, namespace, key):
+        """(True, value) for a live entry, (False, None) otherwise"""
+        entry_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                self._count(namespace, "misses")
+                return False, None
+            if entry["expires_at"] is not None and entry["expires_at"] < time.time():
+                self._remove(entry_key, "expirations")
+                self._count(namespace, "misses")
+                return False, None
+            self._entries.move_to_end(entry_key)
+            entry["hits"] += 1
+            entry["last_access"] = time.time()
+            self._count(namespace, "hits")
+            return True, entry["value"]
+
+    def put(self, namespace, key, value, ttl_seconds=None, dataset=None):
+        """Store a value; it is tagged with the dataset's current watermark"""
+        size = entry_size(value)
+        entry_key = (namespace, key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._remove(entry_key, "invalidations")
+            if size > self.budget_bytes:
+                self._count(namespace, "oversize")
+                return
+            now = time.time()
+            self._entries[entry_key] = {
+                "value": value,
+                "size": size,
+                "dataset": dataset,
+                "watermark": self._watermarks.get(dataset) if dataset else None,
+                "created_at": now,
+                "last_access": now,
+                "expires_at": now + ttl_seconds if ttl_seconds else None,
+                "hits": 0,
+            }
+            self.total_bytes += size
+            self._evict_to_budget()
+
+    def set_watermark(self, dataset, watermark):
+        """Record the dataset's current watermark and drop its entries from older ones"""
+        with self._lock:
+            if self._watermarks.get(dataset) == watermark:
+                return 0
+            self._watermarks[dataset] = watermark
+            return self.invalidate(dataset=dataset, keep_watermark=watermark)
+
+    def invalidate(self, namespace=None, dataset=None, keep_watermark=None):
+        """Drop the entries of a namespace and/or dataset (all entries when neither is given)"""
+        with self._lock:
+            stale = [
+                k for k, e in self._entries.items()
+                if (namespace is None or k[0] == namespace)
+                and (dataset is None or e["dataset"] == dataset)
+                and (keep_watermark is None or e["watermark"] != keep_watermark)
+            ]
+            for entry_key in stale:
+                self._remove(entry_key, "invalidations")
+            return len(stale)
+
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict_to_budget()
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {}
+
+    def watermarks(self):
+        with self._lock:
+            return dict(self._watermarks)
+
+    def stats(self):
+        """Counters, entry count and bytes per namespace"""
+        with self._lock:
+            rows = {ns: dict(counters, entries=0, bytes=0) for ns, counters in self._stats.items()}
+            for (namespace, _), entry in self._entries.items():
+                row = rows.setdefault(namespace, dict(dict.fromkeys(STAT_COUNTERS, 0), entries=0, bytes=0))
+                row["entries"] += 1
+                row["bytes"] += entry["size"]
+        df = pd.DataFrame.from_dict(rows, orient="index",
+                                    columns=list(STAT_COUNTERS) + ["entries", "bytes"])
+        df.index.name = "namespace"
+        df = df.reset_index()
+        lookups = df["hits"] + df["misses"]
+        df["hit_rate"] = (df["hits"] * 100.0 / lookups.where(lookups > 0)).round(1)
+        return df.sort_values("bytes", ascending=False)
+
+    def entries(self):
+        """One row per cached entry, most recently used first"""
+        now = time.time()
+        with self._lock:
+            rows = [
+                {
+                    "namespace": namespace,
+                    "key": key,
+                    "dataset": e["dataset"],
+                    "watermark": e["watermark"],
+                    "bytes": e["size"],
+                    "hits": e["hits"],
+                    "age_s": round(now - e["created_at"], 1),
+                    "idle_s": round(now - e["last_access"], 1),
+                    "expires_at": datetime.fromtimestamp(e["expires_at"]) if e["expires_at"] else None,
+                }
+                for (namespace, key), e in reversed(self._entries.items())
+            ]
+        return pd.DataFrame(rows, columns=["namespace", "key", "dataset", "watermark", "bytes",
+                                           "hits", "age_s", "idle_s", "expires_at"])
+
+
+@st.cache_resource
+def get_cache_manager():
+    """The app's single CacheManager (shared by all sessions)"""
+    return CacheManager(DEFAULT_BUDGET_MB * 1024 * 1024)
+
+
+def managed_cache(namespace, ttl_seconds=None, dataset=None, copy_on_read=False):
+    """Cache a function's results in the CacheManager
+
+    Pass copy_on_read=True when callers may modify the returned value.
+    Concurrent misses on the same key may each compute the value once.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            manager = get_cache_manager()
+            key = f"{func.__name__}:{hash_arguments(func, args, kwargs)}"
+            hit, value = manager.get(namespace, key)
+            if not hit:
+                value = func(*args, **kwargs)
+                manager.put(namespace, key, value, ttl_seconds=ttl_seconds, dataset=dataset)
+            return copy.deepcopy(value) if copy_on_read else value
+        return wrapper
+    return decorator
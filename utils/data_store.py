@@ -0,0 +1,162 @@
+"""
+Per-cell data snapshot shared by the Streamlit pages.
+
+Geospatial Analysis and Correlation Analytics both need the same per-cell
+network aggregates and per-cell ticket aggregates. Instead of each page caching
+its own copy under its own keys, they call get_snapshot(), which returns one
+cached snapshot for the whole app:
+
+    snapshot = get_snapshot(session)
+    cell_data, ticket_data = snapshot["cell_data"], snapshot["ticket_data"]
+
+The snapshot is versioned by a data watermark: row counts and last-altered
+times of the source tables, read from INFORMATION_SCHEMA. The watermark check
+is throttled to one metadata query per WATERMARK_TTL_SECONDS for the whole app,
+so a warm rerun usually issues no query at all (the Performance panel only
+writes when recording is switched on), and new data yields a new version on
+the next check. A snapshot is always loaded after a fresh watermark read and
+stored under that watermark, so rows that land during the load are at worst
+loaded twice, never skipped.
+Snapshots live in the app's CacheManager under the DATASET dataset: a new
+watermark drops the previous snapshot and everything derived from it, and
+the manager's byte budget bounds the memory they use.
+"""
+
+import streamlit as st
+
+from utils.cache_manager import get_cache_manager
+from utils.instrumentation import run_query
+
+SOURCE_TABLES = ("CELL_TOWER", "SUPPORT_TICKETS", "DIM_CELL")
+
+# How long a watermark check is reused before INFORMATION_SCHEMA is asked again
+WATERMARK_TTL_SECONDS = 30
+
+# CacheManager dataset and namespace of the snapshot
+DATASET = "network"
+SNAPSHOT_NAMESPACE = "data_snapshot"
+
+# Precomputed H3 keys in DIM_CELL, one column per resolution (4-11)
+H3_COLUMNS = ", ".join(f"d.h3_res{res}" for res in range(4, 12))
+
+CELL_DATA_QUERY = f"""
+WITH cells AS (
+    SELECT
+        cell_id,
+        SUM(CASE WHEN call_release_code = 0 THEN 1 ELSE 0 END) AS total_success,
+        COUNT(*) AS total_calls,
+        ROUND((SUM(CASE WHEN call_release_code != 0 THEN 1 ELSE 0 END) * 100.0 / COUNT(*)), 2) AS failure_rate,
+        AVG(PM_PDCP_LAT_TIME_DL) AS avg_dl_latency,
+        SUM(PM_RRC_CONN_ESTAB_SUCC) AS total_conn_succ,
+        SUM(PM_RRC_CONN_ESTAB_ATT) AS total_conn_att,
+        CASE
+            WHEN SUM(PM_RRC_CONN_ESTAB_ATT) > 0
+            THEN ROUND((SUM(PM_RRC_CONN_ESTAB_SUCC) * 100.0 / SUM(PM_RRC_CONN_ESTAB_ATT)), 2)
+            ELSE NULL
+        END AS conn_success_rate,
+        AVG(PM_ERAB_REL_ABNORMAL_ENB) AS avg_abnormal_drop,
+        AVG(PM_ACTIVE_UE_DL_MAX) AS avg_dl_speed,
+        AVG(PM_ACTIVE_UE_UL_MAX) AS avg_ul_speed,
+        AVG(PM_PRB_UTIL_DL) AS avg_dl_util,
+        AVG(PM_PRB_UTIL_UL) AS avg_ul_util,
+        SUM(PM_S1_SIG_CONN_ESTAB_SUCC) AS total_sig_conn_succ,
+        SUM(PM_S1_SIG_CONN_ESTAB_ATT) AS total_sig_conn_att,
+        CASE
+            WHEN SUM(PM_S1_SIG_CONN_ESTAB_ATT) > 0
+            THEN ROUND((SUM(PM_S1_SIG_CONN_ESTAB_SUCC) * 100.0 / SUM(PM_S1_SIG_CONN_ESTAB_ATT)), 2)
+            ELSE NULL
+        END AS sig_conn_success_rate
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.CELL_TOWER
+    GROUP BY cell_id
+)
+SELECT
+    c.*,
+    ROUND(d.cell_latitude, 4) AS latitude,
+    ROUND(d.cell_longitude, 4) AS longitude,
+    {H3_COLUMNS}
+FROM cells c
+JOIN TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL d ON c.cell_id = d.cell_id
+"""
+
+# Tickets are aggregated per cell first, then take the location from the
+# one-row-per-cell DIM_CELL table. Joining raw CELL_TOWER would repeat every
+# ticket once per hourly measurement row of its tower.
+TICKET_DATA_QUERY = f"""
+WITH tickets AS (
+    SELECT
+        cell_id,
+        COUNT(*) AS ticket_count,
+        AVG(sentiment_score) AS avg_sentiment,
+        COUNT_IF(service_type = 'Cellular') AS cellular_tickets,
+        COUNT_IF(service_type = 'Business Internet') AS business_tickets,
+        COUNT_IF(service_type = 'Home Internet') AS home_tickets
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.RAW.SUPPORT_TICKETS
+    GROUP BY cell_id
+)
+SELECT
+    t.cell_id,
+    t.ticket_count,
+    t.avg_sentiment,
+    ROUND(d.cell_latitude, 4) AS latitude,
+    ROUND(d.cell_longitude, 4) AS longitude,
+    t.cellular_tickets,
+    t.business_tickets,
+    t.home_tickets,
+    {H3_COLUMNS}
+FROM tickets t
+JOIN TELCO_NETWORK_OPTIMIZATION_PROD.RAW.DIM_CELL d ON t.cell_id = d.cell_id
+"""
+
+
+@st.cache_data(ttl=WATERMARK_TTL_SECONDS, show_spinner=False)
+def get_data_watermark(_session):
+    """Version string of the source tables (row counts and last-altered times)"""
+    table_list = ", ".join(f"'{t}'" for t in SOURCE_TABLES)
+    query = f"""
+    SELECT TABLE_NAME, ROW_COUNT, LAST_ALTERED
+    FROM TELCO_NETWORK_OPTIMIZATION_PROD.INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = 'RAW' AND TABLE_NAME IN ({table_list})
+    ORDER BY TABLE_NAME
+    """
+    tables = run_query(_session, query, "data_watermark")
+    return "|".join(f"{r.TABLE_NAME}:{r.ROW_COUNT}@{r.LAST_ALTERED}" for r in tables.itertuples())
+
+
+def _load_snapshot(session, watermark):
+    """Per-cell network and ticket aggregates for one watermark"""
+    cell_data = run_query(session, CELL_DATA_QUERY, "snapshot_cell_data")
+    ticket_data = run_query(session, TICKET_DATA_QUERY, "snapshot_ticket_data")
+    # Lowercase column names, as the pages access them
+    cell_data.columns = cell_data.columns.str.lower()
+    ticket_data.columns = ticket_data.columns.str.lower()
+    return {"watermark": watermark, "cell_data": cell_data, "ticket_data": ticket_data}
+
+
+def get_snapshot(session):
+    """The app-wide snapshot for the current data watermark
+
+    Costs at most one watermark query per WATERMARK_TTL_SECONDS when the snapshot
+    is cached. Each call returns its own copy of the cached DataFrames, so pages
+    may modify them.
+    """
+    manager = get_cache_manager()
+    watermark = get_data_watermark(session)
+    manager.set_watermark(DATASET, watermark)
+    hit, snapshot = manager.get(SNAPSHOT_NAMESPACE, watermark)
+    if not hit:
+        # Stamp the load with a watermark read right before it, not one cached
+        # up to WATERMARK_TTL_SECONDS ago
+        get_data_watermark.clear()
+        watermark = get_data_watermark(session)
+        manager.set_watermark(DATASET, watermark)
+        hit, snapshot = manager.get(SNAPSHOT_NAMESPACE, watermark)
+    if not hit:
+        with st.spinner("Loading network and ticket data..."):
+            snapshot = _load_snapshot(session, watermark)
+        manager.put(SNAPSHOT_NAMESPACE, watermark, snapshot, dataset=DATASET)
+    return {k: v.copy() if hasattr(v, "copy") else v for k, v in snapshot.items()}
+
+
+def refresh_snapshot():
+    """Re-check the watermark on the next get_snapshot(); only changed data is reloaded"""
+    get_data_watermark.clear()
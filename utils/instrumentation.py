@@ -0,0 +1,167 @@
+"""
+Stage timing for the Streamlit pages.
+
+Each page calls start_run() at the top of a rerun, wraps its hot paths in
+timed() / @timed_stage, and calls render_perf_panel() at the bottom. The panel
+shows the stage timings in the sidebar. Recording them (with the Snowflake
+query IDs) to APP_PERF_EVENTS is opt-in per session from the panel: rows are
+buffered in session state and written in one batch every PERF_FLUSH_EVERY_RUNS
+reruns or on "Flush now", so a normal rerun issues no extra write.
+
+Every query run through run_query() carries a QUERY_TAG (see query_tags.py).
+Setup/create_app_monitoring.sql creates the APP_PERF_EVENTS table.
+"""
+
+import functools
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from snowflake.snowpark.types import (
+    DoubleType,
+    LongType,
+    StringType,
+    StructField,
+    StructType,
+    TimestampType,
+)
+
+from utils.query_tags import tag_params
+
+PERF_EVENTS_TABLE = "TELCO_NETWORK_OPTIMIZATION_PROD.RAW.APP_PERF_EVENTS"
+
+PERF_EVENTS_SCHEMA = StructType([
+    StructField("EVENT_TS", TimestampType()),
+    StructField("RUN_ID", StringType()),
+    StructField("PAGE", StringType()),
+    StructField("STAGE", StringType()),
+    StructField("DETAIL", StringType()),
+    StructField("ELAPSED_MS", DoubleType()),
+    StructField("ROWS", LongType()),
+    StructField("QUERY_ID", StringType()),
+])
+
+# How often to poll an async query while waiting for it to finish
+_POLL_INTERVAL_SECONDS = 0.02
+
+# Buffered reruns written to APP_PERF_EVENTS in one batch when recording is on
+PERF_FLUSH_EVERY_RUNS = 20
+
+
+def _records():
+    return st.session_state.setdefault("_perf_records", [])
+
+
+def start_run(page):
+    """Reset the timings for a new rerun of the given page"""
+    st.session_state["_perf_page"] = page
+    st.session_state["_perf_run_id"] = uuid.uuid4().hex
+    st.session_state["_perf_records"] = []
+
+
+@contextmanager
+def timed(stage, detail=None):
+    """Time the enclosed block and record it under the given stage name"""
+    record = {"stage": stage, "detail": detail, "query_id": None, "rows": None}
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        _records().append(record)
+
+
+def timed_stage(stage):
+    """Decorator form of timed(); the function name is used as the detail"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage, func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def run_query(session, query, detail=None):
+    """Run a tagged query and return a pandas DataFrame, timing execution and conversion separately
+
+    detail names the widget the query serves and is used for the QUERY_TAG.
+    """
+    with timed("query", detail) as query_record:
+        job = session.sql(query).to_pandas(block=False, statement_params=tag_params(detail))
+        query_record["query_id"] = job.query_id
+        while not job.is_done():
+            time.sleep(_POLL_INTERVAL_SECONDS)
+
+    with timed("to_pandas", detail) as convert_record:
+        convert_record["query_id"] = job.query_id
+        df = job.result()
+        convert_record["rows"] = len(df)
+
+    return df
+
+
+def get_timings():
+    """Timings recorded so far in this rerun as a DataFrame"""
+    return pd.DataFrame(_records(), columns=["stage", "detail", "elapsed_ms", "rows", "query_id"])
+
+
+def _pending_rows():
+    return st.session_state.setdefault("_perf_pending_rows", [])
+
+
+def buffer_timings():
+    """Add this rerun's timings to the session's unsaved APP_PERF_EVENTS rows"""
+    records = _records()
+    if not records:
+        return
+    event_ts = datetime.utcnow()
+    run_id = st.session_state.get("_perf_run_id")
+    page = st.session_state.get("_perf_page")
+    _pending_rows().extend(
+        [event_ts, run_id, page, r["stage"], r["detail"], r["elapsed_ms"], r["rows"], r["query_id"]]
+        for r in records
+    )
+    st.session_state["_perf_pending_runs"] = st.session_state.get("_perf_pending_runs", 0) + 1
+
+
+def flush_timings(session):
+    """Append the buffered rows to APP_PERF_EVENTS in one write (best effort)"""
+    rows = _pending_rows()
+    if not rows:
+        return
+    try:
+        session.create_dataframe(rows, schema=PERF_EVENTS_SCHEMA).write.save_as_table(
+            PERF_EVENTS_TABLE, mode="append", column_order="name",
+            statement_params=tag_params("perf_log")
+        )
+    except Exception as e:
+        st.sidebar.caption(f"Performance events not recorded: {str(e)}")
+    st.session_state["_perf_pending_rows"] = []
+    st.session_state["_perf_pending_runs"] = 0
+
+
+def render_perf_panel(session=None):
+    """Show the sidebar Performance panel; with a session, offer recording to APP_PERF_EVENTS"""
+    timings = get_timings()
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        if timings.empty:
+            st.write("No timed stages in this run (all data served from cache).")
+        else:
+            by_stage = timings.groupby("stage", sort=False)["elapsed_ms"].sum().sort_values(ascending=False)
+            st.metric("Total timed (ms)", f"{by_stage.sum():,.0f}")
+            st.write(f"Slowest stage: **{by_stage.index[0]}** ({by_stage.iloc[0]:,.0f} ms)")
+            st.dataframe(by_stage.reset_index(), use_container_width=True, hide_index=True)
+            st.dataframe(timings, use_container_width=True, hide_index=True)
+
+        if session is not None:
+            record = st.checkbox("Record timings to APP_PERF_EVENTS", key="_perf_record",
+                                 help=f"Buffered and written every {PERF_FLUSH_EVERY_RUNS} reruns")
+            if record:
+                buffer_timings()
+                flush_now = st.button(f"Flush now ({len(_pending_rows())} rows buffered)")
+                if flush_now or st.session_state.get("_perf_pending_runs", 0) >= PERF_FLUSH_EVERY_RUNS:
+                    flush_timings(session)
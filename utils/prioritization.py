@@ -0,0 +1,197 @@
+"""
+Impact / effort scoring and incremental top-K ranking for the Issue Prioritization Matrix.
+
+score_towers() scores a frame of per-cell inputs (the tower scorecard joined to
+the loyalty bridge) with vectorized NumPy. Every component is scaled against a
+fixed reference rather than against the other towers, so a tower's score only
+depends on its own inputs: when the refresh tasks touch a handful of cells, only
+those rows need scoring again and every other score stays valid.
+
+PriorityRanker keeps the latest scores plus a max-heap of priorities. update()
+scores just the changed rows and pushes them onto the heap; the entries they
+replace are left in place and skipped (and dropped) when top_k() reaches them,
+so ranking costs O(changed log n) per refresh instead of a full re-sort.
+
+UPDATED_AT is stamped when a refresh task's MERGE starts, not when it commits,
+and two tasks write it, so rows can become visible with a stamp older than the
+newest one already seen. Callers therefore fetch from fetch_since, which trails
+the watermark by WATERMARK_OVERLAP; re-scoring a row twice is harmless.
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+# Input columns score_towers() reads (upper case, as returned by Snowflake)
+INPUT_COLUMNS = [
+    "CELL_ID", "VENDOR_NAME", "PERFORMANCE_TIER", "TICKET_COUNT", "NEGATIVE_TICKET_COUNT",
+    "MEASUREMENT_ROWS", "FAILED_CALLS", "AVG_PRB_UTIL_DL", "GOLD_FAILED_CALLS", "UPDATED_AT",
+]
+
+# Longest refresh task runtime plus poll slack; rows stamped this long before the
+# watermark are fetched again in case their transaction committed late
+WATERMARK_OVERLAP = pd.Timedelta(minutes=15)
+
+# Impact components: weight and the value at which a component saturates at 1.0
+IMPACT_WEIGHTS = {
+    "tickets": 0.25,
+    "negative_share": 0.20,
+    "gold_exposure": 0.25,
+    "failure_rate": 0.30,
+}
+TICKET_SATURATION = 50          # tickets (log scaled)
+GOLD_FAILED_SATURATION = 200    # failed calls from Gold members (log scaled)
+FAILURE_RATE_SATURATION = 0.40  # share of calls failing
+
+# Effort components: 0 = cheap to fix, 1 = expensive
+EFFORT_WEIGHTS = {
+    "vendor": 0.35,
+    "tier": 0.35,
+    "prb_headroom": 0.30,
+}
+# Vendors with weaker tooling and support need more field work per fix
+VENDOR_EFFORT = {
+    "ERICSSON": 0.2,
+    "NOKIA": 0.3,
+    "SAMSUNG": 0.4,
+    "HUAWEI": 0.6,
+    "ZTE": 0.8,
+}
+DEFAULT_VENDOR_EFFORT = 0.5
+# Worse performance tiers point at hardware rather than tuning
+TIER_EFFORT = {
+    "GOOD": 0.1,
+    "PROBLEMATIC": 0.3,
+    "QUITE_BAD": 0.45,
+    "BAD": 0.6,
+    "VERY_BAD": 0.8,
+    "CATASTROPHIC": 1.0,
+}
+DEFAULT_TIER_EFFORT = 0.5
+
+# Priority favours high impact, discounted by up to this share for maximum effort
+EFFORT_DISCOUNT = 0.5
+
+# Quadrant boundaries on the 0-1 impact and effort scales
+IMPACT_THRESHOLD = 0.5
+EFFORT_THRESHOLD = 0.5
+QUADRANTS = ["Quick Wins", "Major Projects", "Fill-ins", "Deprioritize"]
+
+
+def _log_scaled(values, saturation):
+    """Map counts onto 0-1 with log scaling, reaching 1 at saturation"""
+    return np.clip(np.log1p(values) / np.log1p(saturation), 0.0, 1.0)
+
+
+def score_towers(frame):
+    """Impact, effort, priority and quadrant for each row of per-cell inputs
+
+    Returns a new frame indexed by CELL_ID with the score columns added.
+    """
+    frame = frame.copy()
+    numeric = ["TICKET_COUNT", "NEGATIVE_TICKET_COUNT", "MEASUREMENT_ROWS", "FAILED_CALLS",
+               "AVG_PRB_UTIL_DL", "GOLD_FAILED_CALLS"]
+    for column in numeric:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").fillna(0)
+
+    tickets = frame["TICKET_COUNT"].to_numpy(dtype=float)
+    negative = frame["NEGATIVE_TICKET_COUNT"].to_numpy(dtype=float)
+    measurements = frame["MEASUREMENT_ROWS"].to_numpy(dtype=float)
+    failed = frame["FAILED_CALLS"].to_numpy(dtype=float)
+    prb = frame["AVG_PRB_UTIL_DL"].to_numpy(dtype=float)
+    gold_failed = frame["GOLD_FAILED_CALLS"].to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        negative_share = np.where(tickets > 0, negative / tickets, 0.0)
+        failure_rate = np.where(measurements > 0, failed / measurements, 0.0)
+
+    impact = (
+        IMPACT_WEIGHTS["tickets"] * _log_scaled(tickets, TICKET_SATURATION)
+        + IMPACT_WEIGHTS["negative_share"] * negative_share
+        + IMPACT_WEIGHTS["gold_exposure"] * _log_scaled(gold_failed, GOLD_FAILED_SATURATION)
+        + IMPACT_WEIGHTS["failure_rate"] * np.clip(failure_rate / FAILURE_RATE_SATURATION, 0.0, 1.0)
+    )
+
+    vendor_effort = frame["VENDOR_NAME"].str.upper().map(VENDOR_EFFORT).fillna(DEFAULT_VENDOR_EFFORT)
+    tier_effort = frame["PERFORMANCE_TIER"].str.upper().map(TIER_EFFORT).fillna(DEFAULT_TIER_EFFORT)
+    # Little PRB headroom means the fix is capacity (new carriers/sites), not tuning
+    prb_effort = np.clip(prb / 100.0, 0.0, 1.0)
+    effort = (
+        EFFORT_WEIGHTS["vendor"] * vendor_effort.to_numpy(dtype=float)
+        + EFFORT_WEIGHTS["tier"] * tier_effort.to_numpy(dtype=float)
+        + EFFORT_WEIGHTS["prb_headroom"] * prb_effort
+    )
+
+    high_impact = impact >= IMPACT_THRESHOLD
+    high_effort = effort >= EFFORT_THRESHOLD
+    frame["IMPACT_SCORE"] = np.round(impact, 4)
+    frame["EFFORT_SCORE"] = np.round(effort, 4)
+    frame["PRIORITY_SCORE"] = np.round(impact * (1.0 - EFFORT_DISCOUNT * effort), 4)
+    frame["FAILURE_RATE"] = np.round(failure_rate * 100.0, 2)
+    frame["QUADRANT"] = np.select(
+        [high_impact & ~high_effort, high_impact & high_effort, ~high_impact & ~high_effort],
+        QUADRANTS[:3],
+        default=QUADRANTS[3],
+    )
+    return frame.set_index("CELL_ID")
+
+
+class PriorityRanker:
+    """Latest tower scores plus a lazily cleaned max-heap for top-K queries"""
+
+    def __init__(self):
+        self.scores = pd.DataFrame()
+        self.watermark = None
+        self._heap = []
+        self._priority = {}
+
+    def update(self, changed):
+        """Score the changed rows and fold them into the ranking
+
+        Returns the number of towers re-scored. The watermark moves to the
+        newest UPDATED_AT seen; the caller fetches rows after fetch_since.
+        """
+        if changed.empty:
+            return 0
+        scored = score_towers(changed)
+        if self.scores.empty:
+            self.scores = scored
+        else:
+            self.scores = pd.concat([self.scores[~self.scores.index.isin(scored.index)], scored])
+
+        for cell_id, priority in scored["PRIORITY_SCORE"].items():
+            self._priority[cell_id] = priority
+            heapq.heappush(self._heap, (-priority, cell_id))
+        # Rebuild once stale entries outnumber live ones
+        if len(self._heap) > 2 * len(self._priority):
+            self._heap = [(-p, c) for c, p in self._priority.items()]
+            heapq.heapify(self._heap)
+
+        newest = pd.to_datetime(changed["UPDATED_AT"]).max()
+        if pd.notna(newest) and (self.watermark is None or newest > self.watermark):
+            self.watermark = newest
+        return len(scored)
+
+    @property
+    def fetch_since(self):
+        """Lower bound (exclusive) for the next fetch, None to fetch every tower"""
+        if self.watermark is None:
+            return None
+        return self.watermark - WATERMARK_OVERLAP
+
+    def top_k(self, k, cell_ids=None):
+        """The k highest-priority towers, optionally limited to a set of cell ids"""
+        taken, seen, result = [], set(), []
+        while self._heap and len(result) < k:
+            entry = heapq.heappop(self._heap)
+            neg_priority, cell_id = entry
+            if cell_id in seen or self._priority.get(cell_id) != -neg_priority:
+                continue  # replaced by a newer score (or re-scored to the same value)
+            taken.append(entry)
+            seen.add(cell_id)
+            if cell_ids is None or cell_id in cell_ids:
+                result.append(cell_id)
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return self.scores.loc[result]
@@ -0,0 +1,42 @@
+"""
+Structured QUERY_TAG values for every query the app issues.
+
+The tag is a JSON object so it can be parsed back out of QUERY_HISTORY:
+
+    {"app": "telco_network_optimization", "page": "...", "widget": "...",
+     "user": "..."}
+
+Cache hits never reach the warehouse, so they do not appear in QUERY_HISTORY;
+the tag carries no cache status. Hits are visible per rerun in the sidebar
+Performance panel and on the Cache Manager page.
+"""
+
+import json
+
+import streamlit as st
+
+APP_NAME = "telco_network_optimization"
+
+
+def current_user():
+    """Name of the user viewing the app (queries in Snowflake run as the app owner)"""
+    try:
+        user = st.experimental_user.get("user_name") or st.experimental_user.get("email")
+    except Exception:
+        user = None
+    return user or "unknown"
+
+
+def build_query_tag(widget):
+    """JSON query tag for a query issued by the current page"""
+    return json.dumps({
+        "app": APP_NAME,
+        "page": st.session_state.get("_perf_page", "unknown"),
+        "widget": widget or "unknown",
+        "user": current_user(),
+    })
+
+
+def tag_params(widget):
+    """statement_params for Snowpark calls, so the tag is set per query without ALTER SESSION"""
+    return {"QUERY_TAG": build_query_tag(widget)}
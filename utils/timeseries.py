@@ -0,0 +1,87 @@
+"""
+Granularity selection and downsampling for time-series charts.
+
+The Time-Series Analysis page reads RAW.KPI_ROLLUP (Setup/create_kpi_rollups.sql),
+which holds the KPIs at HOUR, DAY and WEEK grain. pick_grain() chooses the
+finest grain that keeps a series under a period budget for the requested span,
+and lttb() / downsample() reduce what is left to a fixed number of points per
+series before charting, so the browser never receives more than the budget.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# Rollup grains from finest to coarsest, with the length of one period
+GRAINS = {
+    "HOUR": timedelta(hours=1),
+    "DAY": timedelta(days=1),
+    "WEEK": timedelta(weeks=1),
+}
+
+# A series longer than this many periods moves up to the next grain
+MAX_PERIODS_PER_SERIES = 1500
+
+
+def periods_in_span(start, end, grain):
+    """Number of periods of the given grain between start and end (inclusive)"""
+    return int((pd.Timestamp(end) - pd.Timestamp(start)) / GRAINS[grain]) + 1
+
+
+def pick_grain(start, end, max_periods=MAX_PERIODS_PER_SERIES):
+    """Finest grain whose period count for the span stays within max_periods"""
+    for grain in GRAINS:
+        if periods_in_span(start, end, grain) <= max_periods:
+            return grain
+    return list(GRAINS)[-1]
+
+
+def lttb(x, y, threshold):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling
+
+    x must be sorted ascending and numeric; the first and last points are always
+    kept. Returns all indices when the series already fits the threshold.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket edges for the n - 2 interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        next_lo, next_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        # Point in this bucket forming the largest triangle with a and the next average
+        areas = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(areas))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(df, x_col, y_col, group_col, max_points):
+    """LTTB each group of df down so the whole frame holds at most about max_points rows"""
+    if df.empty or len(df) <= max_points:
+        return df
+    groups = df.groupby(group_col, sort=False)
+    per_series = max(3, max_points // max(groups.ngroups, 1))
+    parts = []
+    for _, series in groups:
+        series = series.dropna(subset=[y_col]).sort_values(x_col)
+        if series.empty:
+            continue
+        x = series[x_col].astype("int64").to_numpy()
+        parts.append(series.iloc[lttb(x, series[y_col].to_numpy(), per_series)])
+    return pd.concat(parts, ignore_index=True) if parts else df.iloc[0:0]